@@ -0,0 +1,93 @@
+"""Benchmark: số luồng sử dụng và độ trễ khi gửi 50 yêu cầu AI đồng thời.
+
+So sánh cách cũ (``generate_content`` đồng bộ chạy qua ``run_in_executor``)
+với ``GeminiClient`` dùng ``generate_content_async``. Model được giả lập với
+độ trễ mạng cố định để kết quả không phụ thuộc quota thật.
+
+Chạy: ``python -m benchmarks.bench_gemini_client [--concurrency 50] [--latency 0.5]``
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Awaitable, List, Tuple
+
+from utils.gemini_client import GeminiClient
+
+
+class FakeModel:
+    """Model giả lập có cả API đồng bộ và bất đồng bộ với độ trễ cố định."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def generate_content(self, prompt: str, generation_config=None) -> SimpleNamespace:
+        time.sleep(self.latency)
+        return SimpleNamespace(text="ok")
+
+    async def generate_content_async(self, prompt: str, generation_config=None) -> SimpleNamespace:
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text="ok")
+
+
+async def _measure(call: Callable[[], Awaitable[str]], concurrency: int) -> Tuple[List[float], int]:
+    """Chạy ``concurrency`` yêu cầu cùng lúc, trả về độ trễ và số luồng tối đa."""
+    peak_threads = threading.active_count()
+    stop = asyncio.Event()
+
+    async def sample_threads() -> None:
+        nonlocal peak_threads
+        while not stop.is_set():
+            peak_threads = max(peak_threads, threading.active_count())
+            await asyncio.sleep(0.005)
+
+    async def timed() -> float:
+        start = time.perf_counter()
+        await call()
+        return time.perf_counter() - start
+
+    sampler = asyncio.create_task(sample_threads())
+    latencies = await asyncio.gather(*(timed() for _ in range(concurrency)))
+    stop.set()
+    await sampler
+    return list(latencies), peak_threads
+
+
+def _report(label: str, latencies: List[float], peak_threads: int, baseline_threads: int) -> None:
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<28} threads+{peak_threads - baseline_threads:<4} "
+        f"p50={statistics.median(latencies) * 1000:8.1f}ms "
+        f"p95={p95 * 1000:8.1f}ms max={latencies[-1] * 1000:8.1f}ms"
+    )
+
+
+async def main(concurrency: int, latency: float) -> None:
+    model = FakeModel(latency)
+    config = {"max_output_tokens": 10}
+    baseline_threads = threading.active_count()
+
+    async def executor_call() -> str:
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(None, lambda: model.generate_content("Hello", config))
+        return response.text
+
+    latencies, peak = await _measure(executor_call, concurrency)
+    _report("run_in_executor (cũ)", latencies, peak, baseline_threads)
+
+    # Thread pool mặc định vẫn còn sống sau lượt trước; đo lại mức nền
+    baseline_threads = threading.active_count()
+    client = GeminiClient(model, "fake-model")
+    latencies, peak = await _measure(lambda: client.generate("Hello", config), concurrency)
+    _report("GeminiClient (async)", latencies, peak, baseline_threads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5, help="Độ trễ giả lập của model (giây)")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.latency))
@@ -0,0 +1,85 @@
+"""Benchmark: độ trễ truy vấn của chỉ mục tri thức và số token prompt tiết kiệm được.
+
+Sinh một thư mục tri thức giả lập (hoặc dùng thư mục có sẵn), đo thời gian dựng chỉ mục,
+thời gian dựng lại khi một file thay đổi, độ trễ truy vấn p50/p99, và so sánh độ dài prompt
+khi chèn toàn bộ tri thức với khi chỉ chèn top-k đoạn liên quan (ước lượng 4 ký tự/token).
+
+Chạy: ``python -m benchmarks.bench_knowledge_index [--files 200] [--dir knowledge]``
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from utils.knowledge_index import KnowledgeIndex
+
+WORDS = (
+    "luật server thành viên kênh nhạc phát bot lệnh admin role spam cảnh báo xóa tin nhắn "
+    "voice youtube spotify hàng đợi ảnh meme tìm kiếm trợ giúp ai gemini cấu hình quyền "
+    "rules member channel music play queue image search help config permission warning"
+).split()
+
+
+def generate_corpus(directory: Path, files: int, paragraphs: int = 20) -> None:
+    """Sinh ``files`` file markdown ngẫu nhiên trong ``directory``."""
+    rng = random.Random(42)
+    for i in range(files):
+        body = "\n\n".join(
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 80))) for _ in range(paragraphs)
+        )
+        (directory / f"doc_{i:04d}.md").write_text(f"# Tài liệu {i}\n\n{body}", encoding="utf-8")
+
+
+def main(files: int, directory: str, queries: int, top_k: int) -> None:
+    if directory:
+        root = Path(directory)
+    else:
+        root = Path(tempfile.mkdtemp(prefix="knowledge_bench_"))
+        generate_corpus(root, files)
+
+    index = KnowledgeIndex(root)
+    start = time.perf_counter()
+    index.refresh(force=True)
+    print(f"Dựng chỉ mục: {len(index)} đoạn trong {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # Thay đổi một file để đo chi phí dựng lại tăng dần
+    first = next(root.glob("*.md"), None)
+    if first is not None and not directory:
+        first.write_text(first.read_text(encoding="utf-8") + "\n\nđoạn mới", encoding="utf-8")
+        start = time.perf_counter()
+        index.refresh(force=True)
+        print(f"Dựng lại sau khi sửa 1 file: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = random.Random(7)
+    latencies = []
+    injected_chars = []
+    for _ in range(queries):
+        query = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+        start = time.perf_counter()
+        results = index.search(query, top_k)
+        latencies.append(time.perf_counter() - start)
+        injected_chars.append(sum(len(snippet) for _, _, snippet in results))
+    latencies.sort()
+
+    full_tokens = index.total_chars / 4
+    rag_tokens = statistics.mean(injected_chars) / 4
+    print(
+        f"Truy vấn ({queries} lần): p50={statistics.median(latencies) * 1000:.3f} ms "
+        f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.3f} ms"
+    )
+    print(
+        f"Token tri thức trong prompt: toàn bộ≈{full_tokens:,.0f}, top-{top_k}≈{rag_tokens:,.0f} "
+        f"(tiết kiệm {1 - rag_tokens / max(full_tokens, 1):.1%})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200, help="Số file sinh ngẫu nhiên")
+    parser.add_argument("--dir", default="", help="Dùng thư mục tri thức có sẵn thay vì sinh ngẫu nhiên")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+    main(args.files, args.dir, args.queries, args.top_k)
@@ -0,0 +1,239 @@
+"""Benchmark: chi phí của ``Moderation.on_message`` theo kích thước danh sách từ cấm.
+
+Sinh một tập tin nhắn trò chuyện tiếng Việt và tiếng Anh, trong đó một phần có cài từ cấm
+(kể cả dạng né lọc: leetspeak, tách chữ, bỏ dấu), rồi cho ``on_message`` xử lý từng tin nhắn
+giả lập. Với mỗi kích thước danh sách, đo số tin nhắn/giây, độ trễ p50/p99 mỗi tin nhắn,
+bộ nhớ của bộ lọc đã biên dịch (tracemalloc) và tỷ lệ phát hiện từ cài sẵn.
+
+Kết quả được in ra bảng và nối thêm một dòng JSON vào ``--output`` để theo dõi theo thời gian.
+
+Chạy: ``python -m benchmarks.bench_moderation [--sizes 10,1000,100000] [--messages 5000]``
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+import discord
+from discord.ext import commands
+
+from cogs.moderation import Moderation
+from utils.word_filter import WordFilter
+
+VI_WORDS = (
+    "mình hôm nay đi học về muộn quá trời mưa to ghê bạn ơi có ai chơi game không tối nay "
+    "đội mình thắng rồi vui thật cảm ơn mọi người nhiều nha ăn cơm chưa để mai tính tiếp "
+    "cái này hay lắm nè xem thử đi nhạc mới ra nghe cũng được bài tập khó quá ai giúp với "
+    "server này đông vui ghê được nghỉ lễ rồi đi đâu chơi không"
+).split()
+EN_WORDS = (
+    "hey guys what is up today i just finished my homework anyone want to play some games "
+    "tonight that match was really close thanks for the help see you tomorrow lol this song "
+    "is great check it out the new update looks good does anyone know how to fix this bug"
+).split()
+SYLLABLES = (
+    "ba bo bu ca co cu da do du dit ga go gu ha ho hu la lo lu ma mo mu na no nu "
+    "pha pho sa so su ta to tu tha tho va vo vu xa xo xu ngu nga nho nhu tra tro khu khi"
+).split()
+OBFUSCATIONS = ("plain", "upper", "leet", "spaced", "accent")
+LEET = {"a": "4", "e": "3", "i": "1", "o": "0", "s": "5", "t": "7"}
+ACCENTS = {"a": "á", "e": "ê", "i": "í", "o": "ô", "u": "ư"}
+
+
+def make_word_list(size: int, rng: random.Random) -> List[str]:
+    """Sinh ``size`` từ cấm giả, ghép từ các âm tiết, không trùng lặp."""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))))
+    return sorted(words)
+
+
+def obfuscate(word: str, rng: random.Random) -> str:
+    """Biến đổi từ cấm theo một kiểu né lọc ngẫu nhiên."""
+    kind = rng.choice(OBFUSCATIONS)
+    if kind == "upper":
+        return word.upper()
+    if kind == "leet":
+        return word[0] + "".join(LEET.get(char, char) for char in word[1:])
+    if kind == "spaced":
+        return " ".join(word)
+    if kind == "accent":
+        return "".join(ACCENTS.get(char, char) for char in word)
+    return word
+
+
+def make_corpus(count: int, words: List[str], rng: random.Random, violation_rate: float) -> List[Tuple[str, bool]]:
+    """Sinh ``count`` tin nhắn (nội dung, có cài từ cấm hay không)."""
+    corpus = []
+    for _ in range(count):
+        vocabulary = VI_WORDS if rng.random() < 0.6 else EN_WORDS
+        tokens = [rng.choice(vocabulary) for _ in range(rng.randint(3, 30))]
+        planted = rng.random() < violation_rate
+        if planted:
+            tokens.insert(rng.randrange(len(tokens) + 1), obfuscate(rng.choice(words), rng))
+        corpus.append((" ".join(tokens), planted))
+    return corpus
+
+
+def fake_message(content: str, index: int) -> SimpleNamespace:
+    """Tin nhắn giả có đủ thuộc tính mà ``on_message`` dùng."""
+    guild = SimpleNamespace(id=1, name="bench")
+    channel = SimpleNamespace(id=100 + index % 20, guild=guild)
+    author = SimpleNamespace(id=1000 + index % 500, bot=False, mention=f"<@{1000 + index % 500}>")
+    return SimpleNamespace(
+        content=content,
+        guild=guild,
+        channel=channel,
+        author=author,
+        raw_mentions=[],
+        raw_role_mentions=[],
+        mention_everyone=False,
+    )
+
+
+def build_filter(words: List[str]) -> WordFilter:
+    """Dựng bộ lọc và tính sẵn liên kết thất bại của automaton."""
+    word_filter = WordFilter(words)
+    word_filter.matcher.search("")
+    return word_filter
+
+
+def measure_filter(words: List[str]) -> Tuple[WordFilter, int, float]:
+    """Dựng bộ lọc, đo thời gian dựng (ms) và bộ nhớ (byte).
+
+    Bộ nhớ được đo ở một lần dựng riêng vì tracemalloc làm chậm đáng kể việc cấp phát.
+    """
+    start = time.perf_counter()
+    word_filter = build_filter(words)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    tracemalloc.start()
+    traced = build_filter(words)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+    return word_filter, memory, build_ms
+
+
+async def run_size(cog: Moderation, size: int, message_count: int, violation_rate: float, seed: int) -> Dict:
+    """Chạy benchmark cho một kích thước danh sách."""
+    rng = random.Random(seed + size)
+    words = make_word_list(size, rng)
+    corpus = make_corpus(message_count, words, rng, violation_rate)
+
+    word_filter, memory, build_ms = measure_filter(words)
+    cog.base_filter = word_filter
+    cog.guild_filters.clear()
+
+    flagged: List[bool] = []
+    cog.violations.submit = lambda message, hits=(), reasons=(): flagged.append(bool(hits)) or True
+
+    messages = [fake_message(content, i) for i, (content, _) in enumerate(corpus)]
+    # Làm nóng: nạp bộ lọc guild và bộ đệm của bộ chuẩn hóa
+    for message in messages[:50]:
+        await cog.on_message(message)
+    flagged.clear()
+
+    latencies = []
+    detected = 0
+    start = time.perf_counter()
+    for message, (_, planted) in zip(messages, corpus):
+        before = len(flagged)
+        t0 = time.perf_counter_ns()
+        await cog.on_message(message)
+        latencies.append(time.perf_counter_ns() - t0)
+        if planted and len(flagged) > before:
+            detected += 1
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    planted_total = sum(planted for _, planted in corpus)
+    return {
+        "words": size,
+        "messages": message_count,
+        "msgs_per_sec": round(message_count / elapsed, 1),
+        "p50_us": round(latencies[len(latencies) // 2] / 1000, 1),
+        "p99_us": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1000, 1),
+        "max_us": round(latencies[-1] / 1000, 1),
+        "filter_memory_bytes": memory,
+        "build_ms": round(build_ms, 1),
+        "planted": planted_total,
+        "detected": detected,
+        "flagged": len(flagged),
+    }
+
+
+def git_revision() -> str:
+    """Commit hiện tại của repo (nếu có)."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+async def main(sizes: List[int], message_count: int, violation_rate: float, seed: int, output: Path) -> None:
+    # Cảnh báo của cog cho từng tin nhắn vi phạm chỉ làm nhiễu kết quả
+    logging.getLogger("cogs.moderation").setLevel(logging.ERROR)
+    revision = git_revision()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # Cog đọc/ghi bad_words.json và moderation.db theo thư mục hiện tại
+        os.chdir(workdir)
+        try:
+            bot = commands.Bot(command_prefix="", intents=discord.Intents.default(), help_command=None)
+            cog = Moderation(bot)
+            results = [await run_size(cog, size, message_count, violation_rate, seed) for size in sizes]
+            await cog.store.aclose()
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'số từ':>8} {'tin/giây':>10} {'p50 (µs)':>9} {'p99 (µs)':>9} {'bộ nhớ (MB)':>12} {'dựng (ms)':>10} {'phát hiện':>10}")
+    for r in results:
+        print(
+            f"{r['words']:>8} {r['msgs_per_sec']:>10,.0f} {r['p50_us']:>9.1f} {r['p99_us']:>9.1f} "
+            f"{r['filter_memory_bytes'] / (1024 * 1024):>12.2f} {r['build_ms']:>10.1f} "
+            f"{r['detected']:>5}/{r['planted']:<4}"
+        )
+
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": revision,
+        "python": platform.python_version(),
+        "seed": seed,
+        "violation_rate": violation_rate,
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"Đã ghi kết quả vào {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--violation-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/bench_moderation.jsonl"))
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            [int(size) for size in args.sizes.split(",")],
+            args.messages,
+            args.violation_rate,
+            args.seed,
+            args.output.resolve(),
+        )
+    )
@@ -0,0 +1,129 @@
+"""Benchmark: thời gian tới khi có âm thanh và số file bị chạm mỗi yêu cầu TTS.
+
+So sánh đường xử lý trong bộ nhớ hiện tại (gTTS ``write_to_fp`` → ``FFmpegPCMAudio(pipe=True)``)
+với đường cũ qua file tạm (``tts.save`` → đọc lại → ghi ``temp_<id>.mp3`` → FFmpeg đọc file).
+Thời gian tới khi có âm thanh được tính từ lúc nhận văn bản tới khi FFmpeg trả khung PCM
+20 ms đầu tiên (khung mà ``VoiceClient.play`` gửi đi đầu tiên). Số file bị chạm được đếm
+bằng audit hook (``sys.addaudithook``) qua các sự kiện ``open``/``os.remove`` ngoài thư viện.
+
+Cần kết nối mạng (Google TTS) và ``ffmpeg`` trong PATH.
+
+Chạy: ``python -m benchmarks.bench_tts [--requests 10] [--lang vi]``
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Set
+
+import discord
+import gtts
+
+from utils.tts_backends import GTTSBackend
+
+TEXTS = (
+    "Xin chào mọi người",
+    "Chào mừng bạn đến với server",
+    "Hôm nay trời đẹp quá, đi chơi không",
+    "Good morning everyone",
+    "Bot đang kiểm tra âm thanh, một hai ba bốn",
+)
+
+# Các file bị chạm trong lúc đo (None khi không đo)
+_touched: Optional[Set[str]] = None
+_IGNORED_PREFIXES = (sys.prefix, sys.base_prefix, "/dev/", "/proc/", "/sys/")
+
+
+def _audit(event: str, args: tuple) -> None:
+    """Ghi lại các file được mở/xóa trong lúc đo (bỏ qua module Python và file hệ thống)."""
+    if _touched is None or event not in ("open", "os.remove"):
+        return
+    path = args[0]
+    if not isinstance(path, (str, bytes, os.PathLike)):
+        return
+    path = os.fsdecode(path)
+    if path.endswith((".py", ".pyc")) or path.startswith(_IGNORED_PREFIXES):
+        return
+    _touched.add(os.path.abspath(path))
+
+
+async def first_frame(source: discord.AudioSource) -> None:
+    """Đọc khung PCM đầu tiên (trong luồng riêng vì ``read`` chặn) rồi dọn tiến trình FFmpeg."""
+    try:
+        frame = await asyncio.to_thread(source.read)
+        if not frame:
+            raise RuntimeError("FFmpeg không trả về âm thanh")
+    finally:
+        source.cleanup()
+
+
+async def speak_memory(text: str, lang: str, request_id: int) -> None:
+    """Đường xử lý hiện tại: mọi thứ nằm trong bộ nhớ."""
+    audio = await GTTSBackend().synthesize(text, lang)
+    await first_frame(discord.FFmpegPCMAudio(io.BytesIO(audio), pipe=True))
+
+
+async def speak_file(text: str, lang: str, request_id: int) -> None:
+    """Đường xử lý cũ (tái hiện để so sánh): hai lần đi qua file tạm."""
+    loop = asyncio.get_running_loop()
+    tts = gtts.gTTS(text, lang=lang, lang_check=False)
+    await loop.run_in_executor(None, tts.save, "temp_tts.mp3")
+    with open("temp_tts.mp3", "rb") as f:
+        audio_buffer = io.BytesIO(f.read())
+    os.remove("temp_tts.mp3")
+
+    filename = f"temp_{request_id}.mp3"
+    with open(filename, "wb") as f:
+        f.write(audio_buffer.read())
+    try:
+        await first_frame(discord.FFmpegPCMAudio(filename))
+    finally:
+        os.remove(filename)
+
+
+async def run(mode: str, requests: int, lang: str) -> Dict[str, float]:
+    """Chạy ``requests`` yêu cầu tuần tự với một đường xử lý."""
+    global _touched
+    speak = speak_memory if mode == "memory" else speak_file
+    latencies: List[float] = []
+    files: List[int] = []
+    for i in range(requests):
+        _touched = set()
+        start = time.perf_counter()
+        await speak(TEXTS[i % len(TEXTS)], lang, i)
+        latencies.append((time.perf_counter() - start) * 1000)
+        files.append(len(_touched))
+        _touched = None
+    return {
+        "p50_ms": statistics.median(latencies),
+        "max_ms": max(latencies),
+        "files": statistics.mean(files),
+    }
+
+
+async def main(requests: int, lang: str) -> None:
+    sys.addaudithook(_audit)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # Đường cũ ghi file vào thư mục hiện tại
+        os.chdir(workdir)
+        try:
+            results = {mode: await run(mode, requests, lang) for mode in ("file", "memory")}
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'đường xử lý':<12} {'p50 (ms)':>9} {'max (ms)':>9} {'file/yêu cầu':>13}")
+    for mode, r in results.items():
+        print(f"{mode:<12} {r['p50_ms']:>9.0f} {r['max_ms']:>9.0f} {r['files']:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--lang", default="vi")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.lang))
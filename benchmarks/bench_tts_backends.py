@@ -0,0 +1,131 @@
+"""Benchmark: độ trễ và CPU trên mỗi giây âm thanh của các engine TTS (gTTS và cục bộ).
+
+Với mỗi engine, tổng hợp lần lượt các câu mẫu qua đúng đường mà bot dùng (gTTS trong
+executor, engine cục bộ trong process pool đã nạp sẵn mô hình) để đo độ trễ, rồi tổng hợp
+lại từng câu ngay trong tiến trình hiện tại để đo CPU (kể cả tiến trình con như espeak-ng).
+Kết quả quy về mỗi giây âm thanh tạo ra, để so sánh được giữa các giọng đọc nhanh/chậm.
+
+gTTS cần mạng; engine cục bộ cần ``PIPER_VOICES`` (và gói ``piper-tts``) hoặc ``espeak-ng``.
+Thời lượng MP3 được đọc bằng ``ffprobe`` nếu có, không thì ước lượng theo bitrate 32 kbps của gTTS.
+
+Chạy: ``python -m benchmarks.bench_tts_backends [--backends gtts,local] [--lang vi] [--rounds 3]``
+"""
+import argparse
+import asyncio
+import io
+import resource
+import statistics
+import subprocess
+import time
+import wave
+from typing import Callable, Dict, List
+
+import gtts
+
+from utils.tts_backends import GTTSBackend, LocalTTSBackend, TTSBackend, _init_worker, synthesize_local
+
+TEXTS = (
+    "Xin chào mọi người.",
+    "Chào mừng bạn đến với server, chúc bạn chơi vui vẻ.",
+    "Hôm nay trời đẹp quá, có ai muốn đi chơi không?",
+    "Bot đang kiểm tra âm thanh, một hai ba bốn năm sáu bảy tám chín mười.",
+    "Nhớ đọc nội quy trong kênh thông báo trước khi gửi tin nhắn nhé, cảm ơn các bạn rất nhiều.",
+)
+GTTS_BITRATE = 32_000
+
+
+def audio_seconds(data: bytes) -> float:
+    """Thời lượng của âm thanh WAV hoặc MP3 (giây)."""
+    if data[:4] == b"RIFF":
+        with wave.open(io.BytesIO(data)) as wav:
+            return wav.getnframes() / wav.getframerate()
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", "-i", "pipe:0"],
+            input=data,
+            capture_output=True,
+            check=True,
+        )
+        return float(result.stdout)
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return len(data) * 8 / GTTS_BITRATE
+
+
+def cpu_seconds(fn: Callable[[], bytes]) -> float:
+    """CPU dùng để chạy ``fn`` trong tiến trình hiện tại và các tiến trình con của nó."""
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.process_time()
+    fn()
+    elapsed = time.process_time() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return elapsed + (after.ru_utime - children.ru_utime) + (after.ru_stime - children.ru_stime)
+
+
+def gtts_sync(text: str, lang: str) -> bytes:
+    """gTTS chạy đồng bộ trong tiến trình hiện tại."""
+    buffer = io.BytesIO()
+    gtts.gTTS(text, lang=lang, lang_check=False).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+async def run(backend: TTSBackend, lang: str, rounds: int) -> Dict[str, float]:
+    """Đo một engine."""
+    # Làm nóng: khởi động pool và nạp mô hình không tính vào độ trễ
+    await backend.synthesize(TEXTS[0], lang)
+
+    latencies: List[float] = []
+    audio = 0.0
+    for _ in range(rounds):
+        for text in TEXTS:
+            start = time.perf_counter()
+            data = await backend.synthesize(text, lang)
+            latencies.append(time.perf_counter() - start)
+            audio += audio_seconds(data)
+
+    if isinstance(backend, LocalTTSBackend):
+        _init_worker(backend.voices)
+        sync = synthesize_local
+    else:
+        sync = gtts_sync
+    cpu = sum(cpu_seconds(lambda: sync(text, lang)) for text in TEXTS) * rounds
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        "latency_per_audio_s": sum(latencies) / audio,
+        "cpu_per_audio_s": cpu / audio,
+        "audio_s": audio,
+    }
+
+
+async def main(names: List[str], lang: str, rounds: int) -> None:
+    backends = {"gtts": GTTSBackend(), "local": LocalTTSBackend()}
+    results = {}
+    for name in names:
+        backend = backends[name]
+        if not backend.available(lang):
+            print(f"Bỏ qua '{name}': engine không dùng được cho '{lang}'")
+            continue
+        try:
+            results[name] = await run(backend, lang, rounds)
+        except Exception as e:
+            print(f"Bỏ qua '{name}': {e}")
+        finally:
+            backend.close()
+
+    print(f"{'engine':<8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'trễ/giây âm thanh':>18} {'CPU/giây âm thanh':>18}")
+    for name, r in results.items():
+        print(
+            f"{name:<8} {r['p50_ms']:>9.0f} {r['p95_ms']:>9.0f} "
+            f"{r['latency_per_audio_s']:>17.3f}s {r['cpu_per_audio_s']:>17.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default="gtts,local")
+    parser.add_argument("--lang", default="vi")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.backends.split(","), args.lang, args.rounds))
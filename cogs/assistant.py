@@ -1,22 +1,46 @@
 import asyncio
 import logging
 import os
-from typing import Optional
+import time
+from pathlib import Path
+from typing import List, Optional
 
 import discord
-import google.generativeai as genai
 from discord.ext import commands
 from discord import app_commands
 from dotenv import load_dotenv
 
+from utils.ai_health import AIHealthProbe
+from utils.gemini_client import GeminiClient
+from utils.knowledge_index import KnowledgeIndex
+from utils.model_router import ModelRouter
+
 # Tải biến môi trường
 load_dotenv()
 
 # Cấu hình logger
 logger = logging.getLogger(__name__)
 
-# Định nghĩa model AI
+# Định nghĩa model AI mặc định (model lớn nhất, dùng cho câu hỏi phức tạp)
 AI_MODEL = "gemma-3-27b-it"
+# Danh sách model cho bộ định tuyến, sắp xếp từ nhỏ/nhanh tới lớn/chậm
+AI_MODELS = [
+    name.strip()
+    for name in os.getenv("AI_MODELS", f"gemma-3-4b-it,gemma-3-12b-it,{AI_MODEL}").split(",")
+    if name.strip()
+]
+
+# Thư mục tri thức của server (luật, FAQ, ...), tính từ thư mục gốc của bot như load_markdown,
+# và số đoạn chèn vào prompt
+KNOWLEDGE_DIR = Path(__file__).resolve().parent.parent / "knowledge"
+KNOWLEDGE_TOP_K = 3
+
+# Giới hạn cho lệnh tóm tắt kênh
+MAX_SUMMARY_MESSAGES = 2000
+# Kích thước mỗi đoạn lịch sử gửi tới AI (ký tự, ~4 ký tự/token => ~3000 token)
+SUMMARY_CHUNK_CHARS = 12000
+# Số lời gọi AI tóm tắt chạy song song tối đa
+SUMMARY_CONCURRENCY = 4
 
 
 def load_markdown(filename: str) -> str:
@@ -44,7 +68,9 @@ class Assistant(commands.Cog):
         """
         self.bot = bot
         self.api_key = os.getenv("GEMINI_API_KEY")
-        self.model = None
+        self.model: Optional[ModelRouter] = None
+        self.health: Optional[AIHealthProbe] = None
+        self.knowledge = KnowledgeIndex(KNOWLEDGE_DIR)
         self.ai_config = {
             "temperature": 0.7,
             "top_p": 0.8,
@@ -54,15 +80,258 @@ class Assistant(commands.Cog):
 
         # Thiết lập kết nối với Google Gemini
         if self.api_key:
-            genai.configure(api_key=self.api_key)
             try:
-                self.model = genai.GenerativeModel(AI_MODEL)
-                logger.info(f"✅ Đã kết nối Gemini AI với model {AI_MODEL}")
+                self.model = ModelRouter(
+                    [GeminiClient.from_api_key(self.api_key, name) for name in AI_MODELS]
+                )
+                self.health = AIHealthProbe(self.model.clients, on_result=self.model.record_probe)
+                logger.info(f"✅ Đã kết nối Gemini AI với các model: {', '.join(AI_MODELS)}")
             except Exception as e:
                 logger.error(f"❌ Không thể kết nối Gemini AI: {e}")
         else:
             logger.warning("⚠️ GEMINI_API_KEY không được thiết lập. Tính năng AI sẽ không hoạt động.")
 
+    async def cog_load(self) -> None:
+        """Khởi động bộ thăm dò trạng thái AI và lập chỉ mục tri thức khi cog được nạp."""
+        if self.health:
+            self.health.start()
+        self.knowledge.refresh(force=True)
+        self._index_help_documents()
+
+    def _index_help_documents(self) -> None:
+        """Đưa nội dung các trang trợ giúp của cog Help vào chỉ mục tri thức."""
+        help_cog = self.bot.get_cog("Help")
+        if not help_cog:
+            return
+        for attr_name in dir(help_cog):
+            if not (attr_name.startswith("_") and attr_name.endswith("_help")):
+                continue
+            embed = getattr(help_cog, attr_name)()
+            parts = [embed.title or "", embed.description or ""]
+            parts.extend(f"{field.name}\n{field.value}" for field in embed.fields)
+            self.knowledge.set_document(f"help{attr_name[:-5]}", "\n\n".join(filter(None, parts)))
+
+    async def cog_unload(self) -> None:
+        """Dừng bộ thăm dò trạng thái AI khi cog bị gỡ."""
+        if self.health:
+            self.health.stop()
+
+    async def _generate(self, prompt: str, message: str) -> str:
+        """Gửi prompt tới model được định tuyến và ghi nhận độ trễ/lỗi cho bộ thăm dò.
+
+        Args:
+            prompt: Prompt hoàn chỉnh gửi tới model.
+            message: Tin nhắn gốc của người dùng, dùng để chọn model.
+
+        Returns:
+            Văn bản phản hồi của model.
+        """
+        self.health.mark_activity()
+        start = time.perf_counter()
+        try:
+            response_text = await self.model.generate(prompt, self.ai_config, message=message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.health.record(time.perf_counter() - start, e)
+            raise
+        self.health.record(time.perf_counter() - start)
+        return response_text
+
+    def _status_embed(self) -> discord.Embed:
+        """Tạo embed trạng thái AI từ dữ liệu thăm dò nền (không gọi API).
+
+        Returns:
+            Embed mô tả trạng thái hiện tại của AI.
+        """
+        status = self.health.snapshot()
+
+        def fmt_latency(value: Optional[float]) -> str:
+            return f"{value * 1000:.0f} ms" if value is not None else "Chưa có dữ liệu"
+
+        if status["quota_exhausted"]:
+            title, description, color = "⛔ AI Status", "Đã hết quota API, AI tạm thời không khả dụng", 0xFF4444
+        elif status["samples"] == 0:
+            title, description, color = "⏳ AI Status", "Đang chờ kết quả thăm dò đầu tiên", 0xFFAA00
+        elif status["error_rate"] >= 0.5:
+            title, description, color = "⚠️ AI Status", "Gemini AI đang gặp nhiều lỗi", 0xFFAA00
+        else:
+            title, description, color = "✅ AI Status", "Gemini AI đang hoạt động bình thường", 0x00FF88
+
+        embed = discord.Embed(title=title, description=description, color=color)
+        embed.add_field(name="Số model", value=str(len(self.model.clients)), inline=True)
+        embed.add_field(name="API Key", value="✅ Đã cấu hình", inline=True)
+        embed.add_field(name="Quota", value="❌ Đã hết" if status["quota_exhausted"] else "✅ Còn", inline=True)
+        embed.add_field(name="Độ trễ p50", value=fmt_latency(status["p50"]), inline=True)
+        embed.add_field(name="Độ trễ p95", value=fmt_latency(status["p95"]), inline=True)
+        embed.add_field(
+            name="Tỷ lệ lỗi",
+            value=f"{status['error_rate']:.0%} ({status['samples']} mẫu)",
+            inline=True,
+        )
+        if status["last_error"]:
+            embed.add_field(
+                name="Lỗi gần nhất",
+                value=f"<t:{int(status['last_error_at'])}:R> {status['last_error'][:200]}",
+                inline=False,
+            )
+        last_probe = f"<t:{int(status['last_probe_at'])}:R>" if status["last_probe_at"] else "Chưa thăm dò"
+        embed.add_field(name="Lần thăm dò gần nhất", value=last_probe, inline=False)
+
+        # Thống kê từng model của bộ định tuyến
+        model_lines = []
+        for stats in self.model.snapshot():
+            state = f"⏸️ tạm ngưng {stats['cooldown']:.0f}s" if stats["cooldown"] else "✅"
+            model_lines.append(
+                f"`{stats['model']}` {state} • p50 {fmt_latency(stats['p50'])} • "
+                f"p95 {fmt_latency(stats['p95'])} • lỗi {stats['error_rate']:.0%} • {stats['requests']} yêu cầu"
+            )
+        embed.add_field(name="📊 Model", value="\n".join(model_lines), inline=False)
+
+        decisions = list(self.model.decisions)[-5:]
+        if decisions:
+            embed.add_field(
+                name="🧭 Định tuyến gần đây",
+                value="\n".join(
+                    f"<t:{int(d.at)}:T> bậc {d.complexity} → `{d.model}` ({d.reason})" for d in reversed(decisions)
+                )[:1024],
+                inline=False,
+            )
+        embed.set_footer(text=f"Chu kỳ thăm dò: {status['interval']:.0f}s")
+        return embed
+
+    async def _summarize_chunk(self, lines: List[str], semaphore: asyncio.Semaphore) -> str:
+        """Tóm tắt một đoạn lịch sử kênh (bước map).
+
+        Semaphore đã được giữ bởi hàm gọi và được nhả khi đoạn này xử lý xong.
+
+        Args:
+            lines: Các dòng tin nhắn theo thứ tự thời gian.
+            semaphore: Semaphore giới hạn số lời gọi AI song song.
+
+        Returns:
+            Bản tóm tắt của đoạn.
+        """
+        try:
+            prompt = (
+                "Tóm tắt ngắn gọn đoạn hội thoại Discord sau bằng tiếng Việt, giữ lại các chủ đề chính, "
+                "quyết định và câu hỏi chưa được trả lời. Chỉ trả về bản tóm tắt.\n\n" + "\n".join(lines)
+            )
+            return (await self._generate(prompt, prompt)).strip()
+        finally:
+            semaphore.release()
+
+    async def _summarize_channel(self, channel: discord.abc.Messageable, limit: int) -> Optional[str]:
+        """Tóm tắt lịch sử kênh theo kiểu map-reduce.
+
+        Lịch sử được đọc theo trang (discord.py tải 100 tin mỗi lần) và cắt thành các đoạn
+        cỡ ``SUMMARY_CHUNK_CHARS``. Mỗi đoạn đầy được tóm tắt ngay trong lúc tiếp tục đọc,
+        tối đa ``SUMMARY_CONCURRENCY`` lời gọi cùng lúc; việc đọc chờ khi đủ số lời gọi
+        nên bộ nhớ chỉ giữ vài đoạn. Các bản tóm tắt con được gộp ở bước reduce.
+
+        Args:
+            channel: Kênh cần tóm tắt.
+            limit: Số tin nhắn gần nhất cần đọc.
+
+        Returns:
+            Bản tóm tắt, hoặc None nếu không có tin nhắn nào để tóm tắt.
+        """
+        semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+        tasks: List[asyncio.Task] = []
+        lines: List[str] = []
+        size = 0
+
+        async def flush() -> None:
+            nonlocal lines, size
+            # Lịch sử đọc từ mới tới cũ, đảo lại để AI nhận theo thứ tự thời gian
+            chunk = lines[::-1]
+            lines, size = [], 0
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(self._summarize_chunk(chunk, semaphore)))
+
+        try:
+            async for msg in channel.history(limit=limit):
+                if msg.author.bot or not msg.content:
+                    continue
+                line = f"[{msg.created_at:%d/%m %H:%M}] {msg.author.display_name}: {msg.content}"
+                lines.append(line)
+                size += len(line) + 1
+                if size >= SUMMARY_CHUNK_CHARS:
+                    await flush()
+            if lines:
+                await flush()
+            if not tasks:
+                return None
+
+            # Các đoạn được tạo từ mới tới cũ, đảo lại cho bước reduce
+            partials = (await asyncio.gather(*tasks))[::-1]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if len(partials) == 1:
+            return partials[0]
+
+        prompt = (
+            "Dưới đây là các bản tóm tắt liên tiếp của một kênh Discord, theo thứ tự thời gian. "
+            "Hãy gộp chúng thành một bản tóm tắt mạch lạc bằng tiếng Việt, dạng gạch đầu dòng.\n\n"
+            + "\n\n".join(f"Phần {i}:\n{partial}" for i, partial in enumerate(partials, start=1))
+        )
+        return (await self._generate(prompt, prompt)).strip()
+
+    def _build_prompt(self, message: str) -> str:
+        """Ghép system prompt, các đoạn tri thức liên quan và tin nhắn người dùng.
+
+        Chỉ ``KNOWLEDGE_TOP_K`` đoạn khớp nhất từ chỉ mục tri thức được chèn vào,
+        thay vì toàn bộ luật/FAQ/hướng dẫn của server.
+
+        Args:
+            message: Tin nhắn người dùng gửi tới AI.
+
+        Returns:
+            Prompt hoàn chỉnh gửi tới model.
+        """
+        try:
+            snippets = self.knowledge.search(message, KNOWLEDGE_TOP_K)
+        except Exception as e:
+            logger.error(f"❌ Lỗi khi tra cứu chỉ mục tri thức: {e}")
+            snippets = []
+        context = ""
+        if snippets:
+            context = (
+                "Thông tin tham khảo về server (chỉ dùng khi liên quan tới câu hỏi):\n"
+                + "\n---\n".join(snippet for _, _, snippet in snippets)
+                + "\n\n"
+            )
+
+        try:
+            system_prompt = load_markdown("system_prompt.md")
+            return f"{system_prompt}\n\n{context}User: {message}\nAI: "
+        except Exception as e:
+            logger.error(f"❌ Không thể tải nội dung file system_prompt.md: {e}")
+            return f"{context}User: {message}\nAI: "
+
+    @staticmethod
+    def _error_message(error: Exception) -> str:
+        """Chuyển lỗi từ Gemini thành thông báo thân thiện cho người dùng.
+
+        Args:
+            error: Lỗi được ném ra khi gọi AI.
+
+        Returns:
+            Thông báo lỗi hiển thị cho người dùng.
+        """
+        if isinstance(error, asyncio.TimeoutError):
+            return "❌ AI phản hồi quá lâu. Vui lòng thử lại sau."
+        error_msg = str(error).lower()
+        if "404" in error_msg and "model" in error_msg:
+            return "❌ Model AI không khả dụng. Vui lòng kiểm tra API key hoặc thử lại sau."
+        if "quota" in error_msg or "limit" in error_msg:
+            return "❌ Đã đạt giới hạn API. Vui lòng thử lại sau."
+        if "api key" in error_msg:
+            return "❌ API key không hợp lệ. Vui lòng kiểm tra cấu hình."
+        return "❌ Lỗi AI: Không thể xử lý yêu cầu. Vui lòng thử lại sau."
+
     @commands.command(name="ai", aliases=["chat", "ask"])
     async def ai_chat(self, ctx: commands.Context, *, message: str) -> None:
         """Lệnh để trò chuyện với AI Gemini.
@@ -83,24 +352,13 @@ class Assistant(commands.Cog):
         async with ctx.typing():
             try:
                 # Tạo prompt với system prompt và tin nhắn hiện tại
-                try:
-                    system_prompt = load_markdown("system_prompt.md")
-                    full_conversation = f"{system_prompt}\n\nUser: {message}\nAI: "
-                except Exception as e:
-                    logger.error(f"❌ Không thể tải nội dung file system_prompt.md: {e}")
-                    full_conversation = f"User: {message}\nAI: "
-
-                # Gửi yêu cầu tới Gemini AI
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.model.generate_content(
-                        full_conversation,
-                        generation_config=genai.types.GenerationConfig(**self.ai_config),
-                    ),
-                )
+                full_conversation = self._build_prompt(message)
 
-                if response.text:
-                    ai_response = response.text.strip()
+                # Gửi yêu cầu tới Gemini AI (bất đồng bộ, không chiếm thread pool)
+                response_text = await self._generate(full_conversation, message)
+
+                if response_text:
+                    ai_response = response_text.strip()
                     logger.info(
                         f"✅ AI đã phản hồi thành công cho {ctx.author} "
                         f"(độ dài phản hồi: {len(ai_response)} ký tự)"
@@ -128,15 +386,7 @@ class Assistant(commands.Cog):
                     await ctx.send("❌ AI không thể tạo phản hồi. Vui lòng thử lại.")
             except Exception as e:
                 logger.error(f"❌ Lỗi AI chat: {str(e)}")
-                error_msg = str(e).lower()
-                if "404" in error_msg and "model" in error_msg:
-                    await ctx.send("❌ Model AI không khả dụng. Vui lòng kiểm tra API key hoặc thử lại sau.")
-                elif "quota" in error_msg or "limit" in error_msg:
-                    await ctx.send("❌ Đã đạt giới hạn API. Vui lòng thử lại sau.")
-                elif "api key" in error_msg:
-                    await ctx.send("❌ API key không hợp lệ. Vui lòng kiểm tra cấu hình.")
-                else:
-                    await ctx.send("❌ Lỗi AI: Không thể xử lý yêu cầu. Vui lòng thử lại sau.")
+                await ctx.send(self._error_message(e))
                     
     @app_commands.command(name="ai", description="Trò chuyện với AI Gemini")
     @app_commands.describe(message="Tin nhắn bạn muốn gửi tới AI")
@@ -160,24 +410,13 @@ class Assistant(commands.Cog):
         
         try:
             # Tạo prompt với system prompt và tin nhắn hiện tại
-            try:
-                system_prompt = load_markdown("system_prompt.md")
-                full_conversation = f"{system_prompt}\n\nUser: {message}\nAI: "
-            except Exception as e:
-                logger.error(f"❌ Không thể tải nội dung file system_prompt.md: {e}")
-                full_conversation = f"User: {message}\nAI: "
-
-            # Gửi yêu cầu tới Gemini AI
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.model.generate_content(
-                    full_conversation,
-                    generation_config=genai.types.GenerationConfig(**self.ai_config),
-                ),
-            )
+            full_conversation = self._build_prompt(message)
+
+            # Gửi yêu cầu tới Gemini AI (bất đồng bộ, không chiếm thread pool)
+            response_text = await self._generate(full_conversation, message)
 
-            if response.text:
-                ai_response = response.text.strip()
+            if response_text:
+                ai_response = response_text.strip()
                 logger.info(
                     f"✅ AI đã phản hồi thành công cho {interaction.user} "
                     f"(độ dài phản hồi: {len(ai_response)} ký tự)"
@@ -206,15 +445,89 @@ class Assistant(commands.Cog):
                 await interaction.edit_original_response(content="❌ AI không thể tạo phản hồi. Vui lòng thử lại.")
         except Exception as e:
             logger.error(f"❌ Lỗi AI chat: {str(e)}")
-            error_msg = str(e).lower()
-            if "404" in error_msg and "model" in error_msg:
-                await interaction.edit_original_response(content="❌ Model AI không khả dụng. Vui lòng kiểm tra API key hoặc thử lại sau.")
-            elif "quota" in error_msg or "limit" in error_msg:
-                await interaction.edit_original_response(content="❌ Đã đạt giới hạn API. Vui lòng thử lại sau.")
-            elif "api key" in error_msg:
-                await interaction.edit_original_response(content="❌ API key không hợp lệ. Vui lòng kiểm tra cấu hình.")
-            else:
-                await interaction.edit_original_response(content="❌ Lỗi AI: Không thể xử lý yêu cầu. Vui lòng thử lại sau.")
+            await interaction.edit_original_response(content=self._error_message(e))
+
+    @commands.command(name="summarize", aliases=["tomtat"])
+    async def summarize(self, ctx: commands.Context, n_messages: int = 100) -> None:
+        """Tóm tắt các tin nhắn gần đây trong kênh.
+
+        Args:
+            ctx: Ngữ cảnh lệnh Discord.
+            n_messages: Số tin nhắn gần nhất cần tóm tắt.
+        """
+        logger.info(f"{ctx.author} gọi lệnh !summarize trong kênh {ctx.channel} với {n_messages} tin nhắn")
+
+        if not self.model:
+            await ctx.send("❌ AI không khả dụng. Vui lòng kiểm tra cấu hình GEMINI_API_KEY.")
+            return
+        if not 1 <= n_messages <= MAX_SUMMARY_MESSAGES:
+            await ctx.send(f"❌ Số tin nhắn phải từ 1 đến {MAX_SUMMARY_MESSAGES}.")
+            return
+
+        async with ctx.typing():
+            try:
+                summary = await self._summarize_channel(ctx.channel, n_messages)
+                if not summary:
+                    await ctx.send("❌ Không có tin nhắn nào để tóm tắt.")
+                    return
+
+                embed = discord.Embed(
+                    title=f"📝 Tóm tắt {n_messages} tin nhắn gần nhất",
+                    description=summary[:4000],
+                    color=0x00FF88,
+                )
+                embed.set_footer(text=f"Được yêu cầu bởi {ctx.author.display_name}")
+                await ctx.send(embed=embed)
+                logger.info(f"✅ Đã tóm tắt kênh {ctx.channel} cho {ctx.author}")
+            except discord.Forbidden:
+                await ctx.send("❌ Bot không có quyền đọc lịch sử tin nhắn trong kênh này.")
+            except Exception as e:
+                logger.error(f"❌ Lỗi khi tóm tắt kênh: {e}")
+                await ctx.send(self._error_message(e))
+
+    @app_commands.command(name="summarize", description="Tóm tắt các tin nhắn gần đây trong kênh")
+    @app_commands.describe(n_messages=f"Số tin nhắn gần nhất cần tóm tắt (1-{MAX_SUMMARY_MESSAGES})")
+    async def slash_summarize(
+        self,
+        interaction: discord.Interaction,
+        n_messages: app_commands.Range[int, 1, MAX_SUMMARY_MESSAGES] = 100,
+    ) -> None:
+        """Slash command tóm tắt các tin nhắn gần đây trong kênh.
+
+        Args:
+            interaction: Tương tác từ người dùng.
+            n_messages: Số tin nhắn gần nhất cần tóm tắt.
+        """
+        logger.info(
+            f"{interaction.user} gọi slash command /summarize trong kênh {interaction.channel} "
+            f"với {n_messages} tin nhắn"
+        )
+
+        if not self.model:
+            await interaction.response.send_message("❌ AI không khả dụng. Vui lòng kiểm tra cấu hình GEMINI_API_KEY.", ephemeral=True)
+            return
+
+        await interaction.response.send_message(f"📝 Đang tóm tắt {n_messages} tin nhắn gần nhất...", ephemeral=False)
+
+        try:
+            summary = await self._summarize_channel(interaction.channel, n_messages)
+            if not summary:
+                await interaction.edit_original_response(content="❌ Không có tin nhắn nào để tóm tắt.")
+                return
+
+            embed = discord.Embed(
+                title=f"📝 Tóm tắt {n_messages} tin nhắn gần nhất",
+                description=summary[:4000],
+                color=0x00FF88,
+            )
+            embed.set_footer(text=f"Được yêu cầu bởi {interaction.user.display_name}")
+            await interaction.edit_original_response(content="", embed=embed)
+            logger.info(f"✅ Đã tóm tắt kênh {interaction.channel} cho {interaction.user}")
+        except discord.Forbidden:
+            await interaction.edit_original_response(content="❌ Bot không có quyền đọc lịch sử tin nhắn trong kênh này.")
+        except Exception as e:
+            logger.error(f"❌ Lỗi khi tóm tắt kênh: {e}")
+            await interaction.edit_original_response(content=self._error_message(e))
 
     @commands.command(name="aiconfig")
     @commands.has_permissions(administrator=True)
@@ -309,6 +622,7 @@ class Assistant(commands.Cog):
                 "`!ai <tin nhắn>` - Chat với AI\n"
                 "`!chat <tin nhắn>` - Alias của !ai\n"
                 "`!ask <câu hỏi>` - Alias của !ai\n"
+                "`!summarize [số tin]` - Tóm tắt tin nhắn gần đây trong kênh\n"
                 "`!aihelp` - Hiển thị hướng dẫn này\n"
                 "`!aistatus` - Kiểm tra trạng thái AI\n"
                 "`!aiconfig [setting] [value]` - Cấu hình AI (chỉ admin)"
@@ -355,6 +669,7 @@ class Assistant(commands.Cog):
                 "`/ai <tin nhắn>` - Chat với AI\n"
                 "`/chat <tin nhắn>` - Alias của /ai\n"
                 "`/ask <câu hỏi>` - Alias của /ai\n"
+                "`/summarize [số tin]` - Tóm tắt tin nhắn gần đây trong kênh\n"
                 "`/aihelp` - Hiển thị hướng dẫn này\n"
                 "`/aistatus` - Kiểm tra trạng thái AI\n"
                 "`/aiconfig [setting] [value]` - Cấu hình AI (chỉ admin)"
@@ -398,27 +713,8 @@ class Assistant(commands.Cog):
             await ctx.send("❌ AI model chưa được khởi tạo.")
             return
 
-        try:
-            test_response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.model.generate_content(
-                    "Hello",
-                    generation_config=genai.types.GenerationConfig(max_output_tokens=10),
-                ),
-            )
-            if test_response.text:
-                embed = discord.Embed(
-                    title="✅ AI Status",
-                    description="Gemini AI đang hoạt động bình thường",
-                    color=0x00FF88,
-                )
-                embed.add_field(name="Model", value=AI_MODEL, inline=True)
-                embed.add_field(name="API Key", value="✅ Đã cấu hình", inline=True)
-                await ctx.send(embed=embed)
-            else:
-                await ctx.send("⚠️ AI có thể hoạt động nhưng không trả về phản hồi.")
-        except Exception as e:
-            await ctx.send(f"❌ AI không hoạt động: {str(e)}")
+        # Trạng thái lấy từ bộ thăm dò nền, không tốn quota cho mỗi lần gọi lệnh
+        await ctx.send(embed=self._status_embed())
             
     @app_commands.command(name="aistatus", description="Kiểm tra trạng thái hoạt động của AI")
     async def slash_ai_status(self, interaction: discord.Interaction) -> None:
@@ -436,27 +732,8 @@ class Assistant(commands.Cog):
             await interaction.response.send_message("❌ AI model chưa được khởi tạo.", ephemeral=True)
             return
 
-        try:
-            test_response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.model.generate_content(
-                    "Hello",
-                    generation_config=genai.types.GenerationConfig(max_output_tokens=10),
-                ),
-            )
-            if test_response.text:
-                embed = discord.Embed(
-                    title="✅ AI Status",
-                    description="Gemini AI đang hoạt động bình thường",
-                    color=0x00FF88,
-                )
-                embed.add_field(name="Model", value=AI_MODEL, inline=True)
-                embed.add_field(name="API Key", value="✅ Đã cấu hình", inline=True)
-                await interaction.response.send_message(embed=embed)
-            else:
-                await interaction.response.send_message("⚠️ AI có thể hoạt động nhưng không trả về phản hồi.", ephemeral=True)
-        except Exception as e:
-            await interaction.response.send_message(f"❌ AI không hoạt động: {str(e)}", ephemeral=True)
+        # Trạng thái lấy từ bộ thăm dò nền, không tốn quota cho mỗi lần gọi lệnh
+        await interaction.response.send_message(embed=self._status_embed())
 
     @ai_config_command.error
     async def ai_config_error(self, ctx: commands.Context, error: Exception) -> None:
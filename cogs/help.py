@@ -114,6 +114,7 @@ class Help(commands.Cog):
             name="Lệnh",
             value=(
                 "`/say <văn bản>` - Chuyển văn bản thành giọng nói\n"
+                "`/ttsstats` - Xem số liệu bộ đệm giọng nói (chỉ admin)\n"
             ),
             inline=False,
         )
@@ -124,6 +125,8 @@ class Help(commands.Cog):
                 "• Bot sẽ tự động kết nối vào voice channel của bạn.\n"
                 "• Bot sẽ phát âm thanh tương ứng với văn bản bạn nhập.\n"
                 "• Ngôn ngữ mặc định được cấu hình trong file `.env`.\n"
+                "• Câu ngắn hay lặp lại được lưu sẵn nên phát ngay lập tức.\n"
+                "• Nhiều yêu cầu cùng lúc được xếp hàng và nói lần lượt (tối đa 10 yêu cầu chờ).\n"
             ),
             inline=False,
         )
@@ -146,6 +149,7 @@ class Help(commands.Cog):
             value=(
                 "`/image <từ khóa> - Tìm ảnh từ DuckDuckGo\n"
                 "`/meme <từ khóa>` - Tìm ảnh meme từ DuckDuckGo\n"
+                "`/imagestats` - Xem số liệu bộ đệm ảnh và pool meme phổ biến (chỉ admin)\n"
             ),
             inline=False,
         )
@@ -174,6 +178,7 @@ class Help(commands.Cog):
             name="Lệnh",
             value=(
                 "`/ai <tin nhắn>` - Chat với AI\n"
+                "`/summarize [số tin]` - Tóm tắt tin nhắn gần đây trong kênh\n"
                 "`/aistatus` - Kiểm tra trạng thái AI\n"
                 "`/aihelp` - Hướng dẫn chi tiết về AI\n"
                 "`/aiconfig [setting] [value]` - Cấu hình AI (chỉ admin)"
@@ -205,6 +210,10 @@ class Help(commands.Cog):
                 "`/addbadword <từ>` - Thêm từ cấm (chỉ admin)\n"
                 "`/removebadword <từ>` - Xóa từ cấm (chỉ admin)\n"
                 "`/listbadwords` - Xem danh sách từ cấm (chỉ admin)\n"
+                "`/importbadwords <file>` - Nhập từ cấm từ file (chỉ admin)\n"
+                "`/exportbadwords` - Xuất danh sách từ cấm ra file (chỉ admin)\n"
+                "`/addrule <wildcard|regex> <mẫu>` - Thêm luật wildcard/regex (chỉ admin)\n"
+                "`/removerule <id>`, `/listrules` - Xóa/xem luật (chỉ admin)\n"
                 "`/modhelp` - Hiển thị hướng dẫn kiểm duyệt"
             ),
             inline=False,
@@ -236,7 +245,10 @@ class Help(commands.Cog):
                 "`/aiconfig [setting] [value]` - Cấu hình AI\n"
                 "`/addbadword <từ>` - Thêm từ cấm\n"
                 "`/removebadword <từ>` - Xóa từ cấm\n"
-                "`/listbadwords` - Xem danh sách từ cấm"
+                "`/listbadwords` - Xem danh sách từ cấm\n"
+                "`/importbadwords <file>` - Nhập từ cấm từ file\n"
+                "`/exportbadwords` - Xuất danh sách từ cấm ra file\n"
+                "`/addrule`, `/removerule`, `/listrules` - Quản lý luật wildcard/regex"
             ),
             inline=False,
         )
@@ -1,15 +1,21 @@
 import logging
-import random
-import time
+from typing import Awaitable, Callable
 
 import discord
 from discord.ext import commands
 from discord import app_commands
-from ddgs import DDGS
+
+from utils.image_probe import ImageProber
+from utils.image_search import ImageResultCache, ImageSearchClient
+from utils.meme_warmer import MemeWarmer
+from utils.rate_limiter import RateLimitedError
 
 # Cấu hình logger
 logger = logging.getLogger(__name__)
 
+# Hàm sửa tin nhắn "Đang tìm..." (ctx.send(...).edit hoặc interaction.edit_original_response)
+EditCallback = Callable[..., Awaitable[object]]
+
 
 class ImageSearch(commands.Cog):
     """Cog xử lý tìm kiếm ảnh từ DuckDuckGo."""
@@ -21,6 +27,59 @@ class ImageSearch(commands.Cog):
             bot: Đối tượng bot Discord.
         """
         self.bot = bot
+        self.search_client = ImageSearchClient()
+        # Chỉ gửi ảnh còn tải được: kiểm tra đồng thời vài ứng viên, lấy ảnh sống đầu tiên
+        self.prober = ImageProber()
+        # Kết quả mỗi truy vấn được giữ lại và gửi lần lượt thay vì tìm lại mỗi lần
+        self.result_cache = ImageResultCache(self.search_client, prober=self.prober)
+        # Truy vấn meme phổ biến có sẵn kết quả, được bổ sung nền khi bot rảnh
+        self.meme_warmer = MemeWarmer(self.result_cache, self.search_client.limiter)
+
+    async def cog_load(self) -> None:
+        """Bắt đầu làm nóng meme khi cog được nạp."""
+        self.meme_warmer.start()
+
+    async def cog_unload(self) -> None:
+        """Dừng làm nóng meme, các luồng tìm kiếm và session kiểm tra ảnh khi cog bị gỡ."""
+        await self.meme_warmer.stop()
+        self.search_client.close()
+        await self.prober.close()
+
+    async def _send_result(self, query: str, meme: bool, edit: EditCallback) -> None:
+        """Tìm ảnh/meme và sửa tin nhắn chờ thành kết quả (dùng chung cho cả bốn lệnh).
+
+        Args:
+            query: Từ khóa tìm kiếm (đã thêm "meme" nếu là lệnh meme).
+            meme: True nếu là lệnh meme.
+            edit: Hàm sửa tin nhắn chờ.
+        """
+        label = "meme" if meme else "ảnh"
+        try:
+            result = await (self.meme_warmer.pick(query) if meme else self.result_cache.pick(query))
+            if not result:
+                await edit(content=f"❌ Không tìm thấy {label} nào.")
+                logger.warning(f"⚠️ Không tìm thấy {label} cho truy vấn: {query}")
+                return
+
+            image_url = result["image"]
+            source_url = result.get("source", "")
+
+            embed = discord.Embed(
+                title=f"Meme về: {query}" if meme else f"Kết quả cho: {query}",
+                description=f"[Xem ảnh tại nguồn]({source_url})" if source_url else "",
+                color=discord.Color.blurple(),
+            )
+            embed.set_image(url=image_url)
+            embed.set_footer(text="Nguồn: DuckDuckGo Image Search")
+
+            await edit(content="", embed=embed)
+            logger.info(f"✅ Đã gửi {label} cho truy vấn: {query}")
+        except RateLimitedError as e:
+            await edit(content=f"⏳ DuckDuckGo đang hạn chế truy cập, vui lòng thử lại sau khoảng {int(e.retry_after)} giây.")
+            logger.warning(f"⚠️ Từ chối tìm {label} '{query}': {e}")
+        except Exception as e:
+            await edit(content=f"❌ Lỗi khi tìm {label}: {str(e)}")
+            logger.error(f"❌ Lỗi khi tìm {label}: {e}")
 
     @commands.command(name="image", aliases=["img"])
     async def image_search(self, ctx: commands.Context, *, query: str) -> None:
@@ -32,47 +91,8 @@ class ImageSearch(commands.Cog):
         """
         logger.info(f"📸 {ctx.author} gọi lệnh !image với truy vấn: {query}")
         search_msg = await ctx.send(f"🔍 Đang tìm ảnh cho: **{query}**...")
+        await self._send_result(query, False, search_msg.edit)
 
-        try:
-            # Add a delay to help with rate limiting
-            time.sleep(1)
-            with DDGS() as ddgs:
-                results = []
-                retries = 3
-                for attempt in range(retries):
-                    try:
-                        results = list(ddgs.images(query, max_results=10))
-                        break
-                    except Exception as e:
-                        if "403" in str(e) or "Ratelimit" in str(e):
-                            if attempt < retries - 1:  # Not the last attempt
-                                time.sleep(2 ** attempt)  # Exponential backoff
-                                continue
-                        raise e
-                
-                if not results:
-                    await search_msg.edit(content="❌ Không tìm thấy ảnh nào.")
-                    logger.warning(f"⚠️ Không tìm thấy ảnh cho truy vấn: {query}")
-                    return
-
-                result = random.choice(results)
-                image_url = result["image"]
-                source_url = result.get("source", "")
-
-                embed = discord.Embed(
-                    title=f"Kết quả cho: {query}",
-                    description=f"[Xem ảnh tại nguồn]({source_url})" if source_url else "",
-                    color=discord.Color.blurple(),
-                )
-                embed.set_image(url=image_url)
-                embed.set_footer(text="Nguồn: DuckDuckGo Image Search")
-
-                await search_msg.edit(content="", embed=embed)
-                logger.info(f"✅ Đã gửi ảnh cho truy vấn: {query}")
-        except Exception as e:
-            await search_msg.edit(content=f"❌ Lỗi khi tìm ảnh: {str(e)}")
-            logger.error(f"❌ Lỗi khi tìm ảnh: {e}")
-    
     @app_commands.command(name="image", description="Tìm kiếm ảnh từ DuckDuckGo")
     @app_commands.describe(query="Từ khóa tìm kiếm ảnh")
     async def slash_image(self, interaction: discord.Interaction, query: str) -> None:
@@ -84,46 +104,7 @@ class ImageSearch(commands.Cog):
         """
         logger.info(f"📸 {interaction.user} gọi slash command /image với truy vấn: {query}")
         await interaction.response.send_message(f"🔍 Đang tìm ảnh cho: **{query}**...", ephemeral=False)
-        
-        try:
-            # Add a delay to help with rate limiting
-            time.sleep(1)
-            with DDGS() as ddgs:
-                results = []
-                retries = 3
-                for attempt in range(retries):
-                    try:
-                        results = list(ddgs.images(query, max_results=10))
-                        break
-                    except Exception as e:
-                        if "403" in str(e) or "Ratelimit" in str(e):
-                            if attempt < retries - 1:  # Not the last attempt
-                                time.sleep(2 ** attempt)  # Exponential backoff
-                                continue
-                        raise e
-                
-                if not results:
-                    await interaction.edit_original_response(content="❌ Không tìm thấy ảnh nào.")
-                    logger.warning(f"⚠️ Không tìm thấy ảnh cho truy vấn: {query}")
-                    return
-
-                result = random.choice(results)
-                image_url = result["image"]
-                source_url = result.get("source", "")
-
-                embed = discord.Embed(
-                    title=f"Kết quả cho: {query}",
-                    description=f"[Xem ảnh tại nguồn]({source_url})" if source_url else "",
-                    color=discord.Color.blurple(),
-                )
-                embed.set_image(url=image_url)
-                embed.set_footer(text="Nguồn: DuckDuckGo Image Search")
-
-                await interaction.edit_original_response(content="", embed=embed)
-                logger.info(f"✅ Đã gửi ảnh cho truy vấn: {query}")
-        except Exception as e:
-            await interaction.edit_original_response(content=f"❌ Lỗi khi tìm ảnh: {str(e)}")
-            logger.error(f"❌ Lỗi khi tìm ảnh: {e}")
+        await self._send_result(query, False, interaction.edit_original_response)
 
     @commands.command(name="meme")
     async def meme_search(self, ctx: commands.Context, *, query: str) -> None:
@@ -136,47 +117,8 @@ class ImageSearch(commands.Cog):
         query = f"{query} meme"  # Thêm từ "meme" vào truy vấn
         logger.info(f"📸 {ctx.author} gọi lệnh !meme với truy vấn: {query}")
         search_msg = await ctx.send(f"🔍 Đang tìm meme cho: **{query}**...")
+        await self._send_result(query, True, search_msg.edit)
 
-        try:
-            # Add a delay to help with rate limiting
-            time.sleep(1)
-            with DDGS() as ddgs:
-                results = []
-                retries = 3
-                for attempt in range(retries):
-                    try:
-                        results = list(ddgs.images(query, max_results=10))
-                        break
-                    except Exception as e:
-                        if "403" in str(e) or "Ratelimit" in str(e):
-                            if attempt < retries - 1:  # Not the last attempt
-                                time.sleep(2 ** attempt)  # Exponential backoff
-                                continue
-                        raise e
-
-                if not results:
-                    await search_msg.edit(content="❌ Không tìm thấy meme nào.")
-                    logger.warning(f"⚠️ Không tìm thấy meme cho truy vấn: {query}")
-                    return
-
-                result = random.choice(results)
-                image_url = result["image"]
-                source_url = result.get("source", "")
-
-                embed = discord.Embed(
-                    title=f"Meme về: {query}",
-                    description=f"[Xem ảnh tại nguồn]({source_url})" if source_url else "",
-                    color=discord.Color.blurple(),
-                )
-                embed.set_image(url=image_url)
-                embed.set_footer(text="Nguồn: DuckDuckGo Image Search")
-
-                await search_msg.edit(content="", embed=embed)
-                logger.info(f"✅ Đã gửi meme cho truy vấn: {query}")
-        except Exception as e:
-            await search_msg.edit(content=f"❌ Lỗi khi tìm meme: {str(e)}")
-            logger.error(f"❌ Lỗi khi tìm meme: {e}")
-            
     @app_commands.command(name="meme", description="Tìm kiếm meme từ DuckDuckGo")
     @app_commands.describe(query="Từ khóa tìm kiếm meme")
     async def slash_meme(self, interaction: discord.Interaction, query: str) -> None:
@@ -189,43 +131,80 @@ class ImageSearch(commands.Cog):
         query = f"{query} meme"  # Thêm từ "meme" vào truy vấn
         logger.info(f"📸 {interaction.user} gọi slash command /meme với truy vấn: {query}")
         await interaction.response.send_message(f"🔍 Đang tìm meme cho: **{query}**...", ephemeral=False)
-        
-        try:
-            # Add a delay to help with rate limiting
-            time.sleep(1)
-            with DDGS() as ddgs:
-                results = []
-                retries = 3
-                for attempt in range(retries):
-                    try:
-                        results = list(ddgs.images(query, max_results=10))
-                        break
-                    except Exception as e:
-                        if "403" in str(e) or "Ratelimit" in str(e):
-                            if attempt < retries - 1:  # Not the last attempt
-                                time.sleep(2 ** attempt)  # Exponential backoff
-                                continue
-                        raise e
-
-                if not results:
-                    await interaction.edit_original_response(content="❌ Không tìm thấy meme nào.")
-                    logger.warning(f"⚠️ Không tìm thấy meme cho truy vấn: {query}")
-                    return
-
-                result = random.choice(results)
-                image_url = result["image"]
-                source_url = result.get("source", "")
-
-                embed = discord.Embed(
-                    title=f"Meme về: {query}",
-                    description=f"[Xem ảnh tại nguồn]({source_url})" if source_url else "",
-                    color=discord.Color.blurple(),
-                )
-                embed.set_image(url=image_url)
-                embed.set_footer(text="Nguồn: DuckDuckGo Image Search")
-
-                await interaction.edit_original_response(content="", embed=embed)
-                logger.info(f"✅ Đã gửi meme cho truy vấn: {query}")
-        except Exception as e:
-            await interaction.edit_original_response(content=f"❌ Lỗi khi tìm meme: {str(e)}")
-            logger.error(f"❌ Lỗi khi tìm meme: {e}")
\ No newline at end of file
+        await self._send_result(query, True, interaction.edit_original_response)
+
+    def _stats_embed(self) -> discord.Embed:
+        """Tạo embed số liệu bộ đệm ảnh, pool meme và bộ giới hạn DuckDuckGo."""
+        warm = self.meme_warmer.stats()
+        cache = self.result_cache.stats()
+        limiter = self.search_client.limiter.stats()
+        probe = self.prober.stats()
+
+        embed = discord.Embed(title="📊 Thống kê tìm ảnh/meme", color=discord.Color.blurple())
+        pools = "\n".join(
+            f"`{query}` – {size}/{self.meme_warmer.pool_size} kết quả (điểm {score:.1f})"
+            for query, score, size in warm["pools"][:15]
+        )
+        embed.add_field(name="🔥 Pool meme phổ biến", value=pools or "Chưa có truy vấn nào đủ phổ biến.", inline=False)
+        embed.add_field(
+            name="Meme",
+            value=(
+                f"Trả lời từ pool: {warm['warm_hits']} ({warm['hit_rate']:.0%})\n"
+                f"Tìm trực tiếp: {warm['cold_hits']}\n"
+                f"Đã làm nóng: {warm['warmed']} kết quả\n"
+                f"Truy vấn theo dõi: {warm['tracked']}"
+            ),
+            inline=True,
+        )
+        embed.add_field(
+            name="Bộ đệm kết quả",
+            value=(
+                f"Truy vấn: {cache['entries']}\n"
+                f"Tỷ lệ trúng: {cache['hit_rate']:.0%} ({cache['hits']}/{cache['hits'] + cache['misses']})\n"
+                f"Bổ sung nền: {cache['refills']}"
+            ),
+            inline=True,
+        )
+        embed.add_field(
+            name="DuckDuckGo",
+            value=(
+                f"Trạng thái: `{limiter['state']}`\n"
+                f"Tốc độ: {limiter['rate']} yêu cầu/giây\n"
+                f"Bị giới hạn: {limiter['rate_limited']} lần\n"
+                f"URL chết đã bỏ: {probe['dead']}"
+            ),
+            inline=True,
+        )
+        return embed
+
+    @commands.command(name="imagestats")
+    @commands.has_permissions(administrator=True)
+    async def image_stats(self, ctx: commands.Context) -> None:
+        """Hiển thị số liệu bộ đệm ảnh và pool meme phổ biến (chỉ admin).
+
+        Args:
+            ctx: Ngữ cảnh lệnh Discord.
+        """
+        await ctx.send(embed=self._stats_embed())
+
+    @app_commands.command(name="imagestats", description="Xem số liệu bộ đệm ảnh và pool meme phổ biến")
+    @app_commands.default_permissions(administrator=True)
+    async def slash_image_stats(self, interaction: discord.Interaction) -> None:
+        """Slash command hiển thị số liệu bộ đệm ảnh và pool meme phổ biến (chỉ admin).
+
+        Args:
+            interaction: Tương tác từ người dùng.
+        """
+        await interaction.response.send_message(embed=self._stats_embed(), ephemeral=True)
+
+    @image_stats.error
+    async def image_stats_error(self, ctx: commands.Context, error: Exception) -> None:
+        """Xử lý lỗi cho lệnh imagestats.
+
+        Args:
+            ctx: Ngữ cảnh lệnh Discord.
+            error: Lỗi được ném ra.
+        """
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("❌ Bạn cần quyền Administrator để sử dụng lệnh này.")
+            logger.warning(f"⚠️ {ctx.author} cố gắng dùng lệnh admin mà không có quyền")
@@ -1,16 +1,145 @@
+import asyncio
+import codecs
+import csv
+import io
 import json
 import logging
-import re
+import time
+from collections import OrderedDict
+from contextlib import aclosing
 from pathlib import Path
-from typing import List
+from typing import AsyncIterator, Dict, Iterable, List, Literal, Optional, Set, Tuple
 
+import aiohttp
 import discord
 from discord.ext import commands
 from discord import app_commands
 
+from utils.flood_detector import FloodDetector
+from utils.moderation_store import ModerationStore, atomic_write_text
+from utils.pattern_rules import PatternRule, RuleEvaluator, compile_rule
+from utils.violation_pipeline import ViolationPipeline
+from utils.word_filter import GuildWordFilter, WordFilter
+
 # Cấu hình logger
 logger = logging.getLogger(__name__)
 
+# Cơ sở dữ liệu lưu danh sách từ cấm riêng của từng guild
+MODERATION_DB = Path("moderation.db")
+# Số guild tối đa giữ bộ lọc trong bộ nhớ
+GUILD_CACHE_SIZE = 256
+# Bộ lọc của guild không dùng trong khoảng này (giây) sẽ bị giải phóng
+GUILD_IDLE_TTL = 1800.0
+# Giới hạn cho lệnh nhập danh sách từ cấm
+IMPORT_SUFFIXES = {".txt", ".csv", ".json"}
+MAX_IMPORT_BYTES = 8 * 1024 * 1024
+MAX_IMPORT_WORDS = 100_000
+# Số luật wildcard/regex tối đa của một guild
+MAX_RULES_PER_GUILD = 50
+# Thời gian gom các lần sửa liên tiếp của cùng một tin nhắn trước khi quét (giây)
+EDIT_DEBOUNCE = 1.0
+# Số tin nhắn gần đây được ghi nhớ là đã quét không có từ cấm (khi sửa chỉ cần quét vùng thay đổi)
+CLEAN_MESSAGE_CACHE = 10_000
+# Số từ hiển thị trong embed khi danh sách từ cấm được gửi kèm file
+LIST_PREVIEW_WORDS = 50
+
+
+def _parse_json_items(buffer: str, state: str, final: bool) -> Tuple[List[str], str, str]:
+    """Phân tích phần đầu của một mảng JSON đã có trong bộ đệm.
+
+    Args:
+        buffer: Văn bản chưa phân tích.
+        state: Phần đang chờ: ``start`` (dấu ``[``), ``first`` (phần tử đầu hoặc ``]``), ``item``
+            (phần tử sau dấu phẩy), ``next`` (dấu phẩy hoặc ``]``), ``done`` (đã hết mảng).
+        final: Bộ đệm đã chứa hết phần còn lại của file.
+
+    Returns:
+        (các phần tử đọc được, phần văn bản còn lại, trạng thái mới).
+
+    Raises:
+        ValueError: Nếu văn bản không phải một mảng JSON hợp lệ.
+    """
+    decoder = json.JSONDecoder()
+    items: List[str] = []
+    pos = 0
+    while state != "done":
+        while pos < len(buffer) and buffer[pos] in " \t\r\n\ufeff":
+            pos += 1
+        if pos == len(buffer):
+            break
+        char = buffer[pos]
+        if state == "start":
+            if char != "[":
+                raise ValueError("File JSON phải là một mảng các từ")
+            state, pos = "first", pos + 1
+        elif char == "]" and state in ("first", "next"):
+            state, pos = "done", pos + 1
+        elif state == "next":
+            if char != ",":
+                raise ValueError("File JSON không hợp lệ: thiếu dấu phẩy giữa các phần tử")
+            state, pos = "item", pos + 1
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if final:
+                    raise ValueError(f"File JSON không hợp lệ: {e.msg}") from e
+                break
+            if not final and (end == len(buffer) or buffer[end] not in ",] \t\r\n"):
+                # Giá trị chưa có dấu kết thúc phía sau có thể còn dở ("1." của "1.5"): chờ khối kế tiếp
+                break
+            items.append(str(item))
+            state, pos = "next", end
+    return items, buffer[pos:], state
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Đọc dần một mảng JSON từ các khối byte, không giữ cả file trong bộ nhớ.
+
+    Args:
+        chunks: Các khối byte của file JSON (UTF-8).
+
+    Yields:
+        Từng phần tử của mảng, chuyển thành chuỗi.
+
+    Raises:
+        ValueError: Nếu file không phải một mảng JSON hợp lệ.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer, state = "", "start"
+    async for chunk in chunks:
+        items, buffer, state = _parse_json_items(buffer + text_decoder.decode(chunk), state, final=False)
+        for item in items:
+            yield item
+        if state == "done":
+            return
+    items, buffer, state = _parse_json_items(buffer + text_decoder.decode(b"", final=True), state, final=True)
+    for item in items:
+        yield item
+    if state != "done":
+        raise ValueError("File JSON phải là một mảng các từ")
+
+
+class _ImportBatch:
+    """Các từ của một đợt nhập, được phân loại dần khi đọc file (chỉ giữ từ không trùng)."""
+
+    def __init__(self, guild_filter: GuildWordFilter) -> None:
+        self.guild_filter = guild_filter
+        self.new_words: Set[str] = set()
+        # Từ của danh sách chung mà guild đã tắt, được bật lại
+        self.restored: Set[str] = set()
+        self.skipped = 0
+
+    def add(self, word: str) -> None:
+        """Phân loại một từ (chưa chuẩn hóa)."""
+        word = word.lower().strip()
+        if not word or word in self.new_words or word in self.restored or word in self.guild_filter:
+            self.skipped += 1
+        elif word in self.guild_filter.excluded:
+            self.restored.add(word)
+        else:
+            self.new_words.add(word)
+
 
 class Moderation(commands.Cog):
     """Cog xử lý kiểm duyệt tin nhắn và quản lý từ cấm."""
@@ -24,6 +153,350 @@ class Moderation(commands.Cog):
         self.bot = bot
         self.bad_words_file = Path("bad_words.json")
         self.bad_words = self.load_bad_words()
+        # Danh sách chung (bad_words.json) được biên dịch một lần và dùng chung cho mọi guild.
+        # Tin nhắn được chuẩn hóa (bỏ dấu, leetspeak, ký tự vô hình, ...) rồi quét một lượt.
+        self.base_filter = WordFilter(self.bad_words)
+        self.store = ModerationStore(MODERATION_DB)
+        # guild_id -> (thời điểm dùng gần nhất, bộ lọc), sắp xếp theo thứ tự dùng gần nhất
+        self.guild_filters: "OrderedDict[int, Tuple[float, GuildWordFilter]]" = OrderedDict()
+        # Xóa tin nhắn và gửi cảnh báo được xử lý nền, gom theo kênh/người dùng
+        self.violations = ViolationPipeline(self._warning_embed)
+        # Đếm tần suất, nội dung lặp lại và lượt nhắc tên bằng sketch có bộ nhớ cố định
+        self.flood = FloodDetector()
+        # Luật wildcard/regex chạy trong process pool riêng, có giới hạn thời gian
+        self.rule_evaluator = RuleEvaluator()
+        # message_id -> (nội dung trước đợt sửa nếu có trong bộ đệm, tin nhắn mới nhất)
+        self._pending_edits: Dict[int, Tuple[Optional[str], discord.Message]] = {}
+        self._edit_tasks: Set[asyncio.Task] = set()
+        # ID các tin nhắn gần đây đã quét không có từ cấm, theo thứ tự quét
+        self._clean_messages: "OrderedDict[int, None]" = OrderedDict()
+
+    async def cog_load(self) -> None:
+        """Khởi động pipeline xử lý vi phạm khi cog được nạp."""
+        self.violations.start()
+
+    async def cog_unload(self) -> None:
+        """Xử lý nốt vi phạm, ghi nốt thay đổi đang chờ và đóng cơ sở dữ liệu khi cog bị gỡ."""
+        for task in self._edit_tasks:
+            task.cancel()
+        await self.violations.stop()
+        self.rule_evaluator.close()
+        await self.store.aclose()
+
+    @staticmethod
+    def _warning_embed(author: discord.abc.User, words: List[str], reasons: List[str], count: int) -> discord.Embed:
+        """Tạo embed cảnh báo cho các vi phạm đã gom của một người dùng.
+
+        Args:
+            author: Người vi phạm.
+            words: Các từ cấm tìm thấy.
+            reasons: Các lý do bị coi là spam.
+            count: Số tin nhắn vi phạm được gom.
+
+        Returns:
+            Embed cảnh báo.
+        """
+        parts = []
+        if words:
+            parts.append(f"tin nhắn của bạn chứa từ ngữ không phù hợp: **{', '.join(words)}**")
+        if reasons:
+            parts.append(f"bạn bị phát hiện spam ({', '.join(reasons)})")
+        description = f"{author.mention}, " + "; ".join(parts) + ". Vui lòng tuân thủ quy tắc server/"
+        if count > 1:
+            description += f"\nĐã xóa {count} tin nhắn vi phạm."
+        embed = discord.Embed(
+            title="🚨 Cảnh báo từ DSB Bot",
+            description=description,
+            color=discord.Color.red(),
+        )
+        embed.set_footer(text="Liên hệ admin nếu có thắc mắc.")
+        return embed
+
+    def get_guild_filter(self, guild_id: int) -> GuildWordFilter:
+        """Lấy bộ lọc của guild, tải lười từ cơ sở dữ liệu nếu chưa có trong bộ nhớ.
+
+        Args:
+            guild_id: ID guild.
+
+        Returns:
+            Bộ lọc từ cấm của guild.
+        """
+        now = time.monotonic()
+        cached = self.guild_filters.pop(guild_id, None)
+        if cached:
+            guild_filter = cached[1]
+        else:
+            words, excluded = self.store.load_guild(guild_id)
+            guild_filter = GuildWordFilter(self.base_filter, words, excluded, self._load_rules(guild_id))
+        self.guild_filters[guild_id] = (now, guild_filter)
+        self._evict_idle_guilds(now)
+        return guild_filter
+
+    def _load_rules(self, guild_id: int) -> List[PatternRule]:
+        """Đọc và biên dịch các luật wildcard/regex của guild; luật không biên dịch được bị tắt."""
+        rules = []
+        normalize = self.base_filter.normalizer.normalize_entry
+        for rule_id, kind, pattern, enabled, reason in self.store.load_rules(guild_id):
+            try:
+                source = compile_rule(kind, pattern, normalize)
+            except ValueError as e:
+                source, enabled, reason = "", False, str(e)
+            rules.append(PatternRule(rule_id, kind, pattern, source, enabled, reason))
+        return rules
+
+    async def add_guild_rule(self, guild_id: int, kind: str, pattern: str) -> PatternRule:
+        """Kiểm tra và thêm một luật wildcard/regex cho guild.
+
+        Wildcard được chuẩn hóa giống từ cấm: viết không dấu (``dit*``) thì khớp "địt", "dit", "đ.i.t"...,
+        viết có dấu (``địt*``) thì chỉ khớp chữ có đúng dấu đó; regex được khớp trên nội dung gốc viết
+        thường nên phải tự xử lý dấu (ví dụ ``đ[iị]t``).
+
+        Args:
+            guild_id: ID guild.
+            kind: ``wildcard`` hoặc ``regex``.
+            pattern: Mẫu do admin nhập.
+
+        Returns:
+            Luật vừa thêm.
+
+        Raises:
+            ValueError: Nếu mẫu không hợp lệ, chạy quá chậm hoặc guild đã đủ số luật.
+        """
+        guild_filter = self.get_guild_filter(guild_id)
+        if len(guild_filter.rules) >= MAX_RULES_PER_GUILD:
+            raise ValueError(f"Server đã có tối đa {MAX_RULES_PER_GUILD} luật")
+        pattern = pattern.strip()
+        source = compile_rule(kind, pattern, guild_filter.normalizer.normalize_entry)
+        await self.rule_evaluator.validate(source)
+        rule_id = await self.store.add_rule(guild_id, kind, pattern)
+        rule = PatternRule(rule_id, kind, pattern, source)
+        guild_filter.rules.append(rule)
+        return rule
+
+    async def remove_guild_rule(self, guild_id: int, rule_id: int) -> bool:
+        """Xóa một luật của guild.
+
+        Returns:
+            False nếu guild không có luật này.
+        """
+        guild_filter = self.get_guild_filter(guild_id)
+        guild_filter.rules = [rule for rule in guild_filter.rules if rule.id != rule_id]
+        return await self.store.remove_rule(guild_id, rule_id)
+
+    async def _disable_slow_rules(self, guild: discord.Guild, slow: List[Tuple[PatternRule, str]]) -> None:
+        """Tắt các luật chạy chậm/quá thời gian và báo cho admin của server."""
+        for rule, reason in slow:
+            if not rule.enabled:
+                continue
+            rule.enabled = False
+            rule.reason = reason
+            await self.store.set_rule_enabled(guild.id, rule.id, False, reason)
+            logger.warning(f"⚠️ Đã tắt luật #{rule.id} `{rule.pattern}` của guild {guild.id}: {reason}")
+            await self._notify_admins(
+                guild,
+                f"⚠️ Luật kiểm duyệt #{rule.id} (`{rule.pattern}`) đã bị tắt tự động vì {reason}. "
+                "Hãy xóa và thêm lại với mẫu đơn giản hơn.",
+            )
+
+    @staticmethod
+    async def _notify_admins(guild: discord.Guild, text: str) -> None:
+        """Gửi thông báo vào kênh hệ thống của server, hoặc nhắn riêng cho chủ server nếu không gửi được."""
+        channel = guild.system_channel
+        if channel and channel.permissions_for(guild.me).send_messages:
+            try:
+                await channel.send(text)
+                return
+            except discord.HTTPException:
+                pass
+        if guild.owner:
+            try:
+                await guild.owner.send(f"[{guild.name}] {text}")
+            except discord.HTTPException:
+                logger.warning(f"⚠️ Không thể báo cho admin của guild {guild.id}")
+
+    def _evict_idle_guilds(self, now: float) -> None:
+        """Giải phóng bộ lọc của các guild nhàn rỗi lâu hoặc vượt quá dung lượng bộ nhớ đệm."""
+        while self.guild_filters:
+            guild_id, (last_used, _) = next(iter(self.guild_filters.items()))
+            if len(self.guild_filters) <= GUILD_CACHE_SIZE and now - last_used < GUILD_IDLE_TTL:
+                break
+            del self.guild_filters[guild_id]
+            logger.debug(f"🧹 Giải phóng bộ lọc từ cấm của guild {guild_id}")
+
+    def add_guild_word(self, guild_id: int, word: str) -> bool:
+        """Thêm từ cấm cho một guild; chỉ cập nhật bộ lọc của guild đó.
+
+        Args:
+            guild_id: ID guild.
+            word: Từ cấm (đã chuyển chữ thường).
+
+        Returns:
+            False nếu từ đã có hiệu lực trong guild.
+        """
+        guild_filter = self.get_guild_filter(guild_id)
+        if word in guild_filter:
+            return False
+        if word in guild_filter.excluded:
+            # Bật lại từ của danh sách chung mà guild đã tắt trước đó
+            guild_filter.excluded.discard(word)
+            self.store.set_exclusion(guild_id, word, False)
+        else:
+            guild_filter.extra.add(word)
+            self.store.set_word(guild_id, word, True)
+        return True
+
+    def import_guild_words(self, guild_id: int, words: Iterable[str]) -> Tuple[int, int]:
+        """Thêm nhiều từ cấm cho guild với một lần cập nhật bộ lọc và một lần ghi.
+
+        Args:
+            guild_id: ID guild.
+            words: Các từ cần thêm (chưa chuẩn hóa).
+
+        Returns:
+            (số từ được thêm, số từ bị bỏ qua do trùng hoặc rỗng).
+        """
+        batch = _ImportBatch(self.get_guild_filter(guild_id))
+        for word in words:
+            batch.add(word)
+        return self._commit_import(guild_id, batch)
+
+    def _commit_import(self, guild_id: int, batch: "_ImportBatch") -> Tuple[int, int]:
+        """Áp dụng một đợt nhập vào bộ lọc và ghi xuống cơ sở dữ liệu.
+
+        Returns:
+            (số từ được thêm, số từ bị bỏ qua do trùng hoặc rỗng).
+        """
+        guild_filter = batch.guild_filter
+        guild_filter.excluded.difference_update(batch.restored)
+        guild_filter.extra.add_many(batch.new_words)
+        self.store.set_exclusions(guild_id, batch.restored, False)
+        self.store.set_words(guild_id, batch.new_words, True)
+        return len(batch.new_words) + len(batch.restored), batch.skipped
+
+    @staticmethod
+    async def _iter_attachment_words(attachment: discord.Attachment) -> AsyncIterator[str]:
+        """Đọc từ cấm từ file đính kèm theo dòng, không tải cả file vào bộ nhớ.
+
+        Hỗ trợ ``.txt`` (mỗi dòng một từ), ``.csv`` (mọi ô) và ``.json`` (mảng chuỗi).
+
+        Args:
+            attachment: File đính kèm.
+
+        Yields:
+            Từng từ đọc được (chưa chuẩn hóa).
+        """
+        suffix = Path(attachment.filename).suffix.lower()
+        async with aiohttp.ClientSession() as session:
+            async with session.get(attachment.url) as response:
+                response.raise_for_status()
+                if suffix == ".json":
+                    async with aclosing(iter_json_array(response.content.iter_chunked(64 * 1024))) as items:
+                        async for item in items:
+                            yield item
+                    return
+
+                first = True
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8", errors="replace")
+                    if first:
+                        line = line.lstrip("\ufeff")
+                        first = False
+                    if suffix == ".csv":
+                        for row in csv.reader([line]):
+                            for cell in row:
+                                yield cell
+                    else:
+                        yield line
+
+    async def _import_attachment(self, guild_id: int, attachment: discord.Attachment) -> discord.Embed:
+        """Kiểm tra, đọc và nhập file từ cấm cho guild.
+
+        Args:
+            guild_id: ID guild.
+            attachment: File đính kèm do admin gửi.
+
+        Returns:
+            Embed kết quả để gửi lại cho admin.
+        """
+        suffix = Path(attachment.filename).suffix.lower()
+        if suffix not in IMPORT_SUFFIXES:
+            return discord.Embed(
+                title="❌ Lỗi",
+                description="Chỉ hỗ trợ file `.txt`, `.csv` hoặc `.json`.",
+                color=discord.Color.red(),
+            )
+        if attachment.size > MAX_IMPORT_BYTES:
+            return discord.Embed(
+                title="❌ Lỗi",
+                description=f"File quá lớn (tối đa {MAX_IMPORT_BYTES // (1024 * 1024)} MB).",
+                color=discord.Color.red(),
+            )
+
+        batch = _ImportBatch(self.get_guild_filter(guild_id))
+        count = 0
+        # aclosing: thoát sớm khỏi vòng lặp vẫn đóng generator và phản hồi HTTP của nó ngay
+        async with aclosing(self._iter_attachment_words(attachment)) as words:
+            async for word in words:
+                count += 1
+                if count > MAX_IMPORT_WORDS:
+                    return discord.Embed(
+                        title="❌ Lỗi",
+                        description=f"File có quá nhiều từ (tối đa {MAX_IMPORT_WORDS:,}).",
+                        color=discord.Color.red(),
+                    )
+                batch.add(word)
+
+        added, skipped = self._commit_import(guild_id, batch)
+        logger.info(f"✅ Đã nhập {added} từ cấm cho guild {guild_id} (bỏ qua {skipped})")
+        return discord.Embed(
+            title="✅ Thành công",
+            description=f"Đã nhập **{added}** từ cấm mới, bỏ qua **{skipped}** từ trùng hoặc rỗng.",
+            color=discord.Color.green(),
+        )
+
+    @staticmethod
+    def _list_preview(bad_words: List[str]) -> str:
+        """Phần đầu danh sách từ cấm để hiển thị trong embed khi cả danh sách được gửi kèm file."""
+        preview = "\n".join(bad_words[:LIST_PREVIEW_WORDS])
+        remaining = len(bad_words) - LIST_PREVIEW_WORDS
+        if remaining > 0:
+            return f"{preview}\n... và {remaining} từ khác trong file đính kèm."
+        return f"{preview}\n\nDanh sách đầy đủ trong file đính kèm."
+
+    def _export_file(self, guild_id: int) -> discord.File:
+        """Tạo file văn bản chứa toàn bộ danh sách từ cấm của guild (mỗi dòng một từ).
+
+        Args:
+            guild_id: ID guild.
+
+        Returns:
+            File đính kèm để gửi lên Discord.
+        """
+        buffer = io.BytesIO()
+        for word in self.get_guild_filter(guild_id).words:
+            buffer.write(word.encode("utf-8") + b"\n")
+        buffer.seek(0)
+        return discord.File(buffer, filename=f"bad_words_{guild_id}.txt")
+
+    def remove_guild_word(self, guild_id: int, word: str) -> bool:
+        """Xóa từ cấm khỏi một guild; từ của danh sách chung chỉ bị tắt cho guild đó.
+
+        Args:
+            guild_id: ID guild.
+            word: Từ cấm (đã chuyển chữ thường).
+
+        Returns:
+            False nếu từ không có hiệu lực trong guild.
+        """
+        guild_filter = self.get_guild_filter(guild_id)
+        if word not in guild_filter:
+            return False
+        if guild_filter.extra.remove(word):
+            self.store.set_word(guild_id, word, False)
+        if word in guild_filter.base and word not in guild_filter.excluded:
+            guild_filter.excluded.add(word)
+            self.store.set_exclusion(guild_id, word, True)
+        return True
 
     def load_bad_words(self) -> List[str]:
         """Tải danh sách từ cấm từ file JSON.
@@ -45,7 +518,21 @@ class Moderation(commands.Cog):
             self.save_bad_words(default_bad_words)
             return default_bad_words
         except json.JSONDecodeError as e:
-            logger.error(f"❌ Lỗi định dạng JSON trong bad_words.json: {e}. Sử dụng danh sách mặc định")
+            # Giữ lại file hỏng để có thể khôi phục thủ công thay vì ghi đè mất dữ liệu
+            backup = self.bad_words_file.with_suffix(".json.corrupt")
+            try:
+                self.bad_words_file.replace(backup)
+            except OSError as backup_error:
+                # Không sao lưu được thì cũng không ghi đè file hỏng, chỉ dùng danh sách mặc định
+                logger.error(
+                    f"❌ Lỗi định dạng JSON trong bad_words.json: {e}. "
+                    f"Không thể sao lưu file hỏng ({backup_error}), sử dụng danh sách mặc định"
+                )
+                return default_bad_words
+            logger.error(
+                f"❌ Lỗi định dạng JSON trong bad_words.json: {e}. "
+                f"Đã sao lưu file hỏng sang {backup.name} và sử dụng danh sách mặc định"
+            )
             self.save_bad_words(default_bad_words)
             return default_bad_words
         except Exception as e:
@@ -60,15 +547,88 @@ class Moderation(commands.Cog):
             bad_words: Danh sách từ cấm cần lưu. Nếu None, sử dụng self.bad_words.
         """
         try:
-            with self.bad_words_file.open("w", encoding="utf-8") as f:
-                json.dump(bad_words or self.bad_words, f, indent=4, ensure_ascii=False)
+            atomic_write_text(
+                self.bad_words_file, json.dumps(bad_words or self.bad_words, indent=4, ensure_ascii=False)
+            )
             logger.info("✅ Đã lưu danh sách từ cấm vào bad_words.json")
         except Exception as e:
             logger.error(f"❌ Lỗi khi lưu bad_words.json: {e}")
 
+    def check_flood(self, message: discord.Message) -> List[str]:
+        """Ghi nhận tin nhắn vào bộ phát hiện flood và trả về các lý do spam (nếu có).
+
+        Người có quyền quản lý tin nhắn được bỏ qua.
+
+        Args:
+            message: Tin nhắn trong guild.
+
+        Returns:
+            Danh sách lý do vi phạm, rỗng nếu tin nhắn bình thường.
+        """
+        author = message.author
+        if not isinstance(author, discord.Member) or author.guild_permissions.manage_messages:
+            return []
+        mentions = len(message.raw_mentions) + len(message.raw_role_mentions) + int(message.mention_everyone)
+        member_age = None
+        if author.joined_at:
+            member_age = (discord.utils.utcnow() - author.joined_at).total_seconds()
+        return self.flood.check(
+            message.guild.id,
+            message.channel.id,
+            author.id,
+            message.content,
+            mentions=mentions,
+            member_age=member_age,
+        )
+
+    def _is_command(self, message: discord.Message) -> bool:
+        """Kiểm tra tin nhắn có phải là một lệnh (bắt đầu bằng tiền tố lệnh) hay không."""
+        content = message.content.lower()
+        if isinstance(self.bot.command_prefix, str):
+            return content.startswith(self.bot.command_prefix) if self.bot.command_prefix else False
+        if callable(self.bot.command_prefix):
+            prefixes = self.bot.command_prefix(self.bot, message)
+            if isinstance(prefixes, str):
+                return content.startswith(prefixes)
+            if isinstance(prefixes, (list, tuple)):
+                return any(content.startswith(prefix) for prefix in prefixes)
+        return False
+
+    async def _scan_canonical(
+        self,
+        guild: discord.Guild,
+        guild_filter: GuildWordFilter,
+        content: str,
+        canonical: str,
+        previous: Optional[str] = None,
+    ) -> List[str]:
+        """Quét văn bản đã chuẩn hóa qua danh sách từ cấm, rồi qua các luật wildcard/regex nếu chưa khớp.
+
+        Args:
+            guild: Guild của tin nhắn.
+            guild_filter: Bộ lọc của guild.
+            content: Nội dung gốc (luật regex được khớp trên nội dung này, viết thường).
+            canonical: Văn bản đã chuẩn hóa.
+            previous: Văn bản đã chuẩn hóa trước khi sửa; nếu có thì chỉ quét vùng thay đổi.
+
+        Returns:
+            Các từ cấm hoặc mẫu luật khớp.
+        """
+        if previous is None:
+            hits = guild_filter.scan_normalized(canonical)
+        else:
+            hits = guild_filter.scan_changed(previous, canonical)
+        if not hits and guild_filter.rules:
+            # Luật regex không quét theo vùng được nên luôn chạy trên toàn bộ văn bản
+            result = await self.rule_evaluator.evaluate(guild_filter.rules, canonical, content.lower())
+            hits = [rule.pattern for rule in result.matched]
+            if result.slow:
+                await self._disable_slow_rules(guild, result.slow)
+        return hits
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
-        """Kiểm tra tin nhắn chứa từ cấm và gửi cảnh báo.
+        """Kiểm tra tin nhắn chứa từ cấm hoặc spam và gửi cảnh báo.
 
         Args:
             message: Tin nhắn Discord cần kiểm tra.
@@ -88,51 +648,99 @@ class Moderation(commands.Cog):
                 logger.error(f"❌ Lỗi khi xóa tin nhắn lệnh: {e}")
             return
 
-        #Kiểm tra nếu tin nhắn là một lệnh (bắt đầu bằng tiền tố lệnh)
-        is_command = False
-        if isinstance(self.bot.command_prefix, str):
-            is_command = content.startswith(self.bot.command_prefix) if self.bot.command_prefix else False
-        elif callable(self.bot.command_prefix):
-            prefixes = self.bot.command_prefix(self.bot, message)
-            if isinstance(prefixes, str):
-                is_command = content.startswith(prefixes)
-            elif isinstance(prefixes, (list, tuple)):
-                is_command = any(content.startswith(prefix) for prefix in prefixes)
-
-        if not is_command:
-            for word in self.bad_words:
-                if re.search(rf"\b{re.escape(word)}\b", content, re.IGNORECASE):
-                    logger.warning(
-                        f"⚠️ Phát hiện từ cấm '{word}' từ {message.author} trong kênh {message.channel}"
-                    )
-                    embed = discord.Embed(
-                        title="🚨 Cảnh báo từ DSB Bot",
-                        description=(
-                            f"{message.author.mention}, tin nhắn của bạn chứa từ ngữ không phù hợp: **{word}**. "
-                            "Vui lòng tuân thủ quy tắc server/"
-                        ),
-                        color=discord.Color.red(),
-                    )
-                    embed.set_footer(text="Liên hệ admin nếu có thắc mắc.")
-
-                    try:
-                        await message.channel.send(embed=embed)
-                        await message.author.send(embed=embed)
-                        await message.delete()
-                    except discord.Forbidden:
-                        logger.warning(
-                            f"⚠️ Không có quyền gửi tin nhắn hoặc xóa tin nhắn trong {message.channel}"
-                        )
-                        await message.channel.send(
-                            f"{message.author.mention}, tin nhắn của bạn chứa từ cấm nhưng bot không có quyền xóa. "
-                            "Vui lòng tự chỉnh sửa/"
-                        )
-                    except Exception as e:
-                        logger.error(f"❌ Lỗi khi xử lý vi phạm: {e}")
-                    return
+        reasons = self.check_flood(message)
+        hits: List[str] = []
+        if not self._is_command(message):
+            timings = {} if logger.isEnabledFor(logging.DEBUG) else None
+            guild_filter = self.get_guild_filter(message.guild.id)
+            canonical = guild_filter.normalizer.scan_form(message.content, timings)
+            if timings:
+                logger.debug(
+                    "⏱️ Thời gian chuẩn hóa (µs): " + ", ".join(f"{k}={v:.1f}" for k, v in timings.items())
+                )
+            hits = await self._scan_canonical(message.guild, guild_filter, message.content, canonical)
+            if hits:
+                logger.warning(
+                    f"⚠️ Phát hiện từ cấm '{', '.join(hits)}' từ {message.author} trong kênh {message.channel}"
+                )
+            else:
+                self._mark_clean(message.id)
+        if reasons:
+            logger.warning(f"⚠️ Phát hiện spam ({', '.join(reasons)}) từ {message.author} trong kênh {message.channel}")
+        if hits or reasons:
+            # Chỉ đưa vào hàng đợi; xóa và cảnh báo được xử lý nền theo lô
+            self.violations.submit(message, hits, reasons)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        """Gom các lần sửa tin nhắn rồi quét lại phần nội dung bị thay đổi.
+
+        Args:
+            payload: Dữ liệu sự kiện sửa tin nhắn.
+        """
+        message = payload.message
+        if not payload.guild_id or message.author.bot:
+            return
+        pending = self._pending_edits.get(payload.message_id)
+        if pending:
+            # Đang trong một đợt sửa liên tiếp: giữ nội dung gốc, chỉ cập nhật bản mới nhất
+            self._pending_edits[payload.message_id] = (pending[0], message)
+            return
+        previous = payload.cached_message.content if payload.cached_message else None
+        self._pending_edits[payload.message_id] = (previous, message)
+        task = asyncio.create_task(self._scan_edit(payload.message_id))
+        self._edit_tasks.add(task)
+        task.add_done_callback(self._edit_tasks.discard)
+
+    def _mark_clean(self, message_id: int) -> None:
+        """Ghi nhớ tin nhắn đã quét không có từ cấm (chỉ giữ ``CLEAN_MESSAGE_CACHE`` tin gần nhất)."""
+        self._clean_messages[message_id] = None
+        self._clean_messages.move_to_end(message_id)
+        if len(self._clean_messages) > CLEAN_MESSAGE_CACHE:
+            self._clean_messages.popitem(last=False)
+
+    async def _scan_edit(self, message_id: int) -> None:
+        """Quét tin nhắn đã sửa sau ``EDIT_DEBOUNCE`` giây.
+
+        Chỉ quét vùng thay đổi khi biết nội dung cũ và nội dung cũ đã được quét sạch; ngược lại
+        (tin nhắn cũ hơn bộ nhớ, bot vừa khởi động, lần quét trước lỗi...) quét lại toàn bộ.
+        Kể cả sửa chỉ khoảng trắng cũng phải quét vì có thể nối các chữ bị tách ("sh it" -> "shit").
+        """
+        await asyncio.sleep(EDIT_DEBOUNCE)
+        previous, message = self._pending_edits.pop(message_id)
+        content = message.content
+        if message_id not in self._clean_messages:
+            previous = None
+        elif previous == content:
+            # Chỉ cập nhật embed, nội dung đã quét sạch không đổi
+            return
+        try:
+            if self._is_command(message):
+                return
+
+            guild_filter = self.get_guild_filter(message.guild.id)
+            normalize = guild_filter.normalizer.scan_form
+            canonical = normalize(content)
+            hits = await self._scan_canonical(
+                message.guild, guild_filter, content, canonical, normalize(previous) if previous is not None else None
+            )
+            if hits:
+                logger.warning(
+                    f"⚠️ Phát hiện từ cấm '{', '.join(hits)}' trong tin nhắn đã sửa của {message.author} "
+                    f"trong kênh {message.channel}"
+                )
+                self._clean_messages.pop(message_id, None)
+                self.violations.submit(message, hits)
+            else:
+                self._mark_clean(message_id)
+        except Exception as e:
+            # Tác vụ chạy nền: không bắt lỗi thì chỉ thấy "Task exception was never retrieved"
+            logger.error(f"❌ Lỗi khi quét tin nhắn đã sửa {message_id}: {e}")
+            self._clean_messages.pop(message_id, None)
 
     @commands.command(name="addbadword")
     @commands.has_permissions(administrator=True)
+    @commands.guild_only()
     async def add_bad_word(self, ctx: commands.Context, *, word: str) -> None:
         """Thêm từ cấm vào danh sách (chỉ admin).
 
@@ -145,12 +753,10 @@ class Moderation(commands.Cog):
         if not word:
             await ctx.send("❌ Vui lòng cung cấp từ cấm hợp lệ.")
             return
-        if word in self.bad_words:
+        if not self.add_guild_word(ctx.guild.id, word):
             await ctx.send(f"❌ Từ '{word}' đã có trong danh sách từ cấm.")
             return
 
-        self.bad_words.append(word)
-        self.save_bad_words()
         embed = discord.Embed(
             title="✅ Thành công",
             description=f"Đã thêm từ cấm: **{word}**.",
@@ -162,6 +768,7 @@ class Moderation(commands.Cog):
     @app_commands.command(name="addbadword", description="Thêm từ cấm vào danh sách (chỉ admin)")
     @app_commands.describe(word="Từ cần thêm vào danh sách từ cấm")
     @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
     async def slash_add_bad_word(self, interaction: discord.Interaction, word: str) -> None:
         """Slash command thêm từ cấm vào danh sách (chỉ admin).
 
@@ -174,12 +781,10 @@ class Moderation(commands.Cog):
         if not word:
             await interaction.response.send_message("❌ Vui lòng cung cấp từ cấm hợp lệ.", ephemeral=True)
             return
-        if word in self.bad_words:
+        if not self.add_guild_word(interaction.guild.id, word):
             await interaction.response.send_message(f"❌ Từ '{word}' đã có trong danh sách từ cấm.", ephemeral=True)
             return
 
-        self.bad_words.append(word)
-        self.save_bad_words()
         embed = discord.Embed(
             title="✅ Thành công",
             description=f"Đã thêm từ cấm: **{word}**.",
@@ -190,6 +795,7 @@ class Moderation(commands.Cog):
 
     @commands.command(name="removebadword")
     @commands.has_permissions(administrator=True)
+    @commands.guild_only()
     async def remove_bad_word(self, ctx: commands.Context, *, word: str) -> None:
         """Xóa từ cấm khỏi danh sách (chỉ admin).
 
@@ -202,12 +808,10 @@ class Moderation(commands.Cog):
         if not word:
             await ctx.send("❌ Vui lòng cung cấp từ cấm hợp lệ.")
             return
-        if word not in self.bad_words:
+        if not self.remove_guild_word(ctx.guild.id, word):
             await ctx.send(f"❌ Từ '{word}' không có trong danh sách từ cấm.")
             return
 
-        self.bad_words.remove(word)
-        self.save_bad_words()
         embed = discord.Embed(
             title="✅ Thành công",
             description=f"Đã xóa từ cấm: **{word}**.",
@@ -219,6 +823,7 @@ class Moderation(commands.Cog):
     @app_commands.command(name="removebadword", description="Xóa từ cấm khỏi danh sách (chỉ admin)")
     @app_commands.describe(word="Từ cần xóa khỏi danh sách từ cấm")
     @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
     async def slash_remove_bad_word(self, interaction: discord.Interaction, word: str) -> None:
         """Slash command xóa từ cấm khỏi danh sách (chỉ admin).
 
@@ -231,12 +836,10 @@ class Moderation(commands.Cog):
         if not word:
             await interaction.response.send_message("❌ Vui lòng cung cấp từ cấm hợp lệ.", ephemeral=True)
             return
-        if word not in self.bad_words:
+        if not self.remove_guild_word(interaction.guild.id, word):
             await interaction.response.send_message(f"❌ Từ '{word}' không có trong danh sách từ cấm.", ephemeral=True)
             return
 
-        self.bad_words.remove(word)
-        self.save_bad_words()
         embed = discord.Embed(
             title="✅ Thành công",
             description=f"Đã xóa từ cấm: **{word}**.",
@@ -247,6 +850,7 @@ class Moderation(commands.Cog):
 
     @commands.command(name="listbadwords")
     @commands.has_permissions(administrator=True)
+    @commands.guild_only()
     async def list_bad_words(self, ctx: commands.Context) -> None:
         """Hiển thị danh sách từ cấm (chỉ admin).
 
@@ -254,7 +858,8 @@ class Moderation(commands.Cog):
             ctx: Ngữ cảnh lệnh Discord.
         """
         logger.info(f"{ctx.author} gọi lệnh /listbadwords")
-        if not self.bad_words:
+        bad_words = self.get_guild_filter(ctx.guild.id).words
+        if not bad_words:
             embed = discord.Embed(
                 title="📜 Danh sách từ cấm",
                 description="Danh sách từ cấm hiện đang trống.",
@@ -263,16 +868,15 @@ class Moderation(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        words_str = "\n".join(self.bad_words)
+        words_str = "\n".join(bad_words)
         if len(words_str) > 1000:
-            words_chunks = [self.bad_words[i : i + 50] for i in range(0, len(self.bad_words), 50)]
-            for i, chunk in enumerate(words_chunks):
-                embed = discord.Embed(
-                    title="📜 Danh sách từ cấm" if i == 0 else f"📜 Danh sách từ cấm (phần {i+1})",
-                    description="\n".join(chunk),
-                    color=discord.Color.blue(),
-                )
-                await ctx.send(embed=embed)
+            # Danh sách dài được gửi dưới dạng file thay vì nhiều embed
+            embed = discord.Embed(
+                title="📜 Danh sách từ cấm",
+                description=self._list_preview(bad_words),
+                color=discord.Color.blue(),
+            )
+            await ctx.send(embed=embed, file=self._export_file(ctx.guild.id))
         else:
             embed = discord.Embed(
                 title="📜 Danh sách từ cấm",
@@ -283,6 +887,7 @@ class Moderation(commands.Cog):
             
     @app_commands.command(name="listbadwords", description="Hiển thị danh sách từ cấm (chỉ admin)")
     @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
     async def slash_list_bad_words(self, interaction: discord.Interaction) -> None:
         """Slash command hiển thị danh sách từ cấm (chỉ admin).
 
@@ -290,7 +895,8 @@ class Moderation(commands.Cog):
             interaction: Tương tác từ người dùng.
         """
         logger.info(f"{interaction.user} gọi slash command /listbadwords")
-        if not self.bad_words:
+        bad_words = self.get_guild_filter(interaction.guild.id).words
+        if not bad_words:
             embed = discord.Embed(
                 title="📜 Danh sách từ cấm",
                 description="Danh sách từ cấm hiện đang trống.",
@@ -299,25 +905,15 @@ class Moderation(commands.Cog):
             await interaction.response.send_message(embed=embed)
             return
 
-        words_str = "\n".join(self.bad_words)
+        words_str = "\n".join(bad_words)
         if len(words_str) > 1000:
-            words_chunks = [self.bad_words[i : i + 50] for i in range(0, len(self.bad_words), 50)]
-            # For the first chunk, we send as the response
+            # Danh sách dài được gửi dưới dạng file thay vì nhiều embed
             embed = discord.Embed(
                 title="📜 Danh sách từ cấm",
-                description="\n".join(words_chunks[0]),
+                description=self._list_preview(bad_words),
                 color=discord.Color.blue(),
             )
-            await interaction.response.send_message(embed=embed)
-            
-            # For subsequent chunks, we send as followups
-            for i, chunk in enumerate(words_chunks[1:], start=2):
-                embed = discord.Embed(
-                    title=f"📜 Danh sách từ cấm (phần {i})",
-                    description="\n".join(chunk),
-                    color=discord.Color.blue(),
-                )
-                await interaction.followup.send(embed=embed)
+            await interaction.response.send_message(embed=embed, file=self._export_file(interaction.guild.id))
         else:
             embed = discord.Embed(
                 title="📜 Danh sách từ cấm",
@@ -326,6 +922,201 @@ class Moderation(commands.Cog):
             )
             await interaction.response.send_message(embed=embed)
 
+    @commands.command(name="importbadwords")
+    @commands.has_permissions(administrator=True)
+    @commands.guild_only()
+    async def import_bad_words(self, ctx: commands.Context) -> None:
+        """Nhập danh sách từ cấm từ file đính kèm (chỉ admin).
+
+        Args:
+            ctx: Ngữ cảnh lệnh Discord.
+        """
+        logger.info(f"{ctx.author} gọi lệnh /importbadwords")
+        if not ctx.message.attachments:
+            await ctx.send("❌ Vui lòng đính kèm file `.txt`, `.csv` hoặc `.json` chứa danh sách từ cấm.")
+            return
+
+        async with ctx.typing():
+            try:
+                embed = await self._import_attachment(ctx.guild.id, ctx.message.attachments[0])
+            except Exception as e:
+                logger.error(f"❌ Lỗi khi nhập danh sách từ cấm: {e}")
+                await ctx.send(f"❌ Không thể đọc file: {e}")
+                return
+        await ctx.send(embed=embed)
+
+    @app_commands.command(name="importbadwords", description="Nhập danh sách từ cấm từ file (chỉ admin)")
+    @app_commands.describe(file="File .txt (mỗi dòng một từ), .csv hoặc .json (mảng chuỗi)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def slash_import_bad_words(self, interaction: discord.Interaction, file: discord.Attachment) -> None:
+        """Slash command nhập danh sách từ cấm từ file đính kèm (chỉ admin).
+
+        Args:
+            interaction: Tương tác từ người dùng.
+            file: File chứa danh sách từ cấm.
+        """
+        logger.info(f"{interaction.user} gọi slash command /importbadwords với file: {file.filename}")
+        await interaction.response.send_message(f"📥 Đang nhập từ cấm từ **{file.filename}**...")
+        try:
+            embed = await self._import_attachment(interaction.guild.id, file)
+        except Exception as e:
+            logger.error(f"❌ Lỗi khi nhập danh sách từ cấm: {e}")
+            await interaction.edit_original_response(content=f"❌ Không thể đọc file: {e}")
+            return
+        await interaction.edit_original_response(content="", embed=embed)
+
+    @commands.command(name="exportbadwords")
+    @commands.has_permissions(administrator=True)
+    @commands.guild_only()
+    async def export_bad_words(self, ctx: commands.Context) -> None:
+        """Xuất danh sách từ cấm của server ra file (chỉ admin).
+
+        Args:
+            ctx: Ngữ cảnh lệnh Discord.
+        """
+        logger.info(f"{ctx.author} gọi lệnh /exportbadwords")
+        await ctx.send("📤 Danh sách từ cấm của server:", file=self._export_file(ctx.guild.id))
+
+    @app_commands.command(name="exportbadwords", description="Xuất danh sách từ cấm ra file (chỉ admin)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def slash_export_bad_words(self, interaction: discord.Interaction) -> None:
+        """Slash command xuất danh sách từ cấm của server ra file (chỉ admin).
+
+        Args:
+            interaction: Tương tác từ người dùng.
+        """
+        logger.info(f"{interaction.user} gọi slash command /exportbadwords")
+        await interaction.response.send_message(
+            "📤 Danh sách từ cấm của server:", file=self._export_file(interaction.guild.id), ephemeral=True
+        )
+
+    @staticmethod
+    def _rules_embed(rules: List[PatternRule]) -> discord.Embed:
+        """Tạo embed liệt kê các luật wildcard/regex của server."""
+        if not rules:
+            return discord.Embed(
+                title="📜 Luật kiểm duyệt",
+                description="Server chưa có luật wildcard/regex nào.",
+                color=discord.Color.blue(),
+            )
+        lines = []
+        for rule in rules:
+            status = "✅" if rule.enabled else f"⛔ ({rule.reason})"
+            lines.append(f"`#{rule.id}` {rule.kind} `{rule.pattern}` {status}")
+        return discord.Embed(title="📜 Luật kiểm duyệt", description="\n".join(lines), color=discord.Color.blue())
+
+    @commands.command(name="addrule")
+    @commands.has_permissions(administrator=True)
+    @commands.guild_only()
+    async def add_rule(self, ctx: commands.Context, kind: str, *, pattern: str) -> None:
+        """Thêm luật wildcard hoặc regex (chỉ admin).
+
+        Wildcard được chuẩn hóa giống tin nhắn (bỏ dấu, leetspeak...); regex khớp trên nội dung gốc
+        viết thường, giữ nguyên dấu.
+
+        Args:
+            ctx: Ngữ cảnh lệnh Discord.
+            kind: ``wildcard`` hoặc ``regex``.
+            pattern: Mẫu cần chặn.
+        """
+        logger.info(f"{ctx.author} gọi lệnh /addrule với {kind}: {pattern}")
+        try:
+            rule = await self.add_guild_rule(ctx.guild.id, kind.lower(), pattern)
+        except ValueError as e:
+            await ctx.send(f"❌ {e}")
+            return
+        await ctx.send(f"✅ Đã thêm luật #{rule.id} ({rule.kind}): `{rule.pattern}`")
+
+    @app_commands.command(name="addrule", description="Thêm luật wildcard hoặc regex (chỉ admin)")
+    @app_commands.describe(
+        kind="Loại luật: wildcard khớp văn bản đã bỏ dấu/leetspeak, regex khớp nội dung gốc (giữ dấu)",
+        pattern="Mẫu cần chặn, ví dụ f*ck, dit* hoặc đ[iị]t",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def slash_add_rule(
+        self, interaction: discord.Interaction, kind: Literal["wildcard", "regex"], pattern: str
+    ) -> None:
+        """Slash command thêm luật wildcard hoặc regex (chỉ admin).
+
+        Wildcard được chuẩn hóa giống tin nhắn (bỏ dấu, leetspeak...); regex khớp trên nội dung gốc
+        viết thường, giữ nguyên dấu.
+
+        Args:
+            interaction: Tương tác từ người dùng.
+            kind: ``wildcard`` hoặc ``regex``.
+            pattern: Mẫu cần chặn.
+        """
+        logger.info(f"{interaction.user} gọi slash command /addrule với {kind}: {pattern}")
+        await interaction.response.defer(ephemeral=True)
+        try:
+            rule = await self.add_guild_rule(interaction.guild.id, kind, pattern)
+        except ValueError as e:
+            await interaction.followup.send(f"❌ {e}", ephemeral=True)
+            return
+        await interaction.followup.send(f"✅ Đã thêm luật #{rule.id} ({rule.kind}): `{rule.pattern}`", ephemeral=True)
+
+    @commands.command(name="removerule")
+    @commands.has_permissions(administrator=True)
+    @commands.guild_only()
+    async def remove_rule(self, ctx: commands.Context, rule_id: int) -> None:
+        """Xóa một luật wildcard/regex (chỉ admin).
+
+        Args:
+            ctx: Ngữ cảnh lệnh Discord.
+            rule_id: Số thứ tự của luật (xem /listrules).
+        """
+        logger.info(f"{ctx.author} gọi lệnh /removerule với luật #{rule_id}")
+        if await self.remove_guild_rule(ctx.guild.id, rule_id):
+            await ctx.send(f"✅ Đã xóa luật #{rule_id}")
+        else:
+            await ctx.send(f"❌ Không tìm thấy luật #{rule_id}")
+
+    @app_commands.command(name="removerule", description="Xóa một luật wildcard/regex (chỉ admin)")
+    @app_commands.describe(rule_id="Số thứ tự của luật (xem /listrules)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def slash_remove_rule(self, interaction: discord.Interaction, rule_id: int) -> None:
+        """Slash command xóa một luật wildcard/regex (chỉ admin).
+
+        Args:
+            interaction: Tương tác từ người dùng.
+            rule_id: Số thứ tự của luật.
+        """
+        logger.info(f"{interaction.user} gọi slash command /removerule với luật #{rule_id}")
+        if await self.remove_guild_rule(interaction.guild.id, rule_id):
+            await interaction.response.send_message(f"✅ Đã xóa luật #{rule_id}", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"❌ Không tìm thấy luật #{rule_id}", ephemeral=True)
+
+    @commands.command(name="listrules")
+    @commands.has_permissions(administrator=True)
+    @commands.guild_only()
+    async def list_rules(self, ctx: commands.Context) -> None:
+        """Xem các luật wildcard/regex của server (chỉ admin).
+
+        Args:
+            ctx: Ngữ cảnh lệnh Discord.
+        """
+        logger.info(f"{ctx.author} gọi lệnh /listrules")
+        await ctx.send(embed=self._rules_embed(self.get_guild_filter(ctx.guild.id).rules))
+
+    @app_commands.command(name="listrules", description="Xem các luật wildcard/regex (chỉ admin)")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def slash_list_rules(self, interaction: discord.Interaction) -> None:
+        """Slash command xem các luật wildcard/regex của server (chỉ admin).
+
+        Args:
+            interaction: Tương tác từ người dùng.
+        """
+        logger.info(f"{interaction.user} gọi slash command /listrules")
+        await interaction.response.send_message(
+            embed=self._rules_embed(self.get_guild_filter(interaction.guild.id).rules), ephemeral=True
+        )
+
     @commands.command(name="modhelp")
     async def moderation_help(self, ctx: commands.Context) -> None:
         """Hiển thị hướng dẫn sử dụng các lệnh kiểm duyệt.
@@ -345,14 +1136,23 @@ class Moderation(commands.Cog):
                 "`/addbadword <từ>` - Thêm từ cấm (chỉ admin)\n"
                 "`/removebadword <từ>` - Xóa từ cấm (chỉ admin)\n"
                 "`/listbadwords` - Xem danh sách từ cấm (chỉ admin)\n"
+                "`/importbadwords <file>` - Nhập từ cấm từ file txt/csv/json (chỉ admin)\n"
+                "`/exportbadwords` - Xuất danh sách từ cấm ra file (chỉ admin)\n"
+                "`/addrule <wildcard|regex> <mẫu>` - Thêm luật wildcard/regex (chỉ admin)\n"
+                "`/removerule <id>` - Xóa luật (chỉ admin)\n"
+                "`/listrules` - Xem các luật (chỉ admin)\n"
                 "`/modhelp` - Hiển thị hướng dẫn này"
             ),
             inline=False,
         )
         embed.add_field(
             name="💡 Ghi chú",
-            value="Bot tự động kiểm tra tin nhắn và gửi cảnh báo khi phát hiện từ cấm, "
-            "ngoại trừ các lệnh /addbadword và /removebadword.",
+            value="Bot tự động kiểm tra tin nhắn (kể cả khi được sửa) và gửi cảnh báo khi phát hiện từ cấm, "
+            "ngoại trừ các lệnh /addbadword và /removebadword. "
+            "Mỗi server có danh sách riêng, dựa trên danh sách chung của bot. "
+            "Tin nhắn gửi quá nhanh, lặp lại nội dung hoặc nhắc tên hàng loạt cũng bị xóa. "
+            "Luật wildcard được chuẩn hóa như từ cấm (`dit*` khớp cả \"địt\", \"đ.i.t\"; `địt*` chỉ khớp chữ có dấu); "
+            "luật regex khớp nội dung gốc viết thường, giữ nguyên dấu (ví dụ `đ[iị]t`).",
             inline=False,
         )
         await ctx.send(embed=embed)
@@ -376,14 +1176,23 @@ class Moderation(commands.Cog):
                 "`/addbadword <từ>` - Thêm từ cấm (chỉ admin)\n"
                 "`/removebadword <từ>` - Xóa từ cấm (chỉ admin)\n"
                 "`/listbadwords` - Xem danh sách từ cấm (chỉ admin)\n"
+                "`/importbadwords <file>` - Nhập từ cấm từ file txt/csv/json (chỉ admin)\n"
+                "`/exportbadwords` - Xuất danh sách từ cấm ra file (chỉ admin)\n"
+                "`/addrule <wildcard|regex> <mẫu>` - Thêm luật wildcard/regex (chỉ admin)\n"
+                "`/removerule <id>` - Xóa luật (chỉ admin)\n"
+                "`/listrules` - Xem các luật (chỉ admin)\n"
                 "`/modhelp` - Hiển thị hướng dẫn này"
             ),
             inline=False,
         )
         embed.add_field(
             name="💡 Ghi chú",
-            value="Bot tự động kiểm tra tin nhắn và gửi cảnh báo khi phát hiện từ cấm, "
-            "ngoại trừ các lệnh /addbadword và /removebadword.",
+            value="Bot tự động kiểm tra tin nhắn (kể cả khi được sửa) và gửi cảnh báo khi phát hiện từ cấm, "
+            "ngoại trừ các lệnh /addbadword và /removebadword. "
+            "Mỗi server có danh sách riêng, dựa trên danh sách chung của bot. "
+            "Tin nhắn gửi quá nhanh, lặp lại nội dung hoặc nhắc tên hàng loạt cũng bị xóa. "
+            "Luật wildcard được chuẩn hóa như từ cấm (`dit*` khớp cả \"địt\", \"đ.i.t\"; `địt*` chỉ khớp chữ có dấu); "
+            "luật regex khớp nội dung gốc viết thường, giữ nguyên dấu (ví dụ `đ[iị]t`).",
             inline=False,
         )
         await interaction.response.send_message(embed=embed)
@@ -391,6 +1200,11 @@ class Moderation(commands.Cog):
     @add_bad_word.error
     @remove_bad_word.error
     @list_bad_words.error
+    @import_bad_words.error
+    @export_bad_words.error
+    @add_rule.error
+    @remove_rule.error
+    @list_rules.error
     async def moderation_command_error(self, ctx: commands.Context, error: Exception) -> None:
         """Xử lý lỗi cho các lệnh kiểm duyệt.
 
@@ -406,6 +1220,12 @@ class Moderation(commands.Cog):
             
     @slash_add_bad_word.error
     @slash_remove_bad_word.error
+    @slash_list_bad_words.error
+    @slash_import_bad_words.error
+    @slash_export_bad_words.error
+    @slash_add_rule.error
+    @slash_remove_rule.error
+    @slash_list_rules.error
     async def slash_moderation_command_error(self, interaction: discord.Interaction, error: Exception) -> None:
         """Xử lý lỗi cho các slash command kiểm duyệt.
 
@@ -45,6 +45,8 @@ class MusicSearch(commands.Cog):
         self.voice_clients: Dict[int, discord.VoiceClient] = {}
         self.ydl_options = self.load_ydl_config()
         self.inactivity_timers: Dict[int, asyncio.Task] = {}
+        # Được bật khi bài đang phát của mỗi guild kết thúc (cog Speaking chờ để nói xen giữa hai bài)
+        self.track_end_events: Dict[int, asyncio.Event] = {}
 
         load_dotenv()
         client_id = os.getenv("SPOTIFY_CLIENT_ID")
@@ -199,12 +201,26 @@ class MusicSearch(commands.Cog):
             self.disconnect_after_inactivity(guild_id)
         )
 
+    def on_track_end(self, guild_id: int, error: Optional[Exception]) -> None:
+        """Callback ``after`` của mỗi bài (chạy trong luồng phát): báo bài đã hết rồi phát bài tiếp theo."""
+        if error:
+            logger.error(f"❌ Lỗi khi phát nhạc: {error}")
+        event = self.track_end_events.get(guild_id)
+        if event is not None:
+            self.bot.loop.call_soon_threadsafe(event.set)
+        asyncio.run_coroutine_threadsafe(self.play_next(guild_id), self.bot.loop)
+
     async def play_next(self, guild_id: int) -> None:
         """Phát bài tiếp theo trong hàng đợi.
 
         Args:
             guild_id: ID của server Discord.
         """
+        speaking_cog = self.bot.get_cog('Speaking')
+        if speaking_cog:
+            # Bot đang nói: chờ hàng đợi nói hết (cog Speaking bật sự kiện khi xong), không thăm dò
+            await speaking_cog.wait_idle(guild_id)
+
         if guild_id not in self.queues or not self.queues[guild_id]:
             self.now_playing.pop(guild_id, None)
             # Đặt bộ đếm thời gian để ngắt kết nối sau 1 phút không hoạt động
@@ -212,18 +228,16 @@ class MusicSearch(commands.Cog):
             return
 
         song = self.queues[guild_id].popleft()
-        self.now_playing[guild_id] = song
-
         try:
-            source = discord.FFmpegPCMAudio(song["url"], **self.FFMPEG_OPTIONS)
             voice_client = self.voice_clients[guild_id]
-            speaking_cog = self.bot.get_cog('Speaking')
-            while voice_client.is_playing() or (speaking_cog and guild_id in speaking_cog.speaking_states):
-                await asyncio.sleep(0.5)
-            voice_client.play(
-                source,
-                after=lambda e: asyncio.run_coroutine_threadsafe(self.play_next(guild_id), self.bot.loop),
-            )
+            if voice_client.is_playing():
+                # Một bài khác vừa được phát (play_next bị gọi trùng): bài này phát khi bài đó kết thúc
+                self.queues[guild_id].appendleft(song)
+                return
+            self.now_playing[guild_id] = song
+            source = discord.FFmpegPCMAudio(song["url"], **self.FFMPEG_OPTIONS)
+            self.track_end_events[guild_id] = asyncio.Event()
+            voice_client.play(source, after=lambda e: self.on_track_end(guild_id, e))
             # Gửi embed vào channel gốc của lệnh, nếu có
             text_channel = song.get("origin_channel")
             if text_channel is not None:
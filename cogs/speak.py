@@ -1,16 +1,43 @@
 import logging
-from typing import Optional
+import os
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
 
 import discord
 from discord.ext import commands
 from discord import app_commands
-import gtts
 import io
 import asyncio
 
+from utils.tts_backends import TTSRouter
+from utils.tts_cache import TTSCache
+from utils.tts_pipeline import TRIM_SILENCE_OPTIONS, SegmentOpener, SentenceChainSource, split_sentences
+
 # Cấu hình logger
 logger = logging.getLogger(__name__)
 
+# Ngôn ngữ mặc định cho lệnh !say (không chọn được ngôn ngữ)
+TTS_LANGUAGE = os.getenv("TTS_LANGUAGE", "vi")
+# Số yêu cầu nói tối đa chờ trong hàng đợi của mỗi guild
+MAX_TTS_QUEUE = 10
+
+# Hàm sửa tin nhắn trạng thái (Message.edit hoặc interaction.edit_original_response)
+EditCallback = Callable[..., Awaitable[object]]
+
+
+@dataclass
+class TTSRequest:
+    """Một yêu cầu nói trong hàng đợi của guild."""
+
+    text: str
+    lang: Optional[str]
+    guild: discord.Guild
+    channel: discord.VoiceChannel
+    edit: EditCallback
+    done_message: str
+    # Được bật khi tin nhắn trạng thái đã gửi xong (trước đó chưa thể sửa)
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+
 
 class Speaking(commands.Cog):
     """Cog xử lý chức năng text-to-speech cho bot."""
@@ -23,6 +50,16 @@ class Speaking(commands.Cog):
         """
         self.bot = bot
         self.speaking_states: dict = {}
+        # Hàng đợi nói và tác vụ xử lý duy nhất của mỗi guild
+        self.tts_queues: Dict[int, asyncio.Queue] = {}
+        self.tts_workers: Dict[int, asyncio.Task] = {}
+        self._speaking_now: Set[int] = set()
+        # Sự kiện được bật khi hàng đợi nói của guild đã hết (music cog chờ trước khi phát bài tiếp)
+        self._idle_events: Dict[int, asyncio.Event] = {}
+        # Engine TTS theo ngôn ngữ (gTTS hoặc engine ngoại tuyến), cấu hình qua TTS_BACKENDS
+        self.tts_router = TTSRouter()
+        # Câu hay lặp lại được lưu sẵn dạng Opus, phát lại không cần gọi engine TTS
+        self.tts_cache = TTSCache()
 
     # Danh sách ngôn ngữ phổ biến cho autocomplete
     common_languages = {
@@ -69,39 +106,220 @@ class Speaking(commands.Cog):
                 return None
         return voice_client
 
-    @staticmethod
-    async def generate_tts_audio(text: str, lang: str = None) -> Optional[discord.File]:
-        """Tạo audio file từ văn bản sử dụng gTTS.
+    async def generate_tts_audio(self, text: str, lang: Optional[str] = None) -> Optional[Tuple[discord.File, str]]:
+        """Tạo audio file từ văn bản bằng engine TTS được định tuyến cho ngôn ngữ.
 
         Args:
             text: Văn bản cần chuyển thành giọng nói.
             lang: Mã ngôn ngữ (mặc định lấy từ cấu hình).
 
         Returns:
-            File âm thanh dưới dạng discord.File hoặc None nếu có lỗi.
+            File âm thanh dưới dạng discord.File và phần ngôn ngữ của khóa bộ đệm ứng với engine
+            đã tạo ra nó, hoặc None nếu có lỗi.
         """
+        lang = lang or TTS_LANGUAGE
         try:
-            # Sử dụng asyncio để chạy gTTS trong executor tránh blocking
-            loop = asyncio.get_event_loop()
-            # Cấu hình gTTS với các tùy chọn để tránh lỗi kết nối
-            tts = gtts.gTTS(text, lang=lang, lang_check=False)
-            await loop.run_in_executor(None, tts.save, "temp_tts.mp3")
-            
-            # Mở file âm thanh và trả về
-            with open("temp_tts.mp3", "rb") as f:
-                audio_buffer = io.BytesIO(f.read())
-                audio_buffer.seek(0)
-            
-            # Xóa file tạm thời
-            import os
-            os.remove("temp_tts.mp3")
-            
+            # Âm thanh nằm trong bộ nhớ, không ghi file tạm
+            audio, backend = await self.tts_router.synthesize(text, lang)
+
             # Trả về file âm thanh
-            return discord.File(audio_buffer, filename="speech.mp3")
+            audio_file = discord.File(io.BytesIO(audio), filename=f"speech.{backend.extension}")
+            return audio_file, self.tts_router.cache_namespace(lang, backend)
         except Exception as e:
             logger.error(f"❌ Lỗi khi tạo audio từ văn bản: {e}")
             return None
 
+    async def get_tts_source(self, text: str, lang: Optional[str] = None) -> Optional[discord.AudioSource]:
+        """Tạo nguồn âm thanh cho văn bản, ưu tiên bộ đệm Opus.
+
+        Văn bản một câu: khi trúng bộ đệm, file Opus được phát thẳng (``codec="copy"``), không
+        gọi mạng và không chuyển mã; khi trượt, engine TTS được gọi và câu được lưu đệm ở nền.
+        Văn bản nhiều câu: các câu được tổng hợp đồng thời và phát nối tiếp ngay khi câu đầu
+        xong, nên thời gian chờ không phụ thuộc độ dài văn bản.
+
+        Args:
+            text: Văn bản cần chuyển thành giọng nói.
+            lang: Mã ngôn ngữ (mặc định ``TTS_LANGUAGE``).
+
+        Returns:
+            Nguồn âm thanh để ``VoiceClient.play`` hoặc None nếu không tạo được âm thanh.
+        """
+        lang = lang or TTS_LANGUAGE
+        segments = split_sentences(text)
+        if len(segments) > 1:
+            chain = SentenceChainSource(segments, lambda segment: self._segment_source(segment, lang))
+            if not await chain.wait_first():
+                chain.cleanup()
+                return None
+            return chain
+
+        # Mỗi engine có giọng khác nhau nên khóa bộ đệm gồm cả engine
+        namespace = self.tts_router.cache_namespace(lang)
+        cached = self.tts_cache.get(text, namespace)
+        if cached:
+            logger.info(f"⚡ Phát TTS từ bộ đệm: {text[:50]}")
+            return discord.FFmpegOpusAudio(cached, codec="copy")
+
+        generated = await self.generate_tts_audio(text, lang)
+        if not generated:
+            return None
+        # Lưu theo engine thực sự tạo âm thanh (gTTS khi engine cục bộ lỗi), không theo engine được chọn
+        audio_file, namespace = generated
+        self.tts_cache.store_later(text, namespace, audio_file.fp.getvalue())
+        # Đưa âm thanh trong bộ nhớ thẳng vào stdin của FFmpeg, không ghi file tạm
+        audio_file.fp.seek(0)
+        return discord.FFmpegPCMAudio(audio_file.fp, pipe=True)
+
+    async def _segment_source(self, segment: str, lang: str) -> Optional[SegmentOpener]:
+        """Tổng hợp một câu trong văn bản dài.
+
+        Returns:
+            Hàm mở nguồn PCM của câu (đã cắt khoảng lặng đầu/cuối để nối liền); tiến trình FFmpeg
+            chỉ được khởi động khi ``SentenceChainSource`` sắp phát tới câu, hoặc None nếu lỗi.
+        """
+        namespace = self.tts_router.cache_namespace(lang)
+        cached = self.tts_cache.get(segment, namespace)
+        if cached:
+            return lambda: discord.FFmpegPCMAudio(cached, options=TRIM_SILENCE_OPTIONS)
+        generated = await self.generate_tts_audio(segment, lang)
+        if not generated:
+            return None
+        audio_file, namespace = generated
+        audio = audio_file.fp.getvalue()
+        self.tts_cache.store_later(segment, namespace, audio)
+        return lambda: discord.FFmpegPCMAudio(io.BytesIO(audio), pipe=True, options=TRIM_SILENCE_OPTIONS)
+
+    def _enqueue(self, request: TTSRequest) -> Optional[int]:
+        """Thêm yêu cầu vào hàng đợi nói của guild và bảo đảm có tác vụ xử lý.
+
+        Args:
+            request: Yêu cầu nói.
+
+        Returns:
+            Vị trí của yêu cầu (1 là được nói ngay), hoặc None nếu hàng đợi đã đầy.
+        """
+        guild_id = request.guild.id
+        queue = self.tts_queues.setdefault(guild_id, asyncio.Queue(maxsize=MAX_TTS_QUEUE))
+        if queue.full():
+            return None
+        queue.put_nowait(request)
+        # Giữ nguyên ý nghĩa với music cog: có mặt trong speaking_states nghĩa là bot đang/sắp nói
+        self.speaking_states[guild_id] = True
+
+        worker = self.tts_workers.get(guild_id)
+        if worker is None or worker.done():
+            self.tts_workers[guild_id] = asyncio.create_task(self._tts_worker(guild_id))
+        return queue.qsize() + (1 if guild_id in self._speaking_now else 0)
+
+    async def _tts_worker(self, guild_id: int) -> None:
+        """Tác vụ duy nhất của mỗi guild: lần lượt nói các yêu cầu trong hàng đợi cho tới khi hết."""
+        queue = self.tts_queues[guild_id]
+        try:
+            while True:
+                try:
+                    request = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                self._speaking_now.add(guild_id)
+                try:
+                    await self._speak(request)
+                except Exception as e:
+                    logger.error(f"❌ Lỗi khi phát âm thanh: {e}")
+                    await self._safe_edit(request, "❌ Có lỗi xảy ra khi phát âm thanh.")
+                finally:
+                    self._speaking_now.discard(guild_id)
+        finally:
+            self.tts_workers.pop(guild_id, None)
+            if queue.empty():
+                self.tts_queues.pop(guild_id, None)
+                self.speaking_states.pop(guild_id, None)
+                idle = self._idle_events.pop(guild_id, None)
+                if idle is not None:
+                    idle.set()
+
+    async def wait_idle(self, guild_id: int) -> None:
+        """Chờ tới khi bot không còn nói (và không còn yêu cầu nói nào chờ) trong guild.
+
+        Args:
+            guild_id: ID guild.
+        """
+        while guild_id in self.speaking_states:
+            await self._idle_events.setdefault(guild_id, asyncio.Event()).wait()
+
+    @staticmethod
+    async def _safe_edit(request: TTSRequest, content: str) -> None:
+        """Cập nhật tin nhắn trạng thái, bỏ qua nếu tin nhắn/tương tác đã hết hạn."""
+        try:
+            await request.edit(content=content)
+        except discord.HTTPException as e:
+            logger.warning(f"⚠️ Không thể cập nhật tin nhắn nói: {e}")
+
+    async def _wait_track_end(self, guild_id: int) -> bool:
+        """Chờ bài nhạc đang phát kết thúc; music cog bật sự kiện trong callback ``after`` của bài.
+
+        Bài tiếp theo không bắt đầu trong lúc chờ vì guild đã có mặt trong ``speaking_states``.
+
+        Returns:
+            False nếu không có bài nào của music cog đang chờ kết thúc (không có sự kiện hoặc sự
+            kiện đã cũ), tức không có gì để chờ.
+        """
+        music_cog = self.bot.get_cog('MusicSearch')
+        event = music_cog.track_end_events.get(guild_id) if music_cog else None
+        if event is None or event.is_set():
+            return False
+        await event.wait()
+        return True
+
+    async def _speak(self, request: TTSRequest) -> None:
+        """Kết nối, tạo âm thanh và phát một yêu cầu; chờ phát xong qua callback ``after``."""
+        guild = request.guild
+        await request.ready.wait()
+        await self._safe_edit(request, "🔊 Đang xử lý yêu cầu nói...")
+
+        # Kết nối vào voice channel nếu chưa kết nối
+        voice_client = self.get_voice_client(guild)
+        if not voice_client:
+            voice_client = await self.connect_to_voice(guild, request.channel)
+            if not voice_client:
+                await self._safe_edit(request, "❌ Bot đã ở trong voice channel khác.")
+                return
+
+        # Tạo audio từ văn bản
+        source = await self.get_tts_source(request.text, request.lang)
+        if not source:
+            await self._safe_edit(request, "❌ Không thể tạo âm thanh từ văn bản. Có thể do lỗi kết nối mạng hoặc ngôn ngữ không được hỗ trợ.")
+            return
+
+        # Nhạc đang phát dở bài hiện tại: nói sau khi bài kết thúc (music cog sẽ chờ bot nói xong)
+        while voice_client.is_playing():
+            if not await self._wait_track_end(guild.id):
+                # Âm thanh đang phát không báo kết thúc được: dừng nó, nếu không play() báo "Already playing audio"
+                logger.warning(f"⚠️ Dừng âm thanh không rõ nguồn để nói trong guild {guild.id}")
+                voice_client.stop()
+        if not voice_client.is_connected():
+            source.cleanup()
+            await self._safe_edit(request, "❌ Bot đã rời voice channel.")
+            return
+
+        loop = asyncio.get_running_loop()
+        finished = asyncio.Event()
+
+        def after(error: Optional[Exception]) -> None:
+            # Được gọi từ luồng phát của discord.py
+            if error:
+                logger.error(f"❌ Lỗi khi phát âm thanh: {error}")
+            loop.call_soon_threadsafe(finished.set)
+
+        voice_client.play(source, after=after)
+        await finished.wait()
+        await self._safe_edit(request, request.done_message)
+
+    async def cog_unload(self) -> None:
+        """Dừng các tác vụ nói và các tiến trình TTS khi cog bị gỡ."""
+        for worker in list(self.tts_workers.values()):
+            worker.cancel()
+        self.tts_router.close()
+
     @app_commands.command(name="say", description="Chuyển văn bản thành giọng nói")
     @app_commands.describe(
         language="Chọn ngôn ngữ trước",
@@ -124,86 +342,24 @@ class Speaking(commands.Cog):
         if not interaction.user.voice:
             await interaction.response.send_message("❌ Bạn cần ở trong voice channel để sử dụng lệnh này.", ephemeral=True)
             return
-        
-        voice_channel = interaction.user.voice.channel
-        guild_id = interaction.guild.id
-        
-        # Kiểm tra xem bot có đang phát nhạc không
-        music_cog = self.bot.get_cog('MusicSearch')
-        if music_cog:
-            # Nếu có hàng đợi nhạc, từ chối thực hiện nói
-            if guild_id in music_cog.queues and music_cog.queues[guild_id]:
-                await interaction.response.send_message("❌ Không thể nói khi đang phát nhạc có hàng đợi. Hãy dùng /stop hoặc /clear trước.", ephemeral=True)
-                return
-        
-        # Đánh dấu trạng thái nói cho guild này
-        self.speaking_states[guild_id] = True
-        
-        # Trả lời ngay lập tức để tránh timeout
-        await interaction.response.send_message(f"🔊 Đang xử lý yêu cầu nói...", ephemeral=False)
-        
-        # Kết nối vào voice channel nếu chưa kết nối
-        voice_client = self.get_voice_client(interaction.guild)
-        if not voice_client:
-            try:
-                voice_client = await self.connect_to_voice(interaction.guild, voice_channel)
-                if not voice_client:
-                    await interaction.edit_original_response(content="❌ Bot đã ở trong voice channel khác.")
-                    del self.speaking_states[guild_id]
-                    return
-            except Exception as e:
-                logger.error(f"❌ Lỗi khi kết nối voice channel: {e}")
-                await interaction.edit_original_response(content="❌ Lỗi khi kết nối voice channel.")
-                del self.speaking_states[guild_id]
-                return
-        
-        # Tạo audio từ văn bản
-        audio_file = await self.generate_tts_audio(text, language)
-        if not audio_file:
-            await interaction.edit_original_response(content="❌ Không thể tạo âm thanh từ văn bản. Có thể do lỗi kết nối mạng hoặc ngôn ngữ không được hỗ trợ.")
-            del self.speaking_states[guild_id]
+
+        request = TTSRequest(
+            text=text,
+            lang=language,
+            guild=interaction.guild,
+            channel=interaction.user.voice.channel,
+            edit=interaction.edit_original_response,
+            done_message=f"✅ Đã nói xong ({self.common_languages.get(language, language)}): {text}",
+        )
+        position = self._enqueue(request)
+        if position is None:
+            await interaction.response.send_message(f"❌ Hàng đợi nói đã đầy ({MAX_TTS_QUEUE} yêu cầu), vui lòng thử lại sau.", ephemeral=True)
             return
-        
-        # Phát âm thanh trong voice channel
+        # Trả lời ngay lập tức để tránh timeout
         try:
-            # Lưu tên file để phát
-            filename = f"temp_{interaction.id}.mp3"
-            
-            # Lưu audio vào file tạm thời
-            audio_fp = audio_file.fp
-            audio_fp.seek(0)
-            
-            with open(filename, "wb") as f:
-                f.write(audio_fp.read())
-            
-            # Phát audio
-            source = discord.FFmpegPCMAudio(filename)
-            
-            # Chờ bất kỳ âm thanh hiện đang phát hiện đang phát
-            while voice_client.is_playing():
-                await asyncio.sleep(0.5)
-                
-            voice_client.play(source)
-            
-            # Chờ đến khi phát xong
-            while voice_client.is_playing():
-                await asyncio.sleep(1)
-            
-            # Cập nhật tin nhắn để thông báo đã nói xong
-            await interaction.edit_original_response(content=f"✅ Đã nói xong ({self.common_languages.get(language, language)}): {text}")
-            
-            # Xóa file tạm thời
-            import os
-            if os.path.exists(filename):
-                os.remove(filename)
-                
-        except Exception as e:
-            logger.error(f"❌ Lỗi khi phát âm thanh: {e}")
-            await interaction.edit_original_response(content="❌ Có lỗi xảy ra khi phát âm thanh.")
+            await interaction.response.send_message(self._queued_message(position), ephemeral=False)
         finally:
-            # Xóa trạng thái nói
-            if guild_id in self.speaking_states:
-                del self.speaking_states[guild_id]
+            request.ready.set()
 
     @commands.command(name="say", aliases=["speak"])
     async def say_legacy(self, ctx: commands.Context, *, text: str) -> None:
@@ -217,87 +373,89 @@ class Speaking(commands.Cog):
         if not ctx.author.voice:
             await ctx.send("❌ Bạn cần ở trong voice channel để sử dụng lệnh này.")
             return
-        
-        voice_channel = ctx.author.voice.channel
-        guild_id = ctx.guild.id
-        
-        # Kiểm tra xem bot có đang phát nhạc không
-        music_cog = self.bot.get_cog('MusicSearch')
-        if music_cog:
-            # Nếu có hàng đợi nhạc, từ chối thực hiện nói
-            if guild_id in music_cog.queues and music_cog.queues[guild_id]:
-                await ctx.send("❌ Không thể nói khi đang phát nhạc có hàng đợi. Hãy dùng !stop hoặc !clear trước.")
-                return
-        
-        # Đánh dấu trạng thái nói cho guild này
-        self.speaking_states[guild_id] = True
-        
-        # Gửi thông báo đang xử lý
-        processing_msg = await ctx.send(f"🔊 Đang xử lý yêu cầu nói...")
-        
-        # Kết nối vào voice channel nếu chưa kết nối
-        voice_client = self.get_voice_client(ctx.guild)
-        if not voice_client:
-            try:
-                voice_client = await self.connect_to_voice(ctx.guild, voice_channel)
-                if not voice_client:
-                    await processing_msg.edit(content="❌ Bot đã ở trong voice channel khác.")
-                    del self.speaking_states[guild_id]
-                    return
-            except Exception as e:
-                logger.error(f"❌ Lỗi khi kết nối voice channel: {e}")
-                await processing_msg.edit(content="❌ Lỗi khi kết nối voice channel.")
-                del self.speaking_states[guild_id]
-                return
-        
-        # Tạo audio từ văn bản với ngôn ngữ mặc định
-        audio_file = await self.generate_tts_audio(text)
-        if not audio_file:
-            await processing_msg.edit(content="❌ Không thể tạo âm thanh từ văn bản. Có thể do lỗi kết nối mạng hoặc ngôn ngữ không được hỗ trợ.")
-            del self.speaking_states[guild_id]
+
+        queue = self.tts_queues.get(ctx.guild.id)
+        if queue is not None and queue.full():
+            await ctx.send(f"❌ Hàng đợi nói đã đầy ({MAX_TTS_QUEUE} yêu cầu), vui lòng thử lại sau.")
             return
-        
-        # Phát âm thanh trong voice channel
-        try:
-            # Lưu tên file để phát
-            filename = f"temp_{ctx.message.id}.mp3"
-            
-            # Lưu audio vào file tạm thời
-            audio_fp = audio_file.fp
-            audio_fp.seek(0)
-            
-            with open(filename, "wb") as f:
-                f.write(audio_fp.read())
-            
-            # Phát audio
-            source = discord.FFmpegPCMAudio(filename)
-            
-            # Chờ bất kỳ âm thanh hiện đang phát hiện đang phát
-            while voice_client.is_playing():
-                await asyncio.sleep(0.5)
-                
-            voice_client.play(source)
-            
-            # Chờ đến khi phát xong
-            while voice_client.is_playing():
-                await asyncio.sleep(1)
-            
-            # Cập nhật tin nhắn để thông báo đã nói xong
-            await processing_msg.edit(content=f"✅ Đã nói xong: {text}")
-            
-            # Xóa file tạm thời
-            import os
-            if os.path.exists(filename):
-                os.remove(filename)
-                
-        except Exception as e:
-            logger.error(f"❌ Lỗi khi phát âm thanh: {e}")
-            await processing_msg.edit(content="❌ Có lỗi xảy ra khi phát âm thanh.")
-        finally:
-            # Xóa trạng thái nói
-            if guild_id in self.speaking_states:
-                del self.speaking_states[guild_id]
+        # Gửi thông báo trước để yêu cầu có tin nhắn trạng thái ngay khi vào hàng đợi
+        processing_msg = await ctx.send("🔊 Đang xử lý yêu cầu nói...")
+        request = TTSRequest(
+            text=text,
+            lang=None,
+            guild=ctx.guild,
+            channel=ctx.author.voice.channel,
+            edit=processing_msg.edit,
+            done_message=f"✅ Đã nói xong: {text}",
+        )
+        request.ready.set()
+        position = self._enqueue(request)
+        if position is None:
+            await processing_msg.edit(content=f"❌ Hàng đợi nói đã đầy ({MAX_TTS_QUEUE} yêu cầu), vui lòng thử lại sau.")
+            return
+        if position > 1:
+            await processing_msg.edit(content=self._queued_message(position))
+
+    @staticmethod
+    def _queued_message(position: int) -> str:
+        """Nội dung tin nhắn khi yêu cầu vào hàng đợi."""
+        if position <= 1:
+            return "🔊 Đang xử lý yêu cầu nói..."
+        return f"⏳ Đã thêm vào hàng đợi nói, vị trí **#{position}**."
 
+    def _tts_stats_embed(self) -> discord.Embed:
+        """Tạo embed số liệu bộ đệm TTS."""
+        stats = self.tts_cache.stats()
+        embed = discord.Embed(title="📊 Bộ đệm giọng nói", color=0x00FF88)
+        embed.add_field(
+            name="Tỷ lệ trúng",
+            value=f"{stats['hit_rate']:.0%} ({stats['hits']}/{stats['hits'] + stats['misses']})",
+            inline=True,
+        )
+        embed.add_field(
+            name="Âm thanh phát từ bộ đệm",
+            value=f"{stats['bytes_saved'] / 1024:.0f} KB",
+            inline=True,
+        )
+        embed.add_field(
+            name="Dung lượng",
+            value=f"{stats['size'] / (1024 * 1024):.1f}/{stats['max_bytes'] / (1024 * 1024):.0f} MB",
+            inline=True,
+        )
+        embed.add_field(name="Đã lưu / đã dọn", value=f"{stats['stored']} / {stats['evicted']} câu", inline=True)
+        return embed
+
+    @commands.command(name="ttsstats")
+    @commands.has_permissions(administrator=True)
+    async def tts_stats(self, ctx: commands.Context) -> None:
+        """Hiển thị số liệu bộ đệm giọng nói (chỉ admin).
+
+        Args:
+            ctx: Ngữ cảnh lệnh.
+        """
+        await ctx.send(embed=self._tts_stats_embed())
+
+    @app_commands.command(name="ttsstats", description="Xem số liệu bộ đệm giọng nói")
+    @app_commands.default_permissions(administrator=True)
+    async def slash_tts_stats(self, interaction: discord.Interaction) -> None:
+        """Slash command hiển thị số liệu bộ đệm giọng nói (chỉ admin).
+
+        Args:
+            interaction: Interaction từ người dùng.
+        """
+        await interaction.response.send_message(embed=self._tts_stats_embed(), ephemeral=True)
+
+    @tts_stats.error
+    async def tts_stats_error(self, ctx: commands.Context, error: Exception) -> None:
+        """Xử lý lỗi cho lệnh ttsstats.
+
+        Args:
+            ctx: Ngữ cảnh lệnh.
+            error: Lỗi được ném ra.
+        """
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("❌ Bạn cần quyền Administrator để sử dụng lệnh này.")
+            logger.warning(f"⚠️ {ctx.author} cố gắng dùng lệnh admin mà không có quyền")
 
 async def setup(bot: commands.Bot) -> None:
     """Thiết lập cog Speaking."""
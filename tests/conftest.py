@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Cho phép import các gói của bot (cogs, utils) khi chạy pytest từ bất kỳ thư mục nào
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,55 @@
+import asyncio
+
+from utils.ai_health import AIHealthProbe
+from utils.model_router import ModelRouter
+
+
+class FakeClient:
+    def __init__(self, model_name, error=None):
+        self.model_name = model_name
+        self.error = error
+        self.prompts = []
+
+    async def generate(self, prompt, generation_config=None, timeout=None):
+        self.prompts.append(prompt)
+        if self.error:
+            raise self.error
+        return "ok"
+
+
+def test_probe_calls_every_model_directly():
+    clients = [FakeClient("small"), FakeClient("medium"), FakeClient("large")]
+    router = ModelRouter(clients)
+    probe = AIHealthProbe(router.clients, on_result=router.record_probe)
+
+    asyncio.run(probe.probe())
+
+    assert all(client.prompts == ["Hi"] for client in clients)
+    assert probe.snapshot()["samples"] == 3
+    # Thăm dò không được tính vào thống kê định tuyến
+    assert all(stats["requests"] == 0 and stats["p95"] is None for stats in router.snapshot())
+
+
+def test_probe_puts_failing_model_on_cooldown_and_clears_it_on_recovery():
+    large = FakeClient("large", RuntimeError("429 quota exceeded"))
+    router = ModelRouter([FakeClient("small"), large])
+    probe = AIHealthProbe(router.clients, on_result=router.record_probe)
+
+    asyncio.run(probe.probe())
+    assert router.candidates(1) == [0]
+    assert not probe.quota_exhausted
+
+    large.error = None
+    asyncio.run(probe.probe())
+    assert router.candidates(1) == [1, 0]
+
+
+def test_quota_exhausted_only_when_every_model_is_out_of_quota():
+    clients = [FakeClient("small", RuntimeError("quota")), FakeClient("large", RuntimeError("429"))]
+    probe = AIHealthProbe(clients)
+    asyncio.run(probe.probe())
+    assert probe.quota_exhausted
+
+    clients[0].error = RuntimeError("timeout")
+    asyncio.run(probe.probe())
+    assert not probe.quota_exhausted
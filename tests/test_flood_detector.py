@@ -0,0 +1,61 @@
+import pytest
+
+from utils.flood_detector import FloodDetector, FloodLimits, SlidingCountMinSketch
+
+
+@pytest.fixture
+def detector():
+    return FloodDetector(width=1024)
+
+
+def test_sketch_forgets_counts_outside_window():
+    sketch = SlidingCountMinSketch(window=10.0, buckets=5, width=1024)
+    for _ in range(3):
+        sketch.add("a", now=0.0)
+    assert sketch.estimate("a", now=9.0) == 3
+    assert sketch.estimate("a", now=12.5) == 0
+
+
+def test_user_rate_limit(detector):
+    limit = FloodLimits().user_messages
+    reasons = [detector.check(1, 10, 100, f"tin {i}", now=i * 0.1) for i in range(limit + 1)]
+    assert not any(reasons[:limit])
+    assert "gửi tin nhắn quá nhanh" in reasons[limit]
+
+
+@pytest.mark.parametrize("content", ["gg", "ok", "F", "+1", "😂", "GG  ", "hahahahahaha"])
+def test_short_channel_duplicates_are_not_flagged(detector, content):
+    for user_id in range(20):
+        assert detector.check(1, 10, user_id, content, now=user_id * 0.1) == []
+
+
+def test_long_channel_duplicates_are_flagged(detector):
+    content = "join discord.gg/free-nitro now"
+    limit = FloodLimits().channel_duplicates
+    reasons = [detector.check(1, 10, user_id, content, now=user_id * 0.1) for user_id in range(limit + 1)]
+    assert not any(reasons[:limit])
+    assert reasons[limit] == ["nội dung bị nhiều tài khoản gửi lặp lại"]
+
+
+def busy_channel(detector, now=0.0):
+    """Đẩy kênh 10 lên trên ngưỡng raid bằng tin nhắn của các thành viên cũ."""
+    for user_id in range(FloodLimits().channel_raid + 1):
+        detector.check(1, 10, 1000 + user_id, f"tin nhắn thứ {user_id}", now=now)
+
+
+def test_new_member_in_busy_channel_alone_is_not_flagged(detector):
+    busy_channel(detector)
+    assert detector.check(1, 10, 5, "chào mọi người", member_age=60.0, now=1.0) == []
+
+
+def test_new_member_in_busy_channel_with_other_signal_is_flagged(detector):
+    busy_channel(detector)
+    assert detector.check(1, 10, 5, "chào mọi người", member_age=60.0, now=1.0) == []
+    reasons = detector.check(1, 10, 5, "vào server mình đi", member_age=60.0, now=1.5)
+    assert reasons == ["thành viên mới nhắn khi kênh đang bị spam"]
+
+
+def test_old_member_in_busy_channel_is_not_flagged(detector):
+    busy_channel(detector)
+    assert detector.check(1, 10, 5, "chào mọi người", now=1.0) == []
+    assert detector.check(1, 10, 5, "hôm nay vui quá", now=1.5) == []
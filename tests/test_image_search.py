@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+from utils.image_search import ImageResultCache, ImageSearchClient
+from utils.rate_limiter import AdaptiveRateLimiter
+
+
+def test_cancelled_half_open_trial_releases_slot():
+    """Hủy yêu cầu thử ở trạng thái half-open phải trả lại lượt thử cho yêu cầu sau."""
+    release = threading.Event()
+
+    async def scenario():
+        limiter = AdaptiveRateLimiter("test", failure_threshold=1, cooldown=0.01)
+        limiter.record_rate_limited()
+        await asyncio.sleep(0.02)
+        assert limiter.state == "half_open"
+
+        client = ImageSearchClient(workers=1, limiter=limiter)
+        started = threading.Event()
+
+        def blocking_search(query, max_results):
+            started.set()
+            release.wait(5)
+            return []
+
+        client._search_sync = blocking_search
+        task = asyncio.create_task(client.search("mèo"))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        assert limiter._trial_in_flight
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert not limiter._trial_in_flight
+        # Yêu cầu kế tiếp được làm yêu cầu thử thay vì bị từ chối
+        await limiter.acquire()
+        client.close()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+
+
+def test_cancelled_fetch_does_not_hang_concurrent_callers():
+    """Hủy lời gọi đang tìm không được làm các lời gọi cùng truy vấn đang chờ treo mãi."""
+
+    class SlowClient:
+        async def search(self, query, max_results=None):
+            await asyncio.sleep(10)
+            return []
+
+    async def scenario():
+        cache = ImageResultCache(SlowClient())
+        owner = asyncio.create_task(cache._fetch("mèo", "mèo"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache._fetch("mèo", "mèo"))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        done, _ = await asyncio.wait([waiter], timeout=1)
+        assert waiter in done
+        assert waiter.cancelled() or isinstance(waiter.exception(), asyncio.CancelledError)
+        assert not cache._inflight
+
+    asyncio.run(scenario())
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from utils.model_router import ModelRouter
+
+
+class FakeClient:
+    def __init__(self, model_name, error=None):
+        self.model_name = model_name
+        self.error = error
+        self.calls = 0
+
+    async def generate(self, prompt, generation_config=None, timeout=None):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.model_name
+
+
+def make_router(count=3):
+    return ModelRouter([FakeClient(f"model-{i}") for i in range(count)])
+
+
+def test_complexity_maps_to_available_tiers():
+    router = make_router(3)
+    assert router.complexity("xin chào") == 0
+    assert router.complexity("giải thích " + "x" * 130) == 1
+    assert router.complexity("viết code?\n?\n\n" + "x" * 700) == 2
+    assert make_router(1).complexity("giải thích " + "x" * 700) == 0
+
+
+def test_short_messages_go_to_smallest_model_and_complex_ones_to_largest():
+    router = make_router(3)
+    assert asyncio.run(router.generate("prompt", message="hi")) == "model-0"
+    assert asyncio.run(router.generate("prompt", message="viết code?\n?\n\n" + "x" * 700)) == "model-2"
+    assert [d.model for d in router.decisions] == ["model-0", "model-2"]
+
+
+def test_candidates_prefer_capable_models_then_fall_back_downwards():
+    router = make_router(3)
+    assert router.candidates(1) == [1, 2, 0]
+    # Model phù hợp đang chậm: model lớn hơn nhưng nhanh hơn được ưu tiên
+    for _ in range(10):
+        router.stats["model-1"].window.add(10.0, True)
+    assert router.candidates(1) == [2, 1, 0]
+
+
+def test_quota_error_fails_over_and_puts_model_on_cooldown():
+    router = make_router(2)
+    router.clients[0].error = RuntimeError("429 resource_exhausted")
+
+    assert asyncio.run(router.generate("prompt", message="hi")) == "model-1"
+    assert router.candidates(0) == [1]
+    assert asyncio.run(router.generate("prompt", message="hi")) == "model-1"
+    assert router.clients[0].calls == 1
+
+
+def test_other_errors_are_raised_without_failover():
+    router = make_router(2)
+    router.clients[0].error = ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(router.generate("prompt", message="hi"))
+    assert router.clients[1].calls == 0
+    # Không bị tạm ngưng, chỉ bị xếp sau do tỷ lệ lỗi cao
+    assert router.stats["model-0"].available
+    assert router.candidates(0) == [1, 0]
+
+
+def test_all_models_on_cooldown_raises_quota_error():
+    router = make_router(2)
+    for client in router.clients:
+        client.error = RuntimeError("404 model not found")
+
+    with pytest.raises(RuntimeError, match="404"):
+        asyncio.run(router.generate("prompt", message="hi"))
+    with pytest.raises(RuntimeError, match="quota"):
+        asyncio.run(router.generate("prompt", message="hi"))
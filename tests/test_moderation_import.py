@@ -0,0 +1,47 @@
+import asyncio
+import json
+
+import pytest
+
+from cogs.moderation import Moderation, iter_json_array
+
+
+async def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def read_json(data: bytes, size: int):
+    async def scenario():
+        return [item async for item in iter_json_array(chunked(data, size))]
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1 << 16])
+def test_json_array_is_streamed_across_chunks(size):
+    words = ["địt", "vcl", 'có "ngoặc"', "a\\b", "", "🤬", 12345, 1.5]
+    data = "﻿".encode() + json.dumps(words, ensure_ascii=False, indent=1).encode()
+    assert read_json(data, size) == [str(word) for word in words]
+
+
+@pytest.mark.parametrize("data", [b'{"a": 1}', b'["a" "b"]', b'["a", ', b'["a", bad]', b"", b"[1, 2"])
+def test_invalid_json_array_is_rejected(data):
+    with pytest.raises(ValueError):
+        read_json(data, 2)
+
+
+def test_reading_stops_at_end_of_array():
+    async def chunks():
+        yield b'["a", "b"]'
+        raise AssertionError("không được đọc tiếp sau khi hết mảng")
+
+    async def scenario():
+        return [item async for item in iter_json_array(chunks())]
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+
+
+def test_list_preview_never_shows_negative_count():
+    assert "từ khác" not in Moderation._list_preview(["x" * 100] * 20)
+    assert Moderation._list_preview([str(i) for i in range(60)]).endswith("... và 10 từ khác trong file đính kèm.")
@@ -0,0 +1,71 @@
+import asyncio
+import sqlite3
+
+from utils.moderation_store import ModerationStore
+
+
+def close(store):
+    """Đóng store như khi bot dừng đột ngột: không ghi nốt thay đổi đang chờ."""
+    if store._flush_handle:
+        store._flush_handle.cancel()
+    store._journal.close()
+    store._reader.close()
+    store._writer.close()
+
+
+def failing_once(store):
+    """Làm lần ghi SQLite kế tiếp của store bị lỗi."""
+    apply = store._apply
+
+    def fail(changes, segment=None):
+        store._apply = apply
+        raise sqlite3.OperationalError("database is locked")
+
+    store._apply = fail
+
+
+def test_journal_is_replayed_after_crash(tmp_path):
+    async def scenario():
+        store = ModerationStore(tmp_path / "mod.db", debounce=60)
+        store.set_words(1, ["vcl", "dit"], True)
+        close(store)
+
+    asyncio.run(scenario())
+    store = ModerationStore(tmp_path / "mod.db")
+    assert store.load_guild(1) == ({"vcl", "dit"}, set())
+    close(store)
+
+
+def test_failed_flush_does_not_resurrect_removed_word(tmp_path):
+    async def scenario():
+        store = ModerationStore(tmp_path / "mod.db", debounce=60)
+        store.set_word(1, "vcl", True)
+        failing_once(store)
+        await store.flush()
+        assert store.load_guild(1) == ({"vcl"}, set())
+
+        store.set_word(1, "vcl", False)
+        await store.flush()
+        assert store.load_guild(1) == (set(), set())
+        close(store)
+
+    asyncio.run(scenario())
+    store = ModerationStore(tmp_path / "mod.db")
+    assert store.load_guild(1) == (set(), set())
+    close(store)
+
+
+def test_failed_flush_is_replayed_after_crash(tmp_path):
+    async def scenario():
+        store = ModerationStore(tmp_path / "mod.db", debounce=60)
+        store.set_words(1, ["vcl", "dit"], True)
+        failing_once(store)
+        await store.flush()
+        store.set_word(1, "dit", False)
+        close(store)
+
+    asyncio.run(scenario())
+    store = ModerationStore(tmp_path / "mod.db")
+    assert store.load_guild(1) == ({"vcl"}, set())
+    assert not list(tmp_path.glob("mod.journal.*"))
+    close(store)
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from utils.pattern_rules import PatternRule, RuleEvaluator, compile_rule, evaluate_rules
+from utils.text_normalizer import TextNormalizer
+
+
+@pytest.fixture
+def normalizer():
+    return TextNormalizer()
+
+
+def test_wildcard_without_diacritics_matches_every_spelling(normalizer):
+    source = compile_rule("wildcard", "dit*", normalizer.normalize_entry)
+    for message in ("địt mẹ", "dit me", "Đ.I.T mẹ", "đitttt"):
+        matched, _ = evaluate_rules([(1, source, False)], normalizer.scan_form(message), message.lower())
+        assert matched == [1], message
+
+
+def test_wildcard_with_diacritics_keeps_tone_marks(normalizer):
+    source = compile_rule("wildcard", "địt*", normalizer.normalize_entry)
+    for message, expected in (("ĐỊT mẹ", [1]), ("địttt", [1]), ("dit me", []), ("đít", [])):
+        matched, _ = evaluate_rules([(1, source, False)], normalizer.scan_form(message), message.lower())
+        assert matched == expected, message
+
+
+def test_wildcard_does_not_match_inside_words(normalizer):
+    source = compile_rule("wildcard", "dit*", normalizer.normalize_entry)
+    matched, _ = evaluate_rules([(1, source, False)], normalizer.scan_form("con địa chỉ"), "con địa chỉ")
+    assert matched == []
+
+
+def test_regex_with_diacritics_matches_raw_content(normalizer):
+    source = compile_rule("regex", "đ[iị]t", normalizer.normalize_entry)
+    message = "ĐỊT mẹ"
+    matched, _ = evaluate_rules([(1, source, True)], normalizer.scan_form(message), message.lower())
+    assert matched == [1]
+
+
+def test_evaluator_routes_rules_to_their_text(normalizer):
+    normalize = normalizer.normalize_entry
+    rules = [
+        PatternRule(1, "wildcard", "địt*", compile_rule("wildcard", "địt*", normalize)),
+        PatternRule(2, "regex", "đ[iị]t", compile_rule("regex", "đ[iị]t", normalize)),
+        PatternRule(3, "regex", "^dit", compile_rule("regex", "^dit", normalize)),
+    ]
+    message = "Địt mẹ"
+
+    async def scenario():
+        evaluator = RuleEvaluator(budget=5.0)
+        try:
+            return await evaluator.evaluate(rules, normalizer.scan_form(message), message.lower())
+        finally:
+            evaluator.close()
+
+    result = asyncio.run(scenario())
+    assert sorted(rule.id for rule in result.matched) == [1, 2]
+
+
+def test_wildcard_rejects_pattern_without_letters(normalizer):
+    with pytest.raises(ValueError):
+        compile_rule("wildcard", "*\u200b*", normalizer.normalize_entry)
+
+
+def test_timeout_stops_stuck_worker_and_recovers(normalizer):
+    import multiprocessing
+
+    normalize = normalizer.normalize_entry
+    slow = PatternRule(1, "regex", "(a+)+$", "(a+)+$")
+    fast = PatternRule(2, "wildcard", "dit*", compile_rule("wildcard", "dit*", normalize))
+    message = "a" * 40 + "!"
+
+    async def scenario():
+        evaluator = RuleEvaluator(budget=0.5)
+        try:
+            result = await evaluator.evaluate([slow, fast], normalizer.scan_form(message), message)
+            again = await evaluator.evaluate([fast], normalizer.scan_form("dit"), "dit")
+            return result, again
+        finally:
+            evaluator.close()
+
+    result, again = asyncio.run(scenario())
+    assert [rule.id for rule, _ in result.slow] == [1]
+    assert [rule.id for rule in again.matched] == [2]
+    for process in multiprocessing.active_children():
+        process.join(timeout=5)
+    assert not multiprocessing.active_children()
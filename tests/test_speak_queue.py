@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from cogs.speak import MAX_TTS_QUEUE, Speaking, TTSRequest
+
+
+@pytest.fixture
+def speaking(tmp_path, monkeypatch):
+    # Bộ đệm TTS tạo thư mục trong thư mục hiện tại
+    monkeypatch.chdir(tmp_path)
+    cog = Speaking(SimpleNamespace(get_cog=lambda name: None))
+    yield cog
+    cog.tts_router.close()
+
+
+def make_request(text="xin chào"):
+    async def edit(**kwargs):
+        pass
+
+    return TTSRequest(text, "vi", SimpleNamespace(id=1), None, edit, "xong")
+
+
+def test_queue_positions_backpressure_and_idle_event(speaking):
+    spoken = []
+
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def fake_speak(request):
+            spoken.append(request.text)
+            await gate.wait()
+
+        speaking._speak = fake_speak
+        assert speaking._enqueue(make_request("1")) == 1
+        assert speaking._enqueue(make_request("2")) == 2
+        await asyncio.sleep(0)
+        # Yêu cầu đầu đang được nói, yêu cầu mới đứng sau yêu cầu thứ hai
+        assert spoken == ["1"]
+        assert speaking._enqueue(make_request("3")) == 3
+
+        for i in range(MAX_TTS_QUEUE - 2):
+            assert speaking._enqueue(make_request(f"x{i}")) is not None
+        assert speaking._enqueue(make_request("đầy")) is None
+
+        idle = asyncio.create_task(speaking.wait_idle(1))
+        await asyncio.sleep(0)
+        assert not idle.done()
+
+        gate.set()
+        await asyncio.wait_for(idle, 1)
+        assert spoken[:3] == ["1", "2", "3"] and len(spoken) == MAX_TTS_QUEUE + 1
+        assert 1 not in speaking.speaking_states and 1 not in speaking.tts_queues
+
+    asyncio.run(scenario())
+
+
+def test_wait_idle_returns_at_once_when_not_speaking(speaking):
+    asyncio.run(asyncio.wait_for(speaking.wait_idle(1), 1))
+
+
+def test_speak_stops_playback_without_track_end_event(speaking):
+    class FakeVoiceClient:
+        def __init__(self):
+            self.playing = True
+            self.stopped = False
+
+        def is_playing(self):
+            return self.playing
+
+        def is_connected(self):
+            return True
+
+        def stop(self):
+            self.playing = False
+            self.stopped = True
+
+        def play(self, source, after):
+            assert not self.playing, "Already playing audio"
+            after(None)
+
+    voice_client = FakeVoiceClient()
+    # Music cog có sự kiện nhưng đã cũ (bài trước đã kết thúc)
+    stale = asyncio.Event()
+    stale.set()
+    music = SimpleNamespace(track_end_events={1: stale}, voice_clients={1: voice_client})
+    speaking.bot = SimpleNamespace(get_cog=lambda name: music if name == "MusicSearch" else None)
+
+    async def fake_source(text, lang):
+        return object()
+
+    speaking.get_tts_source = fake_source
+    request = make_request()
+    request.ready.set()
+    asyncio.run(asyncio.wait_for(speaking._speak(request), 1))
+    assert voice_client.stopped
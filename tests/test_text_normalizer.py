@@ -0,0 +1,73 @@
+import pytest
+
+from utils.text_normalizer import TextNormalizer
+from utils.word_filter import GuildWordFilter, WordFilter
+
+
+@pytest.fixture
+def normalize():
+    return TextNormalizer().normalize
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("ừ ở à", "u o a"),
+        ("ừ ở à ạ", "u o a a"),
+        ("a e r", "a e r"),
+        ("đáp án a, b, c", "dap an a, b, c"),
+        ("Xin chào, hôm nay bạn thế nào?", "xin chao, hom nay ban the nao?"),
+    ],
+)
+def test_vietnamese_single_letter_words_are_not_joined(normalize, text, expected):
+    assert normalize(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("hôm nay là 3rd", "hom nay la 3rd"),
+        ("1st place", "1st place"),
+        ("8h sáng mai", "8h sang mai"),
+        ("chờ 5p nữa", "cho 5p nua"),
+        ("năm 2024!", "nam 2024!"),
+    ],
+)
+def test_number_tokens_are_not_leet_decoded(normalize, text, expected):
+    assert normalize(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["shit", "sh1t", "$hit", "shi7", "5hit", "s h i t", "S H I T", "s.h.i.t", "s-h-1-t", "$ h i t", "s . h . i . t", "sh\u200bit"],
+)
+def test_obfuscated_words_are_normalized(normalize, text):
+    assert normalize(text) == "shit"
+
+
+def test_diacritics_are_folded(normalize):
+    assert normalize("địt mẹ") == "dit me"
+
+
+@pytest.mark.parametrize("text", ["con lợn này lớn quá", "lon bia", "cắc tiền", "LỢN", "cac ban oi"])
+def test_accented_bad_words_do_not_match_other_tones(text):
+    assert WordFilter(["lồn", "cặc"]).scan(text) == []
+
+
+@pytest.mark.parametrize("text", ["lồn", "LỒN", "đồ l\u200bồn", "cặc à"])
+def test_accented_bad_words_match_same_tones(text):
+    assert WordFilter(["lồn", "cặc"]).scan(text) != []
+
+
+@pytest.mark.parametrize("text", ["địt", "dit", "Đ.I.T", "d1t", "đít"])
+def test_unaccented_bad_words_match_every_spelling(text):
+    assert WordFilter(["dit"]).scan(text) == ["dit"]
+
+
+def test_edit_rescans_both_forms():
+    guild_filter = GuildWordFilter(WordFilter(["lồn", "vcl"]))
+    normalizer = guild_filter.normalizer
+    previous = normalizer.scan_form("con lợn này")
+    assert guild_filter.scan_changed(previous, normalizer.scan_form("con lồn này")) == ["lồn"]
+    assert guild_filter.scan_changed(previous, normalizer.scan_form("con lon này")) == []
+    assert guild_filter.scan_changed(previous, normalizer.scan_form("con lợn này vcl")) == ["vcl"]
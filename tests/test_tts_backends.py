@@ -0,0 +1,73 @@
+import asyncio
+import subprocess
+
+import pytest
+
+from utils import tts_backends
+from utils.tts_backends import TTSBackend, TTSRouter, synthesize_local
+
+
+class FakeBackend(TTSBackend):
+    def __init__(self, name, result=b"", error=None, available=True):
+        self.name = name
+        self.result = result
+        self.error = error
+        self.usable = available
+        self.calls = []
+
+    def available(self, lang):
+        return self.usable
+
+    async def synthesize(self, text, lang):
+        self.calls.append((text, lang))
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.parametrize("text", ["-f.env", "-w/tmp/x.wav", "--help"])
+def test_espeak_text_is_never_read_as_option(monkeypatch, text):
+    calls = []
+
+    def fake_run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout=b"RIFF")
+
+    monkeypatch.setattr(tts_backends, "ESPEAK_EXECUTABLE", "espeak-ng")
+    monkeypatch.setattr(tts_backends.subprocess, "run", fake_run)
+    assert synthesize_local(text, "vi") == b"RIFF"
+    args = calls[0]
+    assert args[-2:] == ["--", text]
+
+
+def test_router_falls_back_to_gtts_when_local_fails():
+    gtts = FakeBackend("gtts", b"mp3")
+    local = FakeBackend("local", error=RuntimeError("worker chết"))
+    router = TTSRouter({"vi": "local"}, {"gtts": gtts, "local": local})
+
+    audio, backend = asyncio.run(router.synthesize("xin chào", "vi"))
+    assert (audio, backend) == (b"mp3", gtts)
+    assert router.failures == {"gtts": 0, "local": 1}
+    assert router.requests == {"gtts": 1, "local": 1}
+    # Âm thanh do gTTS tạo được lưu đệm chung với gTTS, không lẫn với giọng cục bộ
+    assert router.cache_namespace("vi", backend) == "vi"
+    assert router.cache_namespace("vi") == "local:vi"
+
+
+def test_router_skips_unavailable_backend():
+    gtts = FakeBackend("gtts", b"mp3")
+    local = FakeBackend("local", b"wav", available=False)
+    router = TTSRouter({"*": "local"}, {"gtts": gtts, "local": local})
+
+    assert router.backend_for("en") is gtts
+    assert asyncio.run(router.synthesize("hello", "en")) == (b"mp3", gtts)
+    assert local.calls == []
+
+
+def test_router_does_not_retry_gtts_failure():
+    gtts = FakeBackend("gtts", error=RuntimeError("không có mạng"))
+    router = TTSRouter({"*": "gtts"}, {"gtts": gtts})
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(router.synthesize("hello", "en"))
+    assert len(gtts.calls) == 1
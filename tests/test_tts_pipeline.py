@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from utils import tts_pipeline
+from utils.tts_pipeline import SENTENCE_PAUSE_FRAMES, SILENCE_FRAME, SentenceChainSource, split_sentences
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Xin chào. Bạn khỏe không? Tôi khỏe!", ["Xin chào.", "Bạn khỏe không?", "Tôi khỏe!"]),
+        ("dòng một\n\ndòng hai", ["dòng một", "dòng hai"]),
+        ("  nhiều   khoảng   trắng  ", ["nhiều khoảng trắng"]),
+        ("v1.5 là bản mới", ["v1.5 là bản mới"]),
+        ("", []),
+    ],
+)
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_long_sentence_is_split_at_clauses_then_words():
+    text = "một hai ba, bốn năm sáu, " + "bảy " * 10
+    segments = split_sentences(text, max_chars=20)
+    assert all(len(segment) <= 20 for segment in segments)
+    assert " ".join(segments).split() == text.split()
+    assert segments[0] == "một hai ba,"
+
+
+class FakeSource:
+    open_count = 0
+
+    def __init__(self, name, frames=2):
+        FakeSource.open_count += 1
+        self.frames = [f"{name}{i}".encode() for i in range(frames)]
+        self.closed = False
+
+    def read(self):
+        return self.frames.pop(0) if self.frames else b""
+
+    def cleanup(self):
+        if not self.closed:
+            self.closed = True
+            FakeSource.open_count -= 1
+
+
+def play(chain):
+    frames = []
+    while True:
+        frame = chain.read()
+        if not frame:
+            return frames
+        frames.append(frame)
+
+
+def test_chain_plays_in_order_and_opens_sources_lazily():
+    segments = ["a", "b", "lỗi", "c", "d"]
+    # Câu sau tổng hợp xong trước câu đầu; câu "lỗi" không tổng hợp được
+    delays = {"a": 0.05, "b": 0.0, "lỗi": 0.0, "c": 0.02, "d": 0.01}
+    max_open = 0
+
+    async def synthesize(segment):
+        await asyncio.sleep(delays[segment])
+        if segment == "lỗi":
+            raise RuntimeError("engine lỗi")
+        return lambda: FakeSource(segment)
+
+    async def scenario():
+        nonlocal max_open
+        chain = SentenceChainSource(segments, synthesize, concurrency=5)
+        assert await chain.wait_first()
+        await asyncio.gather(*chain._tasks)
+        # Đã tổng hợp xong cả văn bản nhưng chưa mở tiến trình nào
+        assert FakeSource.open_count == 0
+        frames = []
+        while True:
+            frame = chain.read()
+            max_open = max(max_open, FakeSource.open_count)
+            if not frame:
+                break
+            frames.append(frame)
+        chain.cleanup()
+        return frames
+
+    frames = asyncio.run(scenario())
+    spoken = [frame for frame in frames if frame != SILENCE_FRAME]
+    assert spoken == [b"a0", b"a1", b"b0", b"b1", b"c0", b"c1", b"d0", b"d1"]
+    assert frames.count(SILENCE_FRAME) == 3 * SENTENCE_PAUSE_FRAMES
+    assert max_open <= 1 + tts_pipeline.OPEN_AHEAD
+    assert FakeSource.open_count == 0
+
+
+def test_chain_plays_silence_while_next_sentence_is_pending():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def synthesize(segment):
+            if segment == "b":
+                await release.wait()
+            return lambda: FakeSource(segment, frames=1)
+
+        chain = SentenceChainSource(["a", "b"], synthesize)
+        await chain.wait_first()
+        assert chain.read() == b"a0"
+        assert chain.read() == SILENCE_FRAME
+        release.set()
+        await asyncio.gather(*chain._tasks)
+        rest = play(chain)
+        chain.cleanup()
+        return rest
+
+    rest = asyncio.run(scenario())
+    assert [frame for frame in rest if frame != SILENCE_FRAME] == [b"b0"]
@@ -0,0 +1,56 @@
+from utils.word_filter import GuildWordFilter, WordFilter
+
+
+def test_entries_with_diacritics_only_match_accented_text():
+    word_filter = WordFilter(["lồn", "dit"])
+    assert word_filter.scan("thằng lồn") == ["lồn"]
+    assert word_filter.scan("con lợn, cái lon, to lớn") == []
+    assert word_filter.scan("Đ.I.T mẹ") == ["dit"]
+
+
+def test_same_canonical_form_is_kept_until_last_original_removed():
+    word_filter = WordFilter(["Fuck", "fuck"])
+    assert word_filter.remove("Fuck")
+    assert word_filter.scan("fuck") == ["fuck"]
+    assert word_filter.remove("fuck")
+    assert word_filter.scan("fuck") == []
+    assert len(word_filter) == 0
+
+
+def test_guild_overlay_adds_and_excludes_without_touching_base():
+    base = WordFilter(["vcl", "dit"])
+    guild = GuildWordFilter(base, words=["bede"], excluded=["vcl"])
+    other = GuildWordFilter(base)
+
+    assert guild.scan("vcl bede dit") == ["bede", "dit"]
+    assert other.scan("vcl bede dit") == ["vcl", "dit"]
+    assert "bede" in guild and "vcl" not in guild and "vcl" in other
+    assert base.words == ["dit", "vcl"]
+
+
+def test_guild_overlay_sees_later_base_changes():
+    base = WordFilter(["vcl"])
+    guild = GuildWordFilter(base, excluded=["vcl"])
+    base.add("cc")
+    base.remove("vcl")
+    base.add("vcl")
+
+    assert guild.scan("vcl cc") == ["cc"]
+    assert guild.max_length == 3
+
+
+def test_guild_overlay_reports_each_word_once():
+    base = WordFilter(["dit"])
+    guild = GuildWordFilter(base, words=["dit"])
+    assert guild.scan("dit dit") == ["dit"]
+
+
+def test_scan_changed_only_reports_words_in_edited_region():
+    base = WordFilter(["vcl"])
+    guild = GuildWordFilter(base, words=["dit me"])
+    normalize = guild.normalizer.scan_form
+    before = normalize("chao ban, hom nay dit")
+    after = normalize("chao ban, hom nay dit me vcl")
+
+    assert sorted(guild.scan_changed(before, after)) == ["dit me", "vcl"]
+    assert guild.scan_changed(after, after) == []
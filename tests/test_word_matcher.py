@@ -0,0 +1,54 @@
+import random
+import re
+
+from utils.word_matcher import WordMatcher
+
+
+def test_matches_whole_words_only():
+    matcher = WordMatcher(["ass", "hell"])
+    assert matcher.search("class assignment, hello") == []
+    assert matcher.search("what the hell, ass") == ["hell", "ass"]
+
+
+def test_overlapping_words_are_all_found():
+    matcher = WordMatcher(["vai", "vai lon", "lon"])
+    assert matcher.search("vai lon that") == ["vai", "vai lon", "lon"]
+
+
+def test_scan_region_checks_boundaries_on_full_text():
+    matcher = WordMatcher(["shit"])
+    text = "bullshit shit"
+    assert matcher.search(text, 4, 8) == []
+    assert matcher.search(text, 9) == ["shit"]
+
+
+def test_add_and_remove_update_matches_and_lengths():
+    matcher = WordMatcher()
+    assert matcher.add("fuck") and not matcher.add("fuck")
+    assert matcher.add_many(["vcl", "dit me"]) == 2
+    assert matcher.max_length == 6
+    assert matcher.search("vcl dit me fuck") == ["vcl", "dit me", "fuck"]
+
+    assert matcher.remove("dit me") and not matcher.remove("dit me")
+    assert matcher.max_length == 4
+    assert matcher.search("vcl dit me fuck") == ["vcl", "fuck"]
+    assert matcher.remove_many(["vcl", "fuck", "khong co"]) == 2
+    assert matcher.max_length == 0
+    assert len(matcher) == 0 and matcher.search("vcl fuck") == []
+
+
+def test_bulk_remove_compacts_and_matches_regex():
+    rng = random.Random(0)
+    words = {"".join(rng.choice("abcdef") for _ in range(rng.randint(2, 8))) for _ in range(2000)}
+    matcher = WordMatcher(words)
+    removed = set(rng.sample(sorted(words), len(words) - 50))
+    assert matcher.remove_many(removed) == len(removed)
+    kept = words - removed
+
+    assert matcher.words == kept
+    assert matcher.max_length == max(map(len, kept))
+    # Trie được thu gọn khi phần lớn từ bị xóa
+    assert len(matcher._goto) <= 4 * sum(map(len, kept)) + 1
+    text = " ".join(rng.choice(sorted(words)) for _ in range(500))
+    expected = {m.group() for word in kept for m in re.finditer(rf"\b{word}\b", text)}
+    assert set(matcher.search(text)) == expected
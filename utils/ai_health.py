@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Khoảng thời gian giữa các lần thăm dò khi bot đang được sử dụng (giây)
+PROBE_INTERVAL = 60.0
+# Khoảng thời gian tối đa giữa các lần thăm dò khi bot nhàn rỗi (giây)
+MAX_PROBE_INTERVAL = 900.0
+# Bot được coi là nhàn rỗi nếu không có yêu cầu AI nào trong khoảng này (giây)
+IDLE_AFTER = 600.0
+
+# Hàm nhận kết quả thăm dò của từng model: (tên model, độ trễ, lỗi hoặc None)
+ProbeCallback = Callable[[str, float, Optional[BaseException]], None]
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """Kiểm tra lỗi có phải do hết quota / bị giới hạn tần suất hay không."""
+    error_msg = str(error).lower()
+    return any(marker in error_msg for marker in ("quota", "429", "resource_exhausted", "rate limit"))
+
+
+class LatencyWindow:
+    """Cửa sổ trượt lưu độ trễ và kết quả của các yêu cầu gần nhất."""
+
+    def __init__(self, size: int = 200) -> None:
+        """Khởi tạo cửa sổ.
+
+        Args:
+            size: Số mẫu tối đa được giữ lại.
+        """
+        self.samples: Deque[Tuple[float, bool]] = deque(maxlen=size)
+
+    def add(self, latency: float, ok: bool) -> None:
+        """Thêm một mẫu (độ trễ tính bằng giây, thành công hay lỗi)."""
+        self.samples.append((latency, ok))
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Tính phân vị độ trễ của các yêu cầu thành công.
+
+        Args:
+            p: Phân vị cần tính, trong khoảng 0-100.
+
+        Returns:
+            Độ trễ (giây) hoặc None nếu chưa có mẫu thành công nào.
+        """
+        latencies = sorted(latency for latency, ok in self.samples if ok)
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, max(0, round(p / 100 * len(latencies)) - 1))
+        return latencies[index]
+
+    @property
+    def error_rate(self) -> float:
+        """Tỷ lệ lỗi trong cửa sổ (0.0 nếu chưa có mẫu)."""
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+
+class AIHealthProbe:
+    """Thăm dò định kỳ trạng thái model AI ở chế độ nền.
+
+    Trạng thái được tổng hợp từ cả lần thăm dò lẫn các yêu cầu thật của người dùng,
+    nhờ đó ``/aistatus`` trả lời ngay mà không tốn thêm quota. Mỗi lần thăm dò gọi thẳng
+    từng model (không qua bộ định tuyến, vốn chỉ chọn model nhỏ nhất cho prompt ngắn).
+    Khi bot nhàn rỗi, khoảng cách giữa các lần thăm dò tăng gấp đôi cho tới ``max_interval``.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[Any],
+        interval: float = PROBE_INTERVAL,
+        max_interval: float = MAX_PROBE_INTERVAL,
+        idle_after: float = IDLE_AFTER,
+        on_result: Optional[ProbeCallback] = None,
+    ) -> None:
+        """Khởi tạo bộ thăm dò.
+
+        Args:
+            clients: Các client AI (có ``model_name`` và coroutine ``generate(prompt, config)``).
+            interval: Khoảng thăm dò khi bot đang hoạt động (giây).
+            max_interval: Khoảng thăm dò tối đa khi bot nhàn rỗi (giây).
+            idle_after: Thời gian không có yêu cầu để coi là nhàn rỗi (giây).
+            on_result: Hàm nhận kết quả thăm dò của từng model (ví dụ ``ModelRouter.record_probe``).
+        """
+        self.clients = list(clients)
+        self.on_result = on_result
+        self.interval = interval
+        self.max_interval = max_interval
+        self.idle_after = idle_after
+        self.window = LatencyWindow()
+        self.current_interval = interval
+        self.last_activity = time.monotonic()
+        self.last_probe_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[float] = None
+        self.quota_exhausted = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Bắt đầu vòng lặp thăm dò nền (nếu chưa chạy)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Dừng vòng lặp thăm dò nền."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def mark_activity(self) -> None:
+        """Ghi nhận có người dùng đang dùng AI, đưa chu kỳ thăm dò về mức cơ bản."""
+        self.last_activity = time.monotonic()
+        self.current_interval = self.interval
+
+    def record(self, latency: float, error: Optional[BaseException] = None) -> None:
+        """Ghi nhận kết quả một lần gọi model (thăm dò hoặc yêu cầu thật).
+
+        Args:
+            latency: Thời gian phản hồi (giây).
+            error: Lỗi xảy ra, hoặc None nếu thành công.
+        """
+        self.window.add(latency, error is None)
+        if error is None:
+            self.quota_exhausted = False
+            return
+        self.last_error = str(error) or error.__class__.__name__
+        self.last_error_at = time.time()
+        self.quota_exhausted = is_quota_error(error)
+
+    async def _probe_model(self, client: Any) -> Optional[BaseException]:
+        """Gửi một yêu cầu tối thiểu tới một model và ghi nhận kết quả.
+
+        Returns:
+            Lỗi xảy ra, hoặc None nếu model trả lời được.
+        """
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+        try:
+            await client.generate("Hi", {"max_output_tokens": 1})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+            logger.warning(f"⚠️ Thăm dò model {client.model_name} thất bại: {e}")
+        latency = time.perf_counter() - start
+        self.record(latency, error)
+        if self.on_result:
+            self.on_result(client.model_name, latency, error)
+        return error
+
+    async def probe(self) -> None:
+        """Thăm dò đồng thời mọi model."""
+        try:
+            errors: List[Optional[BaseException]] = await asyncio.gather(
+                *(self._probe_model(client) for client in self.clients)
+            )
+        finally:
+            self.last_probe_at = time.time()
+        # Chỉ coi là hết quota khi không còn model nào trả lời được
+        self.quota_exhausted = bool(errors) and all(error is not None and is_quota_error(error) for error in errors)
+
+    async def _run(self) -> None:
+        """Vòng lặp thăm dò, giãn chu kỳ khi bot nhàn rỗi."""
+        while True:
+            await self.probe()
+            if time.monotonic() - self.last_activity > self.idle_after:
+                self.current_interval = min(self.current_interval * 2, self.max_interval)
+            else:
+                self.current_interval = self.interval
+            await asyncio.sleep(self.current_interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Trả về trạng thái hiện tại để hiển thị.
+
+        Returns:
+            Từ điển gồm p50/p95 (giây), tỷ lệ lỗi, số mẫu, lỗi gần nhất,
+            trạng thái quota và chu kỳ thăm dò hiện tại.
+        """
+        return {
+            "p50": self.window.percentile(50),
+            "p95": self.window.percentile(95),
+            "error_rate": self.window.error_rate,
+            "samples": len(self.window),
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+            "quota_exhausted": self.quota_exhausted,
+            "last_probe_at": self.last_probe_at,
+            "interval": self.current_interval,
+        }
@@ -0,0 +1,270 @@
+import time
+from dataclasses import dataclass
+from typing import Hashable, List, Optional
+
+import numpy as np
+
+# Độ dài cửa sổ trượt (giây) và số ô thời gian chia cửa sổ
+FLOOD_WINDOW = 10.0
+FLOOD_BUCKETS = 5
+# Kích thước sketch: số cột mỗi hàng (lũy thừa của 2) và số hàm băm
+SKETCH_WIDTH = 1 << 16
+SKETCH_DEPTH = 4
+
+_MASK32 = 0xFFFFFFFF
+
+
+class SlidingCountMinSketch:
+    """Count-min sketch đếm số lần xuất hiện của mỗi khóa trong một cửa sổ thời gian trượt.
+
+    Cửa sổ được chia thành ``buckets`` ô thời gian, mỗi ô là một bảng đếm riêng; bảng tổng
+    ``aggregate`` luôn bằng tổng các ô còn trong cửa sổ. Khi sang ô mới, ô cũ nhất được trừ khỏi
+    bảng tổng rồi xóa về 0. Bộ nhớ cố định (``buckets × depth × width`` bộ đếm) bất kể có bao
+    nhiêu khóa; ước lượng chỉ có thể lớn hơn giá trị thật (khi băm trùng), không bao giờ nhỏ hơn.
+    """
+
+    def __init__(
+        self,
+        window: float = FLOOD_WINDOW,
+        buckets: int = FLOOD_BUCKETS,
+        width: int = SKETCH_WIDTH,
+        depth: int = SKETCH_DEPTH,
+    ) -> None:
+        """Khởi tạo sketch.
+
+        Args:
+            window: Độ dài cửa sổ (giây).
+            buckets: Số ô thời gian trong cửa sổ.
+            width: Số cột mỗi hàng.
+            depth: Số hàng (số hàm băm).
+        """
+        self.window = window
+        self.bucket_length = window / buckets
+        self.width = width
+        self.depth = depth
+        self._rows = [row * width for row in range(depth)]
+        # Mỗi ô thời gian đếm ít, uint16 là đủ; bảng tổng dùng uint32
+        self._buckets = np.zeros((buckets, depth * width), dtype=np.uint16)
+        self._aggregate = np.zeros(depth * width, dtype=np.uint32)
+        self._tick: Optional[int] = None
+
+    @property
+    def nbytes(self) -> int:
+        """Bộ nhớ dùng cho các bảng đếm (byte)."""
+        return self._buckets.nbytes + self._aggregate.nbytes
+
+    def _advance(self, now: float) -> int:
+        """Chuyển sang ô thời gian chứa ``now``, xóa các ô đã trượt khỏi cửa sổ."""
+        tick = int(now // self.bucket_length)
+        if self._tick is None:
+            self._tick = tick
+        elif tick > self._tick:
+            buckets = len(self._buckets)
+            if tick - self._tick >= buckets:
+                self._buckets.fill(0)
+                self._aggregate.fill(0)
+            else:
+                for expired in range(self._tick + 1, tick + 1):
+                    bucket = self._buckets[expired % buckets]
+                    self._aggregate -= bucket
+                    bucket.fill(0)
+            self._tick = tick
+        return self._tick % len(self._buckets)
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        """Vị trí của khóa trên từng hàng (băm kép từ một giá trị ``hash``)."""
+        h = hash(key)
+        h1 = h & _MASK32
+        h2 = ((h >> 32) & _MASK32) | 1
+        width = self.width
+        return [offset + (h1 + i * h2) % width for i, offset in enumerate(self._rows)]
+
+    def add(self, key: Hashable, now: float, count: int = 1) -> int:
+        """Cộng ``count`` cho khóa và trả về ước lượng số đếm trong cửa sổ.
+
+        Args:
+            key: Khóa cần đếm.
+            now: Thời điểm hiện tại (giây, đồng hồ đơn điệu).
+            count: Giá trị cộng thêm.
+
+        Returns:
+            Ước lượng tổng số đếm của khóa trong cửa sổ, kể cả lần cộng này.
+        """
+        bucket = self._buckets[self._advance(now)]
+        aggregate = self._aggregate
+        estimate = None
+        for index in self._indexes(key):
+            bucket[index] += count
+            value = aggregate[index] + count
+            aggregate[index] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        return int(estimate)
+
+    def estimate(self, key: Hashable, now: float) -> int:
+        """Ước lượng số đếm của khóa trong cửa sổ mà không cộng thêm.
+
+        Args:
+            key: Khóa cần tra.
+            now: Thời điểm hiện tại (giây, đồng hồ đơn điệu).
+
+        Returns:
+            Ước lượng số đếm.
+        """
+        self._advance(now)
+        return int(min(self._aggregate[index] for index in self._indexes(key)))
+
+
+@dataclass
+class FloodLimits:
+    """Ngưỡng phát hiện spam trong một cửa sổ ``FLOOD_WINDOW`` giây."""
+
+    # Số tin nhắn tối đa của một người dùng
+    user_messages: int = 8
+    # Số lần tối đa một người dùng gửi cùng một nội dung
+    user_duplicates: int = 3
+    # Số lần tối đa một nội dung xuất hiện trong một kênh (nhiều tài khoản cùng spam)
+    channel_duplicates: int = 6
+    # Nội dung ngắn hơn hoặc ít ký tự khác nhau hơn mức này ("gg", "ok", "+1", emoji) không bị
+    # đếm lặp theo kênh: nhiều người cùng gõ là chuyện bình thường
+    duplicate_min_length: int = 8
+    duplicate_min_distinct: int = 4
+    # Số lượt nhắc tên tối đa trong một tin nhắn và trong cả cửa sổ
+    message_mentions: int = 5
+    user_mentions: int = 10
+    # Số tin nhắn trong kênh để coi là đang bị raid (siết ngưỡng với thành viên mới)
+    channel_raid: int = 40
+    # Điểm tối thiểu để coi thành viên mới là tham gia raid: kênh đang bị raid được 1 điểm, mỗi
+    # dấu hiệu phụ (nhắn dồn, lặp nội dung, nhắc tên) thêm 1 điểm
+    raid_score: int = 2
+    # Thành viên vào server chưa quá khoảng này (giây) được coi là thành viên mới
+    new_member_age: float = 600.0
+    # Hệ số ngưỡng áp dụng cho thành viên mới
+    new_member_factor: float = 0.5
+
+
+class FloodDetector:
+    """Phát hiện spam theo tần suất, nội dung lặp lại và số lượt nhắc tên.
+
+    Mỗi loại tín hiệu dùng một ``SlidingCountMinSketch`` riêng, nên mỗi tin nhắn chỉ tốn một số
+    phép cộng cố định (O(1)) và bộ nhớ không phụ thuộc số người dùng hay kênh đang hoạt động.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[FloodLimits] = None,
+        window: float = FLOOD_WINDOW,
+        buckets: int = FLOOD_BUCKETS,
+        width: int = SKETCH_WIDTH,
+        depth: int = SKETCH_DEPTH,
+    ) -> None:
+        """Khởi tạo bộ phát hiện.
+
+        Args:
+            limits: Các ngưỡng phát hiện; mặc định dùng ``FloodLimits()``.
+            window: Độ dài cửa sổ (giây).
+            buckets: Số ô thời gian trong cửa sổ.
+            width: Số cột mỗi hàng của sketch.
+            depth: Số hàm băm của sketch.
+        """
+        self.limits = limits or FloodLimits()
+
+        def sketch() -> SlidingCountMinSketch:
+            """Tạo một sketch với cấu hình chung."""
+            return SlidingCountMinSketch(window, buckets, width, depth)
+
+        self.user_rate = sketch()
+        self.user_duplicates = sketch()
+        self.channel_duplicates = sketch()
+        self.user_mentions = sketch()
+        # Số kênh ít hơn nhiều so với số người dùng nên sketch đếm theo kênh nhỏ hơn
+        self.channel_rate = SlidingCountMinSketch(window, buckets, max(width // 16, 1024), depth)
+
+    @property
+    def nbytes(self) -> int:
+        """Tổng bộ nhớ của các sketch (byte)."""
+        return sum(
+            s.nbytes
+            for s in (self.user_rate, self.user_duplicates, self.channel_duplicates, self.user_mentions, self.channel_rate)
+        )
+
+    @staticmethod
+    def content_key(content: str) -> str:
+        """Nội dung tin nhắn sau khi bỏ khác biệt hoa/thường và khoảng trắng."""
+        return " ".join(content.casefold().split())
+
+    def is_informative(self, key: str) -> bool:
+        """Nội dung có đủ dài và đa dạng để đếm lặp theo kênh hay không."""
+        limits = self.limits
+        return len(key) >= limits.duplicate_min_length and len(set(key) - {" "}) >= limits.duplicate_min_distinct
+
+    def check(
+        self,
+        guild_id: int,
+        channel_id: int,
+        user_id: int,
+        content: str,
+        mentions: int = 0,
+        member_age: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> List[str]:
+        """Ghi nhận một tin nhắn và trả về các lý do bị coi là spam (nếu có).
+
+        Args:
+            guild_id: ID guild.
+            channel_id: ID kênh.
+            user_id: ID người gửi.
+            content: Nội dung tin nhắn.
+            mentions: Số lượt nhắc tên (người dùng, vai trò, @everyone) trong tin nhắn.
+            member_age: Số giây kể từ khi người gửi vào server, None nếu không rõ.
+            now: Thời điểm hiện tại; mặc định ``time.monotonic()``.
+
+        Returns:
+            Danh sách lý do vi phạm, rỗng nếu tin nhắn bình thường.
+        """
+        if now is None:
+            now = time.monotonic()
+        limits = self.limits
+        reasons = []
+
+        channel_count = self.channel_rate.add(channel_id, now)
+        new_member = member_age is not None and member_age < limits.new_member_age
+        factor = limits.new_member_factor if new_member else 1.0
+        # Dấu hiệu phụ: chưa đủ để xóa tin nhắn, chỉ cộng điểm raid của thành viên mới
+        signals = 0
+
+        user_count = self.user_rate.add((guild_id, user_id), now)
+        if user_count > limits.user_messages * factor:
+            reasons.append("gửi tin nhắn quá nhanh")
+        elif user_count > 1:
+            signals += 1
+
+        if content:
+            key = self.content_key(content)
+            digest = hash(key)
+            user_repeats = self.user_duplicates.add((guild_id, user_id, digest), now)
+            if user_repeats > limits.user_duplicates * factor:
+                reasons.append("lặp lại cùng một nội dung")
+            elif user_repeats > 1:
+                signals += 1
+            if self.is_informative(key):
+                channel_repeats = self.channel_duplicates.add((channel_id, digest), now)
+                if channel_repeats > limits.channel_duplicates:
+                    reasons.append("nội dung bị nhiều tài khoản gửi lặp lại")
+                elif channel_repeats > 1:
+                    signals += 1
+
+        if mentions:
+            total_mentions = self.user_mentions.add((guild_id, user_id), now, mentions)
+            if mentions > limits.message_mentions * factor:
+                reasons.append("nhắc tên quá nhiều người")
+            elif total_mentions > limits.user_mentions * factor:
+                reasons.append("nhắc tên quá nhiều lần")
+            else:
+                signals += 1
+
+        if not reasons and new_member and channel_count > limits.channel_raid and 1 + signals >= limits.raid_score:
+            # Thành viên mới nhắn vào kênh đang bị dồn dập kèm dấu hiệu spam khác: nhiều khả năng là raid
+            reasons.append("thành viên mới nhắn khi kênh đang bị spam")
+
+        return reasons
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import google.generativeai as genai
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Thời gian chờ tối đa cho một yêu cầu AI (giây)
+DEFAULT_REQUEST_TIMEOUT = 60.0
+
+
+class GeminiClient:
+    """Lớp bọc API sinh nội dung bất đồng bộ của Google Gemini.
+
+    Mọi yêu cầu chạy trực tiếp trên event loop qua ``generate_content_async``,
+    không chiếm luồng của thread pool mặc định (dùng chung với yt-dlp, gTTS).
+    """
+
+    def __init__(self, model: Any, model_name: str, request_timeout: float = DEFAULT_REQUEST_TIMEOUT) -> None:
+        """Khởi tạo client.
+
+        Args:
+            model: Đối tượng ``genai.GenerativeModel`` (hoặc tương thích).
+            model_name: Tên model để hiển thị và ghi log.
+            request_timeout: Thời gian chờ mặc định cho mỗi yêu cầu (giây).
+        """
+        self.model = model
+        self.model_name = model_name
+        self.request_timeout = request_timeout
+
+    @classmethod
+    def from_api_key(cls, api_key: str, model_name: str, **kwargs: Any) -> "GeminiClient":
+        """Tạo client từ API key và tên model.
+
+        Args:
+            api_key: Khóa API Gemini.
+            model_name: Tên model cần sử dụng.
+
+        Returns:
+            Client đã được cấu hình.
+        """
+        genai.configure(api_key=api_key)
+        return cls(genai.GenerativeModel(model_name), model_name, **kwargs)
+
+    async def generate(
+        self,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Gửi prompt tới model và trả về văn bản phản hồi.
+
+        Yêu cầu bị hủy (kèm hủy lời gọi mạng bên dưới) khi vượt quá thời gian chờ
+        hoặc khi coroutine gọi nó bị hủy.
+
+        Args:
+            prompt: Nội dung gửi tới model.
+            generation_config: Tham số sinh nội dung (temperature, top_p, ...).
+            timeout: Thời gian chờ (giây); None để dùng giá trị mặc định của client.
+
+        Returns:
+            Văn bản phản hồi, hoặc chuỗi rỗng nếu model không trả về nội dung.
+
+        Raises:
+            asyncio.TimeoutError: Nếu model không phản hồi kịp.
+            Exception: Các lỗi từ API Gemini (quota, model không tồn tại, ...).
+        """
+        config = genai.types.GenerationConfig(**(generation_config or {}))
+        response = await asyncio.wait_for(
+            self.model.generate_content_async(prompt, generation_config=config),
+            timeout=timeout or self.request_timeout,
+        )
+        try:
+            return response.text or ""
+        except ValueError:
+            # response.text báo lỗi khi phản hồi bị chặn hoặc không có phần nội dung
+            logger.warning(f"⚠️ Model {self.model_name} không trả về nội dung văn bản")
+            return ""
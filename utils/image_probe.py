@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Thời gian tối đa cho một lần kiểm tra URL (giây)
+PROBE_TIMEOUT = 2.0
+# Số kết nối tối đa của session kiểm tra, tổng và mỗi host
+PROBE_CONNECTIONS = 20
+PROBE_CONNECTIONS_PER_HOST = 4
+# Thời gian nhớ kết quả kiểm tra một URL (giây) và số URL tối đa được nhớ
+LIVENESS_TTL = 3600.0
+LIVENESS_MAX_ENTRIES = 4096
+# Host có từng ấy URL bị từ chối/quá hạn liên tiếp (không có URL sống nào) bị coi là chặn hotlink
+HOST_FAILURE_LIMIT = 3
+# Discord tải ảnh embed bằng User-Agent này; dùng lại để phát hiện host chặn hotlink
+PROBE_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; Discordbot/2.0; +https://discordapp.com)"}
+# Các mã lỗi mà nhiều máy chủ trả cho HEAD dù GET vẫn được; khi gặp thì thử lại bằng GET một byte
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 501}
+# Mã lỗi cho thấy cả host từ chối (chặn hotlink, giới hạn), khác với 404 chỉ của riêng URL
+HOST_FAILURE_STATUSES = {401, 403, 429, 451}
+
+
+class ImageProber:
+    """Kiểm tra nhanh URL ảnh còn sống hay không trước khi gửi embed.
+
+    Mỗi URL được kiểm tra bằng HEAD (hoặc GET ``Range: bytes=0-0`` nếu máy chủ không nhận HEAD)
+    qua một ``aiohttp.ClientSession`` dùng chung, với thời hạn ``timeout`` giây. Kết quả được nhớ
+    theo URL; host có nhiều URL chết liên tiếp bị bỏ qua luôn cho tới khi hết hạn.
+    """
+
+    def __init__(
+        self,
+        timeout: float = PROBE_TIMEOUT,
+        ttl: float = LIVENESS_TTL,
+        max_entries: int = LIVENESS_MAX_ENTRIES,
+        host_failure_limit: int = HOST_FAILURE_LIMIT,
+    ) -> None:
+        """Khởi tạo bộ kiểm tra; session chỉ được tạo ở lần dùng đầu tiên.
+
+        Args:
+            timeout: Thời hạn mỗi lần kiểm tra (giây).
+            ttl: Thời gian nhớ kết quả (giây).
+            max_entries: Số URL tối đa được nhớ.
+            host_failure_limit: Số URL chết liên tiếp để bỏ qua cả host.
+        """
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.host_failure_limit = host_failure_limit
+        self._session: Optional[aiohttp.ClientSession] = None
+        # url -> (còn sống, thời điểm kiểm tra)
+        self._urls: "OrderedDict[str, Tuple[bool, float]]" = OrderedDict()
+        # host -> (số URL chết liên tiếp, thời điểm lần chết gần nhất)
+        self._hosts: Dict[str, Tuple[int, float]] = {}
+        self.probes = 0
+        self.cache_hits = 0
+        self.dead = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Session dùng chung (tạo mới nếu chưa có hoặc đã đóng)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=PROBE_CONNECTIONS, limit_per_host=PROBE_CONNECTIONS_PER_HOST)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=PROBE_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Đóng session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def cached(self, url: str) -> Optional[bool]:
+        """Kết quả đã biết của URL (kể cả do host bị chặn), hoặc None nếu cần kiểm tra."""
+        now = time.monotonic()
+        entry = self._urls.get(url)
+        if entry is not None:
+            if now - entry[1] <= self.ttl:
+                return entry[0]
+            del self._urls[url]
+        host = self._hosts.get(urlsplit(url).hostname or "")
+        if host is not None and host[0] >= self.host_failure_limit and now - host[1] <= self.ttl:
+            return False
+        return None
+
+    def _remember(self, url: str, alive: bool, host_failure: bool = False) -> None:
+        """Ghi nhớ kết quả theo URL và cập nhật bộ đếm của host.
+
+        Args:
+            url: URL đã kiểm tra.
+            alive: URL còn tải được hay không.
+            host_failure: Lỗi do host (chặn, quá hạn, lỗi máy chủ) chứ không phải riêng URL (404).
+        """
+        now = time.monotonic()
+        self._urls[url] = (alive, now)
+        self._urls.move_to_end(url)
+        while len(self._urls) > self.max_entries:
+            self._urls.popitem(last=False)
+
+        host = urlsplit(url).hostname or ""
+        if alive:
+            self._hosts.pop(host, None)
+            return
+        self.dead += 1
+        if not host_failure:
+            return
+        failures, _ = self._hosts.get(host, (0, now))
+        self._hosts[host] = (failures + 1, now)
+        if failures + 1 == self.host_failure_limit:
+            logger.info(f"🔇 Bỏ qua ảnh từ {host}: {failures + 1} URL liên tiếp không tải được")
+
+    @staticmethod
+    def _is_image(response: aiohttp.ClientResponse) -> bool:
+        """Phản hồi thành công và (nếu có Content-Type) là ảnh."""
+        if response.status not in (200, 206):
+            return False
+        content_type = response.headers.get("Content-Type", "")
+        return not content_type or content_type.startswith("image/")
+
+    async def _request(self, url: str) -> Tuple[bool, int]:
+        """Gửi HEAD, thử lại bằng GET một byte nếu máy chủ không nhận HEAD.
+
+        Returns:
+            (là ảnh hợp lệ, mã trạng thái HTTP).
+        """
+        session = self._get_session()
+        async with session.head(url, allow_redirects=True) as response:
+            if response.status not in HEAD_FALLBACK_STATUSES:
+                return self._is_image(response), response.status
+        async with session.get(url, headers={"Range": "bytes=0-0"}, allow_redirects=True) as response:
+            return self._is_image(response), response.status
+
+    async def probe(self, url: str) -> bool:
+        """Kiểm tra một URL ảnh còn tải được hay không (dùng kết quả đã nhớ nếu có).
+
+        Args:
+            url: URL ảnh.
+
+        Returns:
+            True nếu URL trả về ảnh trong thời hạn.
+        """
+        known = self.cached(url)
+        if known is not None:
+            self.cache_hits += 1
+            return known
+        if urlsplit(url).scheme not in ("http", "https"):
+            self._remember(url, False)
+            return False
+
+        self.probes += 1
+        try:
+            # Thời hạn tính cho cả HEAD lẫn GET dự phòng
+            alive, status = await asyncio.wait_for(self._request(url), self.timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            self._remember(url, False, host_failure=True)
+            return False
+        self._remember(url, alive, host_failure=status in HOST_FAILURE_STATUSES or status >= 500)
+        return alive
+
+    async def first_live(self, urls: Iterable[str]) -> Optional[str]:
+        """Kiểm tra đồng thời các URL và trả về URL sống đầu tiên trả lời.
+
+        URL đã biết là sống được trả về ngay; các lần kiểm tra còn lại bị hủy khi đã có kết quả.
+
+        Args:
+            urls: Các URL ứng viên.
+
+        Returns:
+            Một URL còn sống, hoặc None nếu không có URL nào sống.
+        """
+        pending = []
+        for url in dict.fromkeys(urls):
+            known = self.cached(url)
+            if known:
+                self.cache_hits += 1
+                return url
+            if known is None:
+                pending.append(url)
+            else:
+                self.cache_hits += 1
+        if not pending:
+            return None
+
+        tasks = {asyncio.create_task(self.probe(url)): url for url in pending}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if await next_done:
+                    # as_completed trả về coroutine mới nên tìm lại URL qua task đã xong
+                    for task, url in tasks.items():
+                        if task.done() and not task.cancelled() and task.result():
+                            return url
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """Số liệu của bộ kiểm tra."""
+        blocked = sum(1 for failures, _ in self._hosts.values() if failures >= self.host_failure_limit)
+        return {
+            "probes": self.probes,
+            "cache_hits": self.cache_hits,
+            "dead": self.dead,
+            "urls": len(self._urls),
+            "blocked_hosts": blocked,
+        }
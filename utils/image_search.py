@@ -0,0 +1,300 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from ddgs import DDGS
+from ddgs.exceptions import RatelimitException
+
+from utils.image_probe import ImageProber
+from utils.rate_limiter import AdaptiveRateLimiter
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Số kết quả lấy mỗi lần tìm
+MAX_RESULTS = 10
+# Số lần thử lại khi bị giới hạn tần suất
+SEARCH_RETRIES = 3
+# Số luồng dành riêng cho DDGS (thư viện đồng bộ)
+SEARCH_WORKERS = 2
+# Thời gian sống của kết quả trong bộ đệm (giây) và số truy vấn tối đa được giữ
+CACHE_TTL = 1800.0
+CACHE_MAX_ENTRIES = 512
+# Khi đã gửi tỷ lệ kết quả này thì tìm nền để bổ sung thêm, tối đa tới CACHE_MAX_RESULTS kết quả
+CACHE_REFILL_RATIO = 0.7
+CACHE_MAX_RESULTS = 100
+# Số URL ứng viên kiểm tra đồng thời mỗi lượt và số lượt tối đa trước khi bỏ cuộc
+PROBE_CANDIDATES = 4
+PROBE_ROUNDS = 3
+
+# Mọi truy cập DuckDuckGo trong tiến trình dùng chung một ngân sách
+DDG_LIMITER = AdaptiveRateLimiter("DuckDuckGo")
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """Kiểm tra lỗi có phải do DuckDuckGo giới hạn tần suất (403/ratelimit) hay không."""
+    return isinstance(error, RatelimitException) or "403" in str(error) or "Ratelimit" in str(error)
+
+
+class ImageSearchClient:
+    """Tìm ảnh trên DuckDuckGo mà không chặn event loop.
+
+    ``DDGS`` là thư viện đồng bộ nên mỗi lần tìm chạy trong một ``ThreadPoolExecutor`` riêng
+    (không dùng chung executor mặc định với các tác vụ khác). Mọi lần gọi, kể cả thử lại, đều
+    lấy lượt từ bộ giới hạn tần suất chung; khi bị 403/ratelimit bộ giới hạn tự giảm tốc độ.
+    """
+
+    def __init__(self, workers: int = SEARCH_WORKERS, limiter: Optional[AdaptiveRateLimiter] = None) -> None:
+        """Khởi tạo client.
+
+        Args:
+            workers: Số luồng chạy DDGS.
+            limiter: Bộ giới hạn tần suất; mặc định dùng ``DDG_LIMITER`` chung của tiến trình.
+        """
+        self.limiter = limiter or DDG_LIMITER
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ddgs")
+
+    def close(self) -> None:
+        """Dừng các luồng tìm kiếm."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _search_sync(query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Gọi DDGS (chạy trong luồng của executor)."""
+        with DDGS() as ddgs:
+            return list(ddgs.images(query, max_results=max_results))
+
+    async def search(self, query: str, max_results: int = MAX_RESULTS, retries: int = SEARCH_RETRIES) -> List[Dict[str, Any]]:
+        """Tìm ảnh, thử lại khi bị giới hạn tần suất (bộ giới hạn tự giãn khoảng cách giữa các lần thử).
+
+        Args:
+            query: Từ khóa tìm kiếm.
+            max_results: Số kết quả tối đa.
+            retries: Số lần thử tối đa.
+
+        Returns:
+            Danh sách kết quả của DDGS (mỗi kết quả có khóa ``image``, ``source``, ...).
+
+        Raises:
+            RateLimitedError: Nếu DuckDuckGo đang bị ngắt mạch hoặc hàng đợi quá dài.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(retries):
+            # Chờ tới lượt trong ngân sách chung; lỗi RateLimitedError (mạch ngắt) được trả về ngay
+            await self.limiter.acquire()
+            try:
+                results = await loop.run_in_executor(self._executor, self._search_sync, query, max_results)
+            except Exception as e:
+                if not is_rate_limited(e):
+                    self.limiter.record_error()
+                    raise
+                self.limiter.record_rate_limited()
+                if attempt == retries - 1:
+                    raise
+                logger.warning(f"⚠️ DuckDuckGo giới hạn tần suất, thử lại (lần {attempt + 2}): {e}")
+                continue
+            except BaseException:
+                # Bị hủy giữa chừng (lệnh bị hủy, cog bị gỡ): trả lại lượt thử half-open,
+                # nếu không mạch sẽ từ chối mọi yêu cầu cho tới khi khởi động lại bot
+                self.limiter.record_error()
+                raise
+            self.limiter.record_success()
+            return results
+        return []
+
+
+def cache_key(query: str) -> str:
+    """Khóa bộ đệm của truy vấn: không phân biệt hoa/thường và khoảng trắng thừa."""
+    return " ".join(query.casefold().split())
+
+
+class _CachedResults:
+    """Tập kết quả của một truy vấn cùng các kết quả đã gửi."""
+
+    __slots__ = ("results", "urls", "unseen", "fetched_at", "max_results", "refill")
+
+    def __init__(self, results: List[Dict[str, Any]], max_results: int) -> None:
+        self.results: List[Dict[str, Any]] = []
+        self.urls: Set[str] = set()
+        self.unseen: List[int] = []
+        self.fetched_at = time.monotonic()
+        self.max_results = max_results
+        self.refill: Optional[asyncio.Task] = None
+        self.merge(results)
+
+    def merge(self, results: List[Dict[str, Any]]) -> int:
+        """Thêm các kết quả mới (bỏ ảnh trùng URL), trả về số kết quả được thêm."""
+        added = 0
+        for result in results:
+            url = result.get("image")
+            if url and url not in self.urls:
+                self.urls.add(url)
+                self.unseen.append(len(self.results))
+                self.results.append(result)
+                added += 1
+        return added
+
+
+class ImageResultCache:
+    """Bộ đệm kết quả tìm ảnh theo truy vấn, có TTL và giới hạn LRU.
+
+    Mỗi lần tìm lấy ``MAX_RESULTS`` kết quả; các lần gọi sau với cùng truy vấn được trả ngẫu nhiên
+    từ những kết quả chưa gửi mà không cần gọi mạng. Khi phần lớn kết quả đã được gửi, một lần
+    tìm nền lấy thêm kết quả (số lượng tăng dần) để bổ sung; khi gửi hết thì quay vòng lại.
+    Các lần gọi đồng thời cho cùng một truy vấn chưa có trong bộ đệm chỉ tạo một lần tìm.
+    Nếu có ``prober``, vài ứng viên được kiểm tra đồng thời và chỉ ảnh còn tải được mới được gửi.
+    """
+
+    def __init__(
+        self,
+        client: ImageSearchClient,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        refill_ratio: float = CACHE_REFILL_RATIO,
+        prober: Optional[ImageProber] = None,
+    ) -> None:
+        """Khởi tạo bộ đệm.
+
+        Args:
+            client: Client tìm ảnh.
+            ttl: Thời gian sống của một tập kết quả (giây).
+            max_entries: Số truy vấn tối đa giữ trong bộ đệm.
+            refill_ratio: Tỷ lệ kết quả đã gửi để bắt đầu tìm bổ sung.
+            prober: Bộ kiểm tra URL ảnh; None để gửi kết quả mà không kiểm tra.
+        """
+        self.client = client
+        self.prober = prober
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.refill_ratio = refill_ratio
+        self._entries: "OrderedDict[str, _CachedResults]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[_CachedResults]"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> Optional[_CachedResults]:
+        """Lấy tập kết quả còn hạn và đánh dấu vừa dùng."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.fetched_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, entry: _CachedResults) -> None:
+        """Lưu tập kết quả, bỏ truy vấn lâu không dùng nhất nếu vượt giới hạn."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _fetch(self, query: str, key: str) -> _CachedResults:
+        """Tìm mới cho truy vấn chưa có trong bộ đệm; các lời gọi đồng thời dùng chung một lần tìm."""
+        future = self._inflight.get(key)
+        if future:
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry = _CachedResults(await self.client.search(query), MAX_RESULTS)
+            if entry.results:
+                self._store(key, entry)
+            future.set_result(entry)
+            return entry
+        except Exception as e:
+            future.set_exception(e)
+            # Tránh cảnh báo "exception was never retrieved" khi không có ai chờ
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                # Lần tìm bị hủy: hủy luôn future chung để các lời gọi đang chờ không treo mãi
+                future.cancel()
+            del self._inflight[key]
+
+    async def _refill(self, query: str, entry: _CachedResults) -> None:
+        """Tìm nền thêm kết quả cho truy vấn đã gửi gần hết."""
+        entry.max_results += MAX_RESULTS
+        try:
+            results = await self.client.search(query, max_results=entry.max_results)
+        except Exception as e:
+            logger.warning(f"⚠️ Không thể bổ sung kết quả cho '{query}': {e}")
+            return
+        added = entry.merge(results)
+        entry.fetched_at = time.monotonic()
+        self.refills += 1
+        logger.info(f"🔄 Đã bổ sung {added} kết quả cho '{query}'")
+
+    async def pick(self, query: str) -> Optional[Dict[str, Any]]:
+        """Chọn ngẫu nhiên một kết quả chưa gửi cho truy vấn.
+
+        Args:
+            query: Từ khóa tìm kiếm.
+
+        Returns:
+            Một kết quả của DDGS, hoặc None nếu không tìm thấy ảnh nào (còn tải được).
+        """
+        key = cache_key(query)
+        entry = self._get(key)
+        if entry:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = await self._fetch(query, key)
+        if not entry.results:
+            return None
+
+        if not entry.unseen:
+            # Đã gửi hết: quay vòng lại toàn bộ tập kết quả
+            entry.unseen = list(range(len(entry.results)))
+        result = await self._choose(entry)
+        if result is None and not entry.unseen:
+            # Các ảnh chưa gửi đều đã chết: quay vòng lại những ảnh đã gửi (còn sống)
+            entry.unseen = list(range(len(entry.results)))
+            result = await self._choose(entry)
+
+        shown = 1 - len(entry.unseen) / len(entry.results)
+        can_grow = entry.max_results < CACHE_MAX_RESULTS
+        if shown >= self.refill_ratio and can_grow and (entry.refill is None or entry.refill.done()):
+            entry.refill = asyncio.create_task(self._refill(query, entry))
+        return result
+
+    async def _choose(self, entry: _CachedResults) -> Optional[Dict[str, Any]]:
+        """Lấy ngẫu nhiên một kết quả chưa gửi, bỏ qua ảnh không tải được nếu có ``prober``."""
+        if self.prober is None:
+            return entry.results[entry.unseen.pop(random.randrange(len(entry.unseen)))]
+
+        for _ in range(PROBE_ROUNDS):
+            if not entry.unseen:
+                break
+            candidates = random.sample(entry.unseen, min(PROBE_CANDIDATES, len(entry.unseen)))
+            urls = [entry.results[index]["image"] for index in candidates]
+            live = await self.prober.first_live(urls)
+            # Lượt gọi khác có thể đã lấy các chỉ số này trong lúc chờ kiểm tra
+            for index, url in zip(candidates, urls):
+                if (url == live or self.prober.cached(url) is False) and index in entry.unseen:
+                    entry.unseen.remove(index)
+            if live:
+                return entry.results[candidates[urls.index(live)]]
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Số liệu hoạt động của bộ đệm."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "refills": self.refills,
+        }
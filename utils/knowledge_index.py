@@ -0,0 +1,243 @@
+import logging
+import math
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Tham số BM25
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Độ dài tối đa (ký tự) của một đoạn tri thức
+SNIPPET_CHARS = 600
+# Khoảng thời gian tối thiểu giữa hai lần kiểm tra thay đổi file (giây)
+REFRESH_INTERVAL = 30.0
+# Phần mở rộng file được lập chỉ mục
+KNOWLEDGE_SUFFIXES = {".md", ".txt"}
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Tách văn bản thành token đã bỏ dấu, chữ thường.
+
+    Bỏ dấu tiếng Việt giúp câu hỏi gõ không dấu vẫn khớp với tài liệu có dấu.
+
+    Args:
+        text: Văn bản cần tách.
+
+    Returns:
+        Danh sách token.
+    """
+    folded = unicodedata.normalize("NFKD", text.lower().replace("đ", "d"))
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return TOKEN_PATTERN.findall(folded)
+
+
+def split_snippets(text: str, max_chars: int = SNIPPET_CHARS) -> List[str]:
+    """Chia văn bản thành các đoạn theo đoạn văn, gộp đoạn ngắn tới ``max_chars``.
+
+    Args:
+        text: Nội dung tài liệu.
+        max_chars: Độ dài tối đa của một đoạn.
+
+    Returns:
+        Danh sách đoạn văn bản.
+    """
+    snippets: List[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        # Tiêu đề markdown luôn mở đầu một đoạn mới
+        if current and (paragraph.startswith("#") or len(current) + len(paragraph) + 2 > max_chars):
+            snippets.append(current)
+            current = ""
+        while len(paragraph) > max_chars:
+            snippets.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        snippets.append(current)
+    return snippets
+
+
+@dataclass
+class _SourceEntry:
+    """Các đoạn đã tách token của một nguồn (file hoặc tài liệu ảo)."""
+
+    version: Tuple
+    snippets: List[str]
+    tokens: List[List[str]]
+
+
+class KnowledgeIndex:
+    """Chỉ mục BM25 cục bộ cho thư mục tri thức của server.
+
+    Trọng số BM25 được tính sẵn vào một ma trận thưa SciPy (đoạn × từ), nên mỗi truy vấn
+    chỉ là phép cộng vài cột. Chỉ file thay đổi (theo mtime/kích thước) mới được tách token
+    lại; ma trận được dựng lại từ token đã lưu. Hoạt động hoàn toàn offline.
+    """
+
+    def __init__(self, directory: Path, refresh_interval: float = REFRESH_INTERVAL) -> None:
+        """Khởi tạo chỉ mục.
+
+        Args:
+            directory: Thư mục chứa file tri thức (.md, .txt).
+            refresh_interval: Khoảng tối thiểu giữa hai lần kiểm tra thay đổi (giây).
+        """
+        self.directory = Path(directory)
+        self.refresh_interval = refresh_interval
+        self._sources: Dict[str, _SourceEntry] = {}
+        self._snippets: List[Tuple[str, str]] = []
+        self._vocab: Dict[str, int] = {}
+        self._weights: Optional[sparse.csc_matrix] = None
+        self._last_refresh = float("-inf")
+
+    def set_document(self, name: str, text: str) -> None:
+        """Thêm hoặc cập nhật một tài liệu ảo (không nằm trên đĩa), ví dụ nội dung lệnh trợ giúp.
+
+        Args:
+            name: Tên định danh của tài liệu.
+            text: Nội dung tài liệu.
+        """
+        key = f"virtual:{name}"
+        entry = self._sources.get(key)
+        if entry and entry.version == (text,):
+            return
+        self._sources[key] = self._build_entry((text,), text)
+        self._rebuild()
+
+    @staticmethod
+    def _build_entry(version: Tuple, text: str) -> _SourceEntry:
+        snippets = split_snippets(text)
+        return _SourceEntry(version, snippets, [tokenize(snippet) for snippet in snippets])
+
+    def refresh(self, force: bool = False) -> bool:
+        """Kiểm tra thư mục tri thức và cập nhật các file đã thay đổi.
+
+        Args:
+            force: Bỏ qua ``refresh_interval`` và kiểm tra ngay.
+
+        Returns:
+            True nếu chỉ mục đã được dựng lại.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return False
+        self._last_refresh = now
+
+        seen = set()
+        changed = False
+        if self.directory.is_dir():
+            for path in sorted(self.directory.rglob("*")):
+                if path.suffix.lower() not in KNOWLEDGE_SUFFIXES or not path.is_file():
+                    continue
+                key = f"file:{path.relative_to(self.directory)}"
+                seen.add(key)
+                stat = path.stat()
+                version = (stat.st_mtime_ns, stat.st_size)
+                entry = self._sources.get(key)
+                if entry and entry.version == version:
+                    continue
+                try:
+                    text = path.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError) as e:
+                    logger.error(f"❌ Không thể đọc file tri thức {path}: {e}")
+                    continue
+                self._sources[key] = self._build_entry(version, text)
+                changed = True
+
+        for key in [key for key in self._sources if key.startswith("file:") and key not in seen]:
+            del self._sources[key]
+            changed = True
+
+        if changed:
+            self._rebuild()
+        return changed
+
+    def _rebuild(self) -> None:
+        """Dựng lại ma trận trọng số BM25 từ token đã lưu."""
+        self._snippets = []
+        self._vocab = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        counts: List[int] = []
+        lengths: List[int] = []
+        for key, entry in self._sources.items():
+            for snippet, tokens in zip(entry.snippets, entry.tokens):
+                row = len(self._snippets)
+                self._snippets.append((key, snippet))
+                lengths.append(len(tokens))
+                term_counts: Dict[int, int] = {}
+                for token in tokens:
+                    term_id = self._vocab.setdefault(token, len(self._vocab))
+                    term_counts[term_id] = term_counts.get(term_id, 0) + 1
+                rows.extend([row] * len(term_counts))
+                cols.extend(term_counts.keys())
+                counts.extend(term_counts.values())
+
+        if not self._snippets:
+            self._weights = None
+            return
+
+        n_docs = len(self._snippets)
+        tf = np.asarray(counts, dtype=np.float32)
+        doc_len = np.asarray(lengths, dtype=np.float32)
+        avg_len = max(float(doc_len.mean()), 1.0)
+        col_idx = np.asarray(cols, dtype=np.int32)
+        row_idx = np.asarray(rows, dtype=np.int32)
+
+        doc_freq = np.bincount(col_idx, minlength=len(self._vocab)).astype(np.float32)
+        idf = np.log(1.0 + (n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = BM25_K1 * (1.0 - BM25_B + BM25_B * doc_len[row_idx] / avg_len)
+        weights = idf[col_idx] * tf * (BM25_K1 + 1.0) / (tf + norm)
+
+        self._weights = sparse.csc_matrix(
+            (weights, (row_idx, col_idx)), shape=(n_docs, len(self._vocab)), dtype=np.float32
+        )
+        logger.info(f"📚 Đã dựng chỉ mục tri thức: {n_docs} đoạn, {len(self._vocab)} từ")
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[float, str, str]]:
+        """Tìm các đoạn tri thức liên quan nhất tới câu hỏi.
+
+        Args:
+            query: Câu hỏi của người dùng.
+            k: Số đoạn tối đa trả về.
+
+        Returns:
+            Danh sách (điểm, nguồn, đoạn văn) theo điểm giảm dần; chỉ gồm đoạn có điểm > 0.
+        """
+        self.refresh()
+        if self._weights is None:
+            return []
+        term_ids = sorted({self._vocab[token] for token in tokenize(query) if token in self._vocab})
+        if not term_ids:
+            return []
+
+        scores = np.asarray(self._weights[:, term_ids].sum(axis=1)).ravel()
+        k = min(k, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (float(scores[i]), self._snippets[i][0], self._snippets[i][1])
+            for i in top
+            if scores[i] > 0
+        ]
+
+    @property
+    def total_chars(self) -> int:
+        """Tổng độ dài (ký tự) của mọi đoạn trong chỉ mục."""
+        return sum(len(snippet) for _, snippet in self._snippets)
+
+    def __len__(self) -> int:
+        return len(self._snippets)
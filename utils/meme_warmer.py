@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from utils.image_search import ImageResultCache, cache_key
+from utils.rate_limiter import AdaptiveRateLimiter, RateLimitedError
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Số truy vấn phổ biến nhất được làm nóng và số kết quả giữ sẵn cho mỗi truy vấn
+WARM_TOP_N = 20
+WARM_POOL_SIZE = 5
+# Điểm phổ biến tối thiểu (khoảng số lần gọi gần đây) để một truy vấn được làm nóng
+WARM_MIN_SCORE = 3.0
+# Chu kỳ kiểm tra nền và khoảng lặng cần có (không ai gọi lệnh) trước khi làm nóng (giây)
+WARM_INTERVAL = 15.0
+WARM_IDLE_SECONDS = 5.0
+# Kết quả trong pool cũ hơn khoảng này bị bỏ vì URL có thể đã chết (giây)
+WARM_RESULT_TTL = 900.0
+# Chu kỳ bán rã của điểm phổ biến (giây) và số truy vấn tối đa được theo dõi
+POPULARITY_HALF_LIFE = 3600.0
+POPULARITY_MAX_QUERIES = 1000
+
+
+class PopularityTracker:
+    """Đếm số lần gọi mỗi truy vấn, giảm dần theo thời gian (bán rã ``half_life`` giây)."""
+
+    def __init__(self, half_life: float = POPULARITY_HALF_LIFE, max_queries: int = POPULARITY_MAX_QUERIES) -> None:
+        """Khởi tạo bộ đếm.
+
+        Args:
+            half_life: Chu kỳ bán rã của điểm (giây).
+            max_queries: Số truy vấn tối đa được theo dõi.
+        """
+        self.half_life = half_life
+        self.max_queries = max_queries
+        # khóa -> (truy vấn gốc, điểm, thời điểm cập nhật điểm)
+        self._scores: Dict[str, Tuple[str, float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        """Điểm sau khi giảm theo thời gian đã trôi qua."""
+        return score * 0.5 ** ((now - updated) / self.half_life)
+
+    def record(self, key: str, query: str, now: Optional[float] = None) -> float:
+        """Ghi nhận một lần gọi truy vấn.
+
+        Args:
+            key: Khóa bộ đệm của truy vấn.
+            query: Truy vấn gốc (dùng khi làm nóng và hiển thị).
+            now: Thời điểm hiện tại (mặc định ``time.monotonic()``).
+
+        Returns:
+            Điểm mới của truy vấn.
+        """
+        now = time.monotonic() if now is None else now
+        _, score, updated = self._scores.get(key, (query, 0.0, now))
+        score = self._decayed(score, updated, now) + 1
+        self._scores[key] = (query, score, now)
+        if len(self._scores) > self.max_queries:
+            # Bỏ 10% truy vấn có điểm thấp nhất
+            ranked = sorted(self._scores, key=lambda k: self._decayed(*self._scores[k][1:], now))
+            for stale in ranked[: max(1, self.max_queries // 10)]:
+                del self._scores[stale]
+        return score
+
+    def top(self, n: int, now: Optional[float] = None) -> List[Tuple[str, str, float]]:
+        """``n`` truy vấn có điểm cao nhất.
+
+        Returns:
+            Danh sách (khóa, truy vấn gốc, điểm) theo điểm giảm dần.
+        """
+        now = time.monotonic() if now is None else now
+        scored = [(key, query, self._decayed(score, updated, now)) for key, (query, score, updated) in self._scores.items()]
+        scored.sort(key=lambda item: item[2], reverse=True)
+        return scored[:n]
+
+
+class MemeWarmer:
+    """Giữ sẵn vài kết quả đã kiểm tra cho các truy vấn meme phổ biến nhất.
+
+    Mỗi lần gọi ``pick`` được ghi vào ``PopularityTracker``. Một tác vụ nền định kỳ lấy trước
+    kết quả (qua ``ImageResultCache``, nên đã được kiểm tra URL còn sống) cho ``top_n`` truy vấn
+    phổ biến, nhưng chỉ khi bot đang rảnh và bộ giới hạn DuckDuckGo còn token sẵn, để việc làm
+    nóng không bao giờ khiến người dùng phải chờ. Truy vấn có kết quả sẵn được trả lời ngay
+    mà không cần gọi mạng.
+    """
+
+    def __init__(
+        self,
+        cache: ImageResultCache,
+        limiter: AdaptiveRateLimiter,
+        top_n: int = WARM_TOP_N,
+        pool_size: int = WARM_POOL_SIZE,
+        min_score: float = WARM_MIN_SCORE,
+        interval: float = WARM_INTERVAL,
+        idle_seconds: float = WARM_IDLE_SECONDS,
+    ) -> None:
+        """Khởi tạo bộ làm nóng.
+
+        Args:
+            cache: Bộ đệm kết quả tìm ảnh.
+            limiter: Bộ giới hạn tần suất DuckDuckGo dùng chung.
+            top_n: Số truy vấn phổ biến nhất được làm nóng.
+            pool_size: Số kết quả giữ sẵn cho mỗi truy vấn.
+            min_score: Điểm phổ biến tối thiểu để được làm nóng.
+            interval: Chu kỳ kiểm tra nền (giây).
+            idle_seconds: Khoảng lặng cần có trước khi làm nóng (giây).
+        """
+        self.cache = cache
+        self.limiter = limiter
+        self.top_n = top_n
+        self.pool_size = pool_size
+        self.min_score = min_score
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self.tracker = PopularityTracker()
+        # khóa -> các (kết quả, thời điểm lấy)
+        self._pools: Dict[str, Deque[Tuple[Dict[str, Any], float]]] = {}
+        self._last_request = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.warm_hits = 0
+        self.cold_hits = 0
+        self.warmed = 0
+
+    def start(self) -> None:
+        """Chạy tác vụ làm nóng nền."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Dừng tác vụ làm nóng nền."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _take(self, key: str) -> Optional[Dict[str, Any]]:
+        """Lấy một kết quả còn hạn từ pool của truy vấn."""
+        pool = self._pools.get(key)
+        now = time.monotonic()
+        while pool:
+            result, stored_at = pool.popleft()
+            if now - stored_at <= WARM_RESULT_TTL:
+                return result
+        return None
+
+    async def pick(self, query: str) -> Optional[Dict[str, Any]]:
+        """Lấy một kết quả cho truy vấn meme: từ pool nếu có, không thì tìm như bình thường.
+
+        Args:
+            query: Truy vấn meme (đã có từ "meme").
+
+        Returns:
+            Một kết quả của DDGS, hoặc None nếu không tìm thấy.
+        """
+        key = cache_key(query)
+        self.tracker.record(key, query)
+        self._last_request = time.monotonic()
+        result = self._take(key)
+        if result is not None:
+            self.warm_hits += 1
+            return result
+        self.cold_hits += 1
+        return await self.cache.pick(query)
+
+    def _idle(self) -> bool:
+        """Bot đang rảnh: không ai vừa gọi lệnh và DuckDuckGo còn token sẵn."""
+        return time.monotonic() - self._last_request >= self.idle_seconds and self.limiter.has_capacity()
+
+    async def _run(self) -> None:
+        """Vòng lặp nền: định kỳ làm nóng khi rảnh."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.warm()
+            except RateLimitedError:
+                continue
+            except Exception as e:
+                logger.error(f"❌ Lỗi khi làm nóng meme: {e}")
+
+    async def warm(self) -> int:
+        """Bổ sung pool cho các truy vấn phổ biến, dừng ngay khi bot hết rảnh.
+
+        Returns:
+            Số kết quả đã được thêm vào các pool.
+        """
+        popular = [(key, query) for key, query, score in self.tracker.top(self.top_n) if score >= self.min_score]
+        # Bỏ pool của truy vấn không còn phổ biến
+        keep = {key for key, _ in popular}
+        for key in list(self._pools):
+            if key not in keep:
+                del self._pools[key]
+
+        added = 0
+        now = time.monotonic()
+        for key, query in popular:
+            pool = self._pools.setdefault(key, deque())
+            while pool and now - pool[0][1] > WARM_RESULT_TTL:
+                pool.popleft()
+            seen = {result.get("image") for result, _ in pool}
+            while len(pool) < self.pool_size:
+                if not self._idle():
+                    return added
+                result = await self.cache.pick(query)
+                # Hết kết quả mới (bộ đệm đã quay vòng) thì chuyển sang truy vấn khác
+                if result is None or result.get("image") in seen:
+                    break
+                seen.add(result.get("image"))
+                pool.append((result, time.monotonic()))
+                added += 1
+        if added:
+            self.warmed += added
+            logger.info(f"🔥 Đã làm nóng {added} kết quả meme cho {len(popular)} truy vấn phổ biến")
+        return added
+
+    def stats(self) -> Dict[str, Any]:
+        """Số liệu: kích thước pool theo truy vấn phổ biến và tỷ lệ trả lời từ pool."""
+        total = self.warm_hits + self.cold_hits
+        pools = [
+            (query, score, len(self._pools.get(key, ())))
+            for key, query, score in self.tracker.top(self.top_n)
+            if score >= self.min_score
+        ]
+        return {
+            "tracked": len(self.tracker),
+            "pools": pools,
+            "warm_hits": self.warm_hits,
+            "cold_hits": self.cold_hits,
+            "hit_rate": self.warm_hits / total if total else 0.0,
+            "warmed": self.warmed,
+        }
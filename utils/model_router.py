@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from utils.ai_health import LatencyWindow, is_quota_error
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Độ trễ giả định (giây) khi model chưa có mẫu đo nào
+DEFAULT_LATENCY = 3.0
+# Thời gian tạm ngưng model sau lỗi quota (giây), tăng gấp đôi nếu lặp lại
+QUOTA_COOLDOWN = 60.0
+MAX_QUOTA_COOLDOWN = 900.0
+# Thời gian tạm ngưng model khi API báo không tồn tại (404)
+NOT_FOUND_COOLDOWN = 3600.0
+# Chi phí (giây) cộng thêm cho mỗi bậc model lớn hơn mức cần thiết
+OVERSIZE_PENALTY = 1.0
+
+# Dấu hiệu cho thấy câu hỏi cần model lớn hơn
+COMPLEX_PATTERN = re.compile(
+    r"```|\b(giải thích|phân tích|so sánh|chứng minh|tại sao|vì sao|viết|code|lập trình|thuật toán|"
+    r"explain|analy[sz]e|compare|prove|why|write|implement|debug|algorithm)\b",
+    re.IGNORECASE,
+)
+
+
+def is_not_found_error(error: BaseException) -> bool:
+    """Kiểm tra lỗi có phải do model không tồn tại (404) hay không."""
+    error_msg = str(error).lower()
+    return "404" in error_msg or "not found" in error_msg
+
+
+@dataclass
+class ModelStats:
+    """Thống kê và trạng thái tạm ngưng của một model."""
+
+    window: LatencyWindow = field(default_factory=LatencyWindow)
+    requests: int = 0
+    failures: int = 0
+    cooldown_until: float = 0.0
+    cooldown_streak: int = 0
+    last_error: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        """Model có đang nhận yêu cầu hay không."""
+        return time.monotonic() >= self.cooldown_until
+
+
+@dataclass
+class RoutingDecision:
+    """Một quyết định định tuyến, lưu lại để hiển thị trong /aistatus."""
+
+    model: str
+    complexity: int
+    reason: str
+    at: float = field(default_factory=time.time)
+
+
+class ModelRouter:
+    """Định tuyến yêu cầu AI tới một trong nhiều model theo độ phức tạp và độ trễ.
+
+    Model được sắp xếp từ nhỏ/nhanh tới lớn/chậm. Mỗi yêu cầu được chấm độ phức tạp,
+    sau đó chọn model đủ năng lực có chi phí thấp nhất dựa trên p95 và tỷ lệ lỗi
+    quan sát được. Model trả lỗi quota hoặc 404 bị tạm ngưng và yêu cầu tự động
+    chuyển sang model kế tiếp.
+    """
+
+    def __init__(self, clients: Sequence[Any]) -> None:
+        """Khởi tạo bộ định tuyến.
+
+        Args:
+            clients: Các client AI (có ``model_name`` và ``generate``), từ nhỏ tới lớn.
+        """
+        if not clients:
+            raise ValueError("Cần ít nhất một model để định tuyến")
+        self.clients = list(clients)
+        self.stats: Dict[str, ModelStats] = {client.model_name: ModelStats() for client in self.clients}
+        self.decisions: Deque[RoutingDecision] = deque(maxlen=10)
+
+    @property
+    def model_name(self) -> str:
+        """Tên các model được định tuyến."""
+        return ", ".join(client.model_name for client in self.clients)
+
+    def complexity(self, message: str) -> int:
+        """Chấm độ phức tạp của tin nhắn người dùng.
+
+        Args:
+            message: Tin nhắn gốc (không gồm system prompt).
+
+        Returns:
+            Bậc phức tạp từ 0 tới ``len(clients) - 1``.
+        """
+        score = 0
+        if len(message) > 120:
+            score += 1
+        if len(message) > 600:
+            score += 1
+        if COMPLEX_PATTERN.search(message):
+            score += 1
+        if message.count("?") > 1 or message.count("\n") > 2:
+            score += 1
+        top = len(self.clients) - 1
+        # Quy đổi thang điểm 0-4 về số bậc model hiện có
+        return min(top, round(score * top / 4)) if top else 0
+
+    def _cost(self, index: int, tier: int) -> float:
+        """Chi phí kỳ vọng (giây) khi dùng model ``index`` cho yêu cầu bậc ``tier``."""
+        stats = self.stats[self.clients[index].model_name]
+        p95 = stats.window.percentile(95) or DEFAULT_LATENCY
+        return p95 * (1 + 2 * stats.window.error_rate) + OVERSIZE_PENALTY * (index - tier)
+
+    def candidates(self, tier: int) -> List[int]:
+        """Sắp xếp chỉ số model theo thứ tự ưu tiên cho một bậc phức tạp.
+
+        Model đủ năng lực (bậc >= độ phức tạp) đứng trước, xếp theo chi phí;
+        sau đó tới model nhỏ hơn, từ lớn xuống nhỏ. Model đang tạm ngưng bị loại.
+
+        Args:
+            tier: Bậc phức tạp của yêu cầu (xem ``complexity``).
+
+        Returns:
+            Danh sách chỉ số model theo thứ tự thử.
+        """
+        capable = sorted(range(tier, len(self.clients)), key=lambda i: self._cost(i, tier))
+        fallback = list(range(tier - 1, -1, -1))
+        return [i for i in capable + fallback if self.stats[self.clients[i].model_name].available]
+
+    def _penalize(self, stats: ModelStats, error: BaseException) -> None:
+        """Tạm ngưng model sau lỗi quota hoặc 404."""
+        if is_not_found_error(error):
+            cooldown = NOT_FOUND_COOLDOWN
+        else:
+            cooldown = min(QUOTA_COOLDOWN * 2 ** stats.cooldown_streak, MAX_QUOTA_COOLDOWN)
+            stats.cooldown_streak += 1
+        stats.cooldown_until = time.monotonic() + cooldown
+
+    def record_probe(self, model_name: str, latency: float, error: Optional[BaseException] = None) -> None:
+        """Cập nhật trạng thái tạm ngưng của model theo kết quả thăm dò nền.
+
+        Độ trễ thăm dò (một token) không được tính vào thống kê dùng để định tuyến. Model trả lời
+        được thì hết tạm ngưng ngay; model báo lỗi quota/404 bị tạm ngưng như một yêu cầu thật.
+
+        Args:
+            model_name: Tên model được thăm dò.
+            latency: Thời gian phản hồi (giây), không dùng.
+            error: Lỗi xảy ra, hoặc None nếu thành công.
+        """
+        stats = self.stats.get(model_name)
+        if stats is None:
+            return
+        if error is None:
+            stats.cooldown_until = 0.0
+            stats.cooldown_streak = 0
+        elif is_quota_error(error) or is_not_found_error(error):
+            stats.last_error = str(error)
+            if stats.available:
+                self._penalize(stats, error)
+
+    async def generate(
+        self,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        message: Optional[str] = None,
+    ) -> str:
+        """Gửi prompt tới model phù hợp nhất, chuyển model khi gặp lỗi quota/404.
+
+        Args:
+            prompt: Prompt hoàn chỉnh gửi tới model.
+            generation_config: Tham số sinh nội dung.
+            timeout: Thời gian chờ cho mỗi lần thử (giây).
+            message: Tin nhắn gốc dùng để chấm độ phức tạp (mặc định là ``prompt``).
+
+        Returns:
+            Văn bản phản hồi.
+
+        Raises:
+            Exception: Lỗi cuối cùng nếu mọi model đều thất bại hoặc đang tạm ngưng.
+        """
+        tier = self.complexity(prompt if message is None else message)
+        order = self.candidates(tier)
+        if not order:
+            raise RuntimeError("quota: tất cả model AI đang tạm ngưng, vui lòng thử lại sau")
+
+        last_error: Optional[BaseException] = None
+        for attempt, index in enumerate(order):
+            client = self.clients[index]
+            stats = self.stats[client.model_name]
+            if attempt:
+                reason = f"chuyển từ model lỗi: {last_error}"[:100]
+            elif index == tier:
+                reason = "khớp độ phức tạp"
+            elif index > tier:
+                reason = "model phù hợp đang chậm hoặc tạm ngưng"
+            else:
+                reason = "không còn model đủ lớn"
+            self.decisions.append(RoutingDecision(client.model_name, tier, reason))
+
+            stats.requests += 1
+            start = time.perf_counter()
+            try:
+                response_text = await client.generate(prompt, generation_config, timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.failures += 1
+                stats.last_error = str(e)
+                stats.window.add(time.perf_counter() - start, False)
+                if not (is_quota_error(e) or is_not_found_error(e)):
+                    raise
+                self._penalize(stats, e)
+                logger.warning(f"⚠️ Model {client.model_name} lỗi ({e}), chuyển sang model khác")
+                last_error = e
+                continue
+            stats.window.add(time.perf_counter() - start, True)
+            stats.cooldown_streak = 0
+            return response_text
+        raise last_error
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Trả về thống kê từng model để hiển thị.
+
+        Returns:
+            Danh sách từ điển (tên model, p50, p95, tỷ lệ lỗi, số yêu cầu, thời gian tạm ngưng còn lại).
+        """
+        now = time.monotonic()
+        return [
+            {
+                "model": client.model_name,
+                "p50": self.stats[client.model_name].window.percentile(50),
+                "p95": self.stats[client.model_name].window.percentile(95),
+                "error_rate": self.stats[client.model_name].window.error_rate,
+                "requests": self.stats[client.model_name].requests,
+                "cooldown": max(0.0, self.stats[client.model_name].cooldown_until - now),
+            }
+            for client in self.clients
+        ]
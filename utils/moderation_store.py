@@ -0,0 +1,346 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Thời gian gom các thay đổi trước khi ghi xuống cơ sở dữ liệu (giây)
+DEBOUNCE_SECONDS = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guild_words (
+    guild_id INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    PRIMARY KEY (guild_id, word)
+);
+CREATE TABLE IF NOT EXISTS guild_exclusions (
+    guild_id INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    PRIMARY KEY (guild_id, word)
+);
+CREATE TABLE IF NOT EXISTS guild_rules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    pattern TEXT NOT NULL,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    reason TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS guild_rules_guild ON guild_rules (guild_id);
+"""
+TABLES = ("guild_words", "guild_exclusions")
+
+# (bảng, guild_id, từ) -> True nếu thêm, False nếu xóa
+ChangeKey = Tuple[str, int, str]
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Ghi file theo kiểu ghi-file-tạm, fsync rồi đổi tên, tránh hỏng file khi bot dừng giữa chừng.
+
+    Args:
+        path: File đích.
+        text: Nội dung cần ghi.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ModerationStore:
+    """Lưu danh sách từ cấm riêng của từng guild trong SQLite.
+
+    Mỗi guild có hai tập: ``guild_words`` (từ thêm riêng) và ``guild_exclusions``
+    (từ trong danh sách chung bị guild tắt đi), cùng bảng ``guild_rules`` chứa các luật
+    wildcard/regex.
+
+    Thay đổi được ghi ngay vào một nhật ký chỉ-nối-thêm (``<tên>.journal``), rồi gom lại
+    trong ``debounce`` giây và ghi vào SQLite bằng một transaction trong luồng nền. Khi
+    khởi động, các nhật ký còn sót (do bot dừng trước khi kịp ghi) được phát lại. Nhờ vậy
+    thêm hàng nghìn từ một lúc chỉ tốn một lần ghi cơ sở dữ liệu.
+    """
+
+    def __init__(self, path: Path, debounce: float = DEBOUNCE_SECONDS) -> None:
+        """Mở (hoặc tạo) cơ sở dữ liệu và phát lại nhật ký còn sót.
+
+        Args:
+            path: Đường dẫn file SQLite.
+            debounce: Thời gian gom thay đổi trước khi ghi (giây).
+        """
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self.debounce = debounce
+        # Kết nối ghi chỉ dùng trong luồng nền (và lúc khởi động), kết nối đọc dùng trên event loop
+        self._writer = sqlite3.connect(self.path, check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.executescript(SCHEMA)
+        self._writer.commit()
+        self._reader = sqlite3.connect(self.path, check_same_thread=False)
+        self._write_lock = threading.Lock()
+
+        self._pending: Dict[ChangeKey, bool] = {}
+        self._inflight: Dict[ChangeKey, bool] = {}
+        self._segment = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self._replay_journal()
+        self._journal = self.journal_path.open("a", encoding="utf-8")
+
+    def _journal_files(self) -> List[Path]:
+        """Các file nhật ký hiện có, theo thứ tự ghi."""
+        segments = sorted(
+            self.path.parent.glob(f"{self.journal_path.name}.*"),
+            key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0,
+        )
+        return segments + ([self.journal_path] if self.journal_path.exists() else [])
+
+    def _replay_journal(self) -> None:
+        """Áp dụng các thay đổi còn trong nhật ký vào cơ sở dữ liệu rồi xóa nhật ký."""
+        files = self._journal_files()
+        changes: Dict[ChangeKey, bool] = {}
+        for journal in files:
+            with journal.open("r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        changes[(entry["t"], int(entry["g"]), entry["w"])] = bool(entry["p"])
+                    except (ValueError, KeyError):
+                        # Dòng cuối có thể bị cắt dở nếu bot dừng đột ngột
+                        logger.warning(f"⚠️ Bỏ qua dòng nhật ký hỏng trong {journal.name}")
+        if changes:
+            self._apply(changes)
+            logger.info(f"📝 Đã phát lại {len(changes)} thay đổi từ nhật ký kiểm duyệt")
+        for journal in files:
+            journal.unlink()
+
+    def load_guild(self, guild_id: int) -> Tuple[Set[str], Set[str]]:
+        """Đọc danh sách của một guild, gồm cả các thay đổi chưa ghi xuống cơ sở dữ liệu.
+
+        Args:
+            guild_id: ID guild.
+
+        Returns:
+            (tập từ thêm riêng, tập từ chung bị tắt).
+        """
+        result = {
+            table: {
+                row[0] for row in self._reader.execute(f"SELECT word FROM {table} WHERE guild_id = ?", (guild_id,))
+            }
+            for table in TABLES
+        }
+        for changes in (self._inflight, self._pending):
+            for (table, change_guild, word), present in changes.items():
+                if change_guild != guild_id:
+                    continue
+                if present:
+                    result[table].add(word)
+                else:
+                    result[table].discard(word)
+        return result["guild_words"], result["guild_exclusions"]
+
+    def load_rules(self, guild_id: int) -> List[Tuple[int, str, str, bool, str]]:
+        """Đọc các luật wildcard/regex của một guild.
+
+        Args:
+            guild_id: ID guild.
+
+        Returns:
+            Danh sách (id, loại, mẫu, đang bật, lý do bị tắt), theo thứ tự thêm.
+        """
+        rows = self._reader.execute(
+            "SELECT id, kind, pattern, enabled, reason FROM guild_rules WHERE guild_id = ? ORDER BY id", (guild_id,)
+        )
+        return [(rule_id, kind, pattern, bool(enabled), reason) for rule_id, kind, pattern, enabled, reason in rows]
+
+    def _execute(self, sql: str, params: Tuple) -> sqlite3.Cursor:
+        """Chạy một câu lệnh ghi trong transaction riêng (chạy trong luồng nền)."""
+        with self._write_lock:
+            with self._writer:
+                return self._writer.execute(sql, params)
+
+    async def add_rule(self, guild_id: int, kind: str, pattern: str) -> int:
+        """Thêm một luật cho guild.
+
+        Luật ít khi thay đổi nên được ghi thẳng vào SQLite (trong luồng nền), không qua nhật ký.
+
+        Args:
+            guild_id: ID guild.
+            kind: Loại luật.
+            pattern: Mẫu do admin nhập.
+
+        Returns:
+            ID của luật mới.
+        """
+        cursor = await asyncio.to_thread(
+            self._execute, "INSERT INTO guild_rules (guild_id, kind, pattern) VALUES (?, ?, ?)", (guild_id, kind, pattern)
+        )
+        return cursor.lastrowid
+
+    async def remove_rule(self, guild_id: int, rule_id: int) -> bool:
+        """Xóa một luật của guild.
+
+        Returns:
+            False nếu guild không có luật này.
+        """
+        cursor = await asyncio.to_thread(
+            self._execute, "DELETE FROM guild_rules WHERE guild_id = ? AND id = ?", (guild_id, rule_id)
+        )
+        return cursor.rowcount > 0
+
+    async def set_rule_enabled(self, guild_id: int, rule_id: int, enabled: bool, reason: str = "") -> bool:
+        """Bật hoặc tắt một luật của guild.
+
+        Returns:
+            False nếu guild không có luật này.
+        """
+        cursor = await asyncio.to_thread(
+            self._execute,
+            "UPDATE guild_rules SET enabled = ?, reason = ? WHERE guild_id = ? AND id = ?",
+            (int(enabled), reason, guild_id, rule_id),
+        )
+        return cursor.rowcount > 0
+
+    def set_word(self, guild_id: int, word: str, present: bool) -> None:
+        """Thêm hoặc xóa một từ riêng của guild."""
+        self._record("guild_words", guild_id, [word], present)
+
+    def set_words(self, guild_id: int, words: Iterable[str], present: bool) -> None:
+        """Thêm hoặc xóa nhiều từ riêng của guild trong một lần ghi."""
+        self._record("guild_words", guild_id, words, present)
+
+    def set_exclusion(self, guild_id: int, word: str, present: bool) -> None:
+        """Tắt hoặc bật lại một từ của danh sách chung cho guild."""
+        self._record("guild_exclusions", guild_id, [word], present)
+
+    def set_exclusions(self, guild_id: int, words: Iterable[str], present: bool) -> None:
+        """Tắt hoặc bật lại nhiều từ của danh sách chung cho guild."""
+        self._record("guild_exclusions", guild_id, words, present)
+
+    def _record(self, table: str, guild_id: int, words: Iterable[str], present: bool) -> None:
+        """Ghi thay đổi vào nhật ký và hàng đợi, rồi hẹn lịch ghi xuống cơ sở dữ liệu."""
+        changes = {(table, guild_id, word): present for word in words}
+        if not changes:
+            return
+        self._pending.update(changes)
+        self._write_journal(changes)
+        self._schedule_flush()
+
+    def _write_journal(self, changes: Dict[ChangeKey, bool]) -> None:
+        """Nối các thay đổi vào nhật ký hiện tại."""
+        lines = [
+            json.dumps({"t": table, "g": guild_id, "w": word, "p": present}, ensure_ascii=False)
+            for (table, guild_id, word), present in changes.items()
+        ]
+        self._journal.write("\n".join(lines) + "\n")
+        self._journal.flush()
+
+    def _schedule_flush(self) -> None:
+        """Hẹn một lần ghi sau ``debounce`` giây (nếu chưa có lần nào được hẹn)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Không có event loop (ví dụ khi chạy script): ghi ngay
+            self._flush_sync()
+            return
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.debounce, self._start_flush)
+
+    def _start_flush(self) -> None:
+        """Bắt đầu ghi nền; nếu lần ghi trước chưa xong thì hẹn lại."""
+        self._flush_handle = None
+        if self._flush_task and not self._flush_task.done():
+            self._schedule_flush()
+            return
+        self._flush_task = asyncio.create_task(self.flush())
+
+    def _rotate_journal(self) -> Path:
+        """Chuyển nhật ký hiện tại thành một phân đoạn đã đóng, mở nhật ký mới cho thay đổi tiếp theo."""
+        self._journal.close()
+        self._segment += 1
+        segment = self.journal_path.with_name(f"{self.journal_path.name}.{self._segment}")
+        os.replace(self.journal_path, segment)
+        self._journal = self.journal_path.open("a", encoding="utf-8")
+        return segment
+
+    def _apply(self, changes: Dict[ChangeKey, bool], segment: Optional[Path] = None) -> None:
+        """Ghi một nhóm thay đổi vào SQLite trong một transaction (chạy trong luồng nền).
+
+        Phân đoạn nhật ký tương ứng chỉ bị xóa sau khi transaction đã commit.
+        """
+        with self._write_lock:
+            with self._writer:
+                for table in TABLES:
+                    inserts = [(g, w) for (t, g, w), present in changes.items() if t == table and present]
+                    deletes = [(g, w) for (t, g, w), present in changes.items() if t == table and not present]
+                    if inserts:
+                        self._writer.executemany(
+                            f"INSERT OR IGNORE INTO {table} (guild_id, word) VALUES (?, ?)", inserts
+                        )
+                    if deletes:
+                        self._writer.executemany(f"DELETE FROM {table} WHERE guild_id = ? AND word = ?", deletes)
+        if segment is not None:
+            segment.unlink(missing_ok=True)
+
+    async def flush(self) -> None:
+        """Ghi mọi thay đổi đang chờ xuống cơ sở dữ liệu trong luồng nền."""
+        if not self._pending:
+            return
+        self._inflight, self._pending = self._pending, {}
+        segment = self._rotate_journal()
+        try:
+            await asyncio.to_thread(self._apply, self._inflight, segment)
+            logger.info(f"✅ Đã lưu {len(self._inflight)} thay đổi danh sách từ cấm")
+        except Exception as e:
+            logger.error(f"❌ Lỗi khi lưu danh sách từ cấm: {e}")
+            self._requeue(self._inflight, segment)
+            self._schedule_flush()
+        finally:
+            self._inflight = {}
+
+    def _requeue(self, changes: Dict[ChangeKey, bool], segment: Path) -> None:
+        """Đưa các thay đổi ghi lỗi về lại hàng đợi và gộp phân đoạn nhật ký của chúng vào nhật ký hiện tại.
+
+        Chỉ các khóa chưa bị thay đổi lại kể từ lúc ghi mới được đưa về; phân đoạn cũ bị xóa sau đó, nếu
+        không lần ghi thành công kế tiếp chỉ xóa phân đoạn mới và lần khởi động sau sẽ phát lại trạng thái
+        cũ (ví dụ thêm lại một từ đã bị xóa).
+        """
+        requeued = {key: present for key, present in changes.items() if key not in self._pending}
+        self._pending.update(requeued)
+        try:
+            if requeued:
+                self._write_journal(requeued)
+            segment.unlink(missing_ok=True)
+        except OSError as e:
+            # Không gộp được: giữ phân đoạn, thay đổi vẫn được phát lại khi khởi động lại
+            logger.error(f"❌ Không thể gộp nhật ký {segment.name}: {e}")
+
+    def _flush_sync(self) -> None:
+        """Ghi ngay các thay đổi đang chờ (dùng khi không có event loop)."""
+        if not self._pending:
+            return
+        changes, self._pending = self._pending, {}
+        self._apply(changes, self._rotate_journal())
+
+    async def aclose(self) -> None:
+        """Ghi nốt các thay đổi đang chờ và đóng cơ sở dữ liệu."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task:
+            await self._flush_task
+        await self.flush()
+        self._journal.close()
+        self._reader.close()
+        self._writer.close()
+        if self.journal_path.exists() and not self.journal_path.stat().st_size:
+            self.journal_path.unlink()
@@ -0,0 +1,341 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+RULE_KINDS = ("wildcard", "regex")
+# Độ dài tối đa của một mẫu
+MAX_PATTERN_LENGTH = 200
+# Thời gian tối đa để đánh giá mọi luật của một tin nhắn (giây)
+RULE_TIME_BUDGET = 0.5
+# Một luật chạy lâu hơn khoảng này cho một tin nhắn bị coi là chậm và bị tắt (giây)
+SLOW_RULE_SECONDS = 0.05
+# Số tin nhắn tối đa chờ đánh giá luật; vượt quá thì bỏ qua để không dồn ứ
+MAX_PENDING_EVALUATIONS = 100
+# Chuỗi thử chung khi thêm luật, nhắm vào các mẫu gây backtracking thảm họa
+VALIDATION_SAMPLES = (
+    "a " * 2500 + "!",
+    "0" * 5000 + "x",
+    "ab" * 2500 + "c",
+)
+# Độ dài chuỗi lặp ký tự dùng để thử luật
+VALIDATION_LENGTH = 5000
+
+
+@dataclass
+class PatternRule:
+    """Luật kiểm duyệt dạng wildcard hoặc regex của một guild.
+
+    Wildcard được khớp trên văn bản đã chuẩn hóa (leetspeak, ký tự tách rời; bỏ dấu nếu mẫu viết
+    không dấu) giống danh sách từ cấm; regex được khớp trên nội dung gốc viết thường, giữ nguyên dấu, để admin tự
+    kiểm soát hoàn toàn mẫu của mình.
+    """
+
+    id: int
+    kind: str
+    pattern: str
+    source: str
+    enabled: bool = True
+    reason: str = ""
+
+    @property
+    def on_raw(self) -> bool:
+        """Luật được khớp trên nội dung gốc (regex) thay vì văn bản đã chuẩn hóa (wildcard)."""
+        return self.kind == "regex"
+
+
+@dataclass
+class RuleResult:
+    """Kết quả đánh giá luật cho một tin nhắn."""
+
+    matched: List[PatternRule] = field(default_factory=list)
+    # Luật chạy chậm hoặc quá thời gian, kèm lý do
+    slow: List[Tuple[PatternRule, str]] = field(default_factory=list)
+
+
+def wildcard_to_regex(pattern: str) -> str:
+    """Chuyển mẫu wildcard thành regex: ``*`` khớp nhiều ký tự chữ, ``?`` khớp một ký tự chữ.
+
+    Mẫu được khớp theo ranh giới từ, giống danh sách từ cấm thường.
+
+    Args:
+        pattern: Mẫu wildcard, ví dụ ``f*ck``.
+
+    Returns:
+        Mã nguồn regex tương ứng.
+    """
+    parts = []
+    for char in pattern:
+        if char == "*":
+            if not parts or parts[-1] != r"\w*":
+                parts.append(r"\w*")
+        elif char == "?":
+            parts.append(r"\w")
+        else:
+            parts.append(re.escape(char))
+    return rf"\b{''.join(parts)}\b"
+
+
+def compile_rule(kind: str, pattern: str, normalize: Optional[Callable[[str], str]] = None) -> str:
+    """Kiểm tra một mẫu và trả về mã nguồn regex để đánh giá.
+
+    Phần chữ của mẫu wildcard được đưa qua ``normalize`` (``TextNormalizer.normalize_entry`` của guild)
+    để khớp được với văn bản đã chuẩn hóa: ``D1T*`` thành ``dit*``, ``Địt*`` thành ``địt*`` (giữ dấu).
+    Regex được giữ nguyên vì chạy trên nội dung gốc.
+
+    Args:
+        kind: ``wildcard`` hoặc ``regex``.
+        pattern: Mẫu do admin nhập.
+        normalize: Hàm chuẩn hóa từ cấm; None để chỉ chuyển chữ thường.
+
+    Returns:
+        Mã nguồn regex.
+
+    Raises:
+        ValueError: Nếu loại luật không hợp lệ, mẫu rỗng/quá dài hoặc regex sai cú pháp.
+    """
+    if kind not in RULE_KINDS:
+        raise ValueError(f"Loại luật phải là một trong: {', '.join(RULE_KINDS)}")
+    pattern = pattern.strip()
+    if not pattern:
+        raise ValueError("Mẫu không được để trống")
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        raise ValueError(f"Mẫu quá dài (tối đa {MAX_PATTERN_LENGTH} ký tự)")
+    if kind == "wildcard":
+        literal = pattern.lower()
+        if normalize is not None:
+            literal = re.sub(r"[^*?]+", lambda m: normalize(m.group()), literal)
+        if not literal.replace("*", "").replace("?", "").strip():
+            raise ValueError("Mẫu wildcard phải chứa ít nhất một ký tự thường")
+        source = wildcard_to_regex(literal)
+    else:
+        source = pattern
+    try:
+        compiled = re.compile(source, re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Regex không hợp lệ: {e}") from e
+    if compiled.search(""):
+        raise ValueError("Mẫu khớp với chuỗi rỗng, sẽ chặn mọi tin nhắn")
+    return source
+
+
+@lru_cache(maxsize=1024)
+def _compiled(source: str) -> "re.Pattern[str]":
+    """Regex đã biên dịch, lưu đệm trong tiến trình worker."""
+    return re.compile(source, re.IGNORECASE)
+
+
+def evaluate_rules(
+    rules: Sequence[Tuple[int, str, bool]], text: str, raw_text: str = ""
+) -> Tuple[List[int], List[Tuple[int, float]]]:
+    """Đánh giá các luật trên văn bản (chạy trong tiến trình worker).
+
+    Args:
+        rules: Các bộ (id luật, mã nguồn regex, khớp trên nội dung gốc hay không).
+        text: Văn bản đã chuẩn hóa.
+        raw_text: Nội dung gốc viết thường (cho luật regex).
+
+    Returns:
+        (id các luật khớp, các cặp (id luật chậm, thời gian chạy)).
+    """
+    matched = []
+    slow = []
+    for rule_id, source, on_raw in rules:
+        start = time.perf_counter()
+        if _compiled(source).search(raw_text if on_raw else text):
+            matched.append(rule_id)
+        elapsed = time.perf_counter() - start
+        if elapsed > SLOW_RULE_SECONDS:
+            slow.append((rule_id, elapsed))
+    return matched, slow
+
+
+def _report_pid(pids: "multiprocessing.SimpleQueue[int]") -> None:
+    """Khởi tạo worker: báo PID của tiến trình để có thể dừng worker khi bị kẹt."""
+    pids.put(os.getpid())
+
+
+class RuleEvaluator:
+    """Đánh giá luật regex/wildcard trong một process pool riêng, có giới hạn thời gian.
+
+    Regex do admin nhập có thể backtracking thảm họa; chạy trong event loop sẽ treo cả bot.
+    Mỗi tin nhắn được đánh giá trong worker với ngân sách ``budget`` giây. Nếu quá hạn, pool
+    được bỏ và tạo lại, sau đó từng luật được chạy riêng để tìm ra luật gây chậm; mỗi lần chạy
+    riêng xếp hàng như một tin nhắn nên không chặn việc đánh giá của các guild khác.
+    Số lần đánh giá chạy đồng thời bằng số worker, nên thời gian chờ trong hàng đợi của pool
+    không bị tính nhầm vào ngân sách của luật.
+    """
+
+    def __init__(self, budget: float = RULE_TIME_BUDGET, workers: int = 1) -> None:
+        """Khởi tạo bộ đánh giá; pool chỉ được tạo ở lần dùng đầu tiên.
+
+        Args:
+            budget: Ngân sách thời gian cho mỗi tin nhắn (giây).
+            workers: Số tiến trình worker.
+        """
+        self.budget = budget
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(workers)
+        self._waiting = 0
+        # ID các luật đang được chạy riêng để tìm luật gây chậm
+        self._investigating: Set[int] = set()
+        self.skipped = 0
+
+    async def _get_pool(self) -> ProcessPoolExecutor:
+        """Pool hiện tại; tạo mới và chờ worker khởi động xong nếu chưa có.
+
+        Thời gian khởi động worker không được tính vào ngân sách của luật.
+        """
+        if self._pool is None:
+            # "spawn" tránh fork một tiến trình đang chạy nhiều luồng (discord.py, SQLite)
+            context = multiprocessing.get_context("spawn")
+            self._worker_pids = context.SimpleQueue()
+            pool = ProcessPoolExecutor(
+                self.workers, mp_context=context, initializer=_report_pid, initargs=(self._worker_pids,)
+            )
+            await asyncio.get_running_loop().run_in_executor(pool, evaluate_rules, (), "")
+            self._pool = pool
+        return self._pool
+
+    def _reset_pool(self) -> None:
+        """Bỏ pool hiện tại và dừng hẳn các worker (có thể đang kẹt trong regex); lần dùng sau tạo pool mới."""
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        pool.shutdown(wait=False, cancel_futures=True)
+        # ProcessPoolExecutor không hủy được tác vụ đang chạy: worker kẹt sẽ chạy mãi và làm bot treo
+        # khi thoát (pool chờ worker kết thúc), nên dừng các tiến trình con có PID do worker báo về
+        pids = set()
+        while not self._worker_pids.empty():
+            pids.add(self._worker_pids.get())
+        for process in multiprocessing.active_children():
+            if process.pid in pids:
+                process.terminate()
+
+    def close(self) -> None:
+        """Đóng pool."""
+        self._reset_pool()
+
+    async def _run(
+        self, rules: Sequence[Tuple[int, str, bool]], text: str, raw_text: str = ""
+    ) -> Tuple[List[int], List[Tuple[int, float]]]:
+        """Chạy ``evaluate_rules`` trong pool với ngân sách thời gian.
+
+        Raises:
+            asyncio.TimeoutError: Nếu quá ngân sách (pool đã được tạo lại).
+        """
+        pool = await self._get_pool()
+        future = asyncio.get_running_loop().run_in_executor(pool, evaluate_rules, rules, text, raw_text)
+        try:
+            return await asyncio.wait_for(future, self.budget)
+        except asyncio.TimeoutError:
+            self._reset_pool()
+            raise
+
+    async def validate(self, source: str) -> None:
+        """Thử một luật mới với các chuỗi dễ gây backtracking.
+
+        Args:
+            source: Mã nguồn regex của luật.
+
+        Raises:
+            ValueError: Nếu luật chạy quá ngân sách hoặc quá chậm trên chuỗi thử.
+        """
+        # Lặp lại từng ký tự xuất hiện trong mẫu rồi kết thúc bằng ký tự không khớp,
+        # kiểu chuỗi làm (x+x+)+y hay (a+)+$ phải thử mọi cách chia
+        chars = sorted({char for char in source if char.isalnum()} | {"a"})[:20]
+        samples = [char * VALIDATION_LENGTH + "!" for char in chars] + list(VALIDATION_SAMPLES)
+        async with self._slots:
+            for sample in samples:
+                try:
+                    _, slow = await self._run([(0, source, False)], sample)
+                except asyncio.TimeoutError:
+                    raise ValueError("Mẫu chạy quá lâu (có thể gây backtracking), hãy viết lại đơn giản hơn")
+                if slow:
+                    raise ValueError(f"Mẫu chạy quá chậm ({slow[0][1] * 1000:.0f} ms trên chuỗi thử)")
+
+    async def evaluate(self, rules: Sequence[PatternRule], text: str, raw_text: str = "") -> RuleResult:
+        """Đánh giá các luật đang bật: wildcard trên văn bản đã chuẩn hóa, regex trên nội dung gốc.
+
+        Args:
+            rules: Các luật của guild.
+            text: Văn bản đã chuẩn hóa.
+            raw_text: Nội dung gốc viết thường.
+
+        Returns:
+            Các luật khớp và các luật chạy chậm/quá thời gian (cần tắt).
+        """
+        result = RuleResult()
+        active = {rule.id: rule for rule in rules if rule.enabled}
+        if not active or not (text or raw_text):
+            return result
+        if self._waiting >= MAX_PENDING_EVALUATIONS:
+            self.skipped += 1
+            return result
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            payload = [(rule.id, rule.source, rule.on_raw) for rule in active.values()]
+            matched, slow = await self._run(payload, text, raw_text)
+        except asyncio.TimeoutError:
+            timed_out = True
+        except BrokenProcessPool:
+            # Pool bị tạo lại trong lúc tin nhắn này đang chạy; bỏ qua tin nhắn này
+            self._reset_pool()
+            return result
+        else:
+            timed_out = False
+        finally:
+            self._slots.release()
+        if timed_out:
+            # Đã trả lượt chạy: mỗi luật được chạy riêng xếp hàng cùng tin nhắn của các guild khác
+            suspects = [rule for rule in active.values() if rule.id not in self._investigating]
+            if suspects:
+                logger.warning(f"⚠️ Đánh giá luật quá {self.budget}s, đang tìm luật gây chậm")
+                result.slow = await self._find_culprits(suspects, text, raw_text)
+            return result
+        result.matched = [active[rule_id] for rule_id in matched]
+        result.slow = [(active[rule_id], f"chạy {elapsed * 1000:.0f} ms") for rule_id, elapsed in slow]
+        return result
+
+    async def _find_culprits(
+        self, rules: List[PatternRule], text: str, raw_text: str = ""
+    ) -> List[Tuple[PatternRule, str]]:
+        """Chạy riêng từng luật để tìm luật làm đánh giá quá thời gian.
+
+        Mỗi luật giữ một lượt chạy trong lúc chạy riêng rồi trả lại ngay, nên các guild khác chỉ
+        phải chờ tối đa một ngân sách thay vì cả lượt tìm.
+        """
+        culprits = []
+        self._investigating.update(rule.id for rule in rules)
+        try:
+            for rule in rules:
+                async with self._slots:
+                    try:
+                        _, slow = await self._run([(rule.id, rule.source, rule.on_raw)], text, raw_text)
+                    except asyncio.TimeoutError:
+                        culprits.append((rule, f"quá {self.budget}s"))
+                        continue
+                    except BrokenProcessPool:
+                        self._reset_pool()
+                        continue
+                if slow:
+                    culprits.append((rule, f"chạy {slow[0][1] * 1000:.0f} ms"))
+        finally:
+            self._investigating.difference_update(rule.id for rule in rules)
+        return culprits
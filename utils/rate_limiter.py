@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Tốc độ (token/giây) ban đầu, thấp nhất và cao nhất
+INITIAL_RATE = 1.0
+MIN_RATE = 0.05
+MAX_RATE = 2.0
+# Số token tối đa tích lũy (cho phép dồn vài yêu cầu khi rảnh)
+BURST = 2.0
+# AIMD: mỗi lần thành công tăng thêm, mỗi lần bị giới hạn nhân với hệ số
+RATE_INCREASE = 0.05
+RATE_DECREASE = 0.5
+# Số lần bị giới hạn liên tiếp để ngắt mạch, thời gian ngắt ban đầu và tối đa (giây)
+FAILURE_THRESHOLD = 3
+OPEN_COOLDOWN = 30.0
+MAX_OPEN_COOLDOWN = 300.0
+# Số yêu cầu chờ tối đa và thời gian chờ tối đa cho một yêu cầu (giây)
+MAX_WAITERS = 20
+MAX_WAIT = 30.0
+
+
+class RateLimitedError(Exception):
+    """Không thể gửi yêu cầu lúc này (mạch đang ngắt hoặc hàng đợi quá dài)."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdaptiveRateLimiter:
+    """Token bucket dùng chung cho một dịch vụ, tự điều chỉnh tốc độ theo kiểu AIMD.
+
+    - Yêu cầu chờ token theo thứ tự đến (FIFO, nhờ ``asyncio.Lock``), nên nhiều người dùng
+      cùng lúc chia nhau một ngân sách thay vì mỗi người tự thử lại.
+    - Mỗi lần thành công tốc độ tăng thêm ``increase``; mỗi lần bị dịch vụ giới hạn (403,
+      ratelimit) tốc độ giảm một nửa và token hiện có bị bỏ.
+    - Bị giới hạn ``failure_threshold`` lần liên tiếp thì ngắt mạch: mọi yêu cầu bị từ chối
+      ngay trong ``cooldown`` giây. Hết thời gian, một yêu cầu thử được đi qua (half-open);
+      thành công thì đóng mạch, thất bại thì ngắt lại với thời gian gấp đôi.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = INITIAL_RATE,
+        min_rate: float = MIN_RATE,
+        max_rate: float = MAX_RATE,
+        burst: float = BURST,
+        increase: float = RATE_INCREASE,
+        decrease: float = RATE_DECREASE,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown: float = OPEN_COOLDOWN,
+        max_cooldown: float = MAX_OPEN_COOLDOWN,
+        max_waiters: int = MAX_WAITERS,
+        max_wait: float = MAX_WAIT,
+    ) -> None:
+        """Khởi tạo bộ giới hạn.
+
+        Args:
+            name: Tên dịch vụ (dùng trong log).
+            rate: Tốc độ ban đầu (token/giây).
+            min_rate: Tốc độ thấp nhất.
+            max_rate: Tốc độ cao nhất.
+            burst: Số token tích lũy tối đa.
+            increase: Mức tăng tốc độ sau mỗi lần thành công.
+            decrease: Hệ số nhân tốc độ khi bị giới hạn.
+            failure_threshold: Số lần bị giới hạn liên tiếp để ngắt mạch.
+            cooldown: Thời gian ngắt mạch ban đầu (giây).
+            max_cooldown: Thời gian ngắt mạch tối đa (giây).
+            max_waiters: Số yêu cầu chờ tối đa.
+            max_wait: Thời gian chờ token tối đa của một yêu cầu (giây).
+        """
+        self.name = name
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_waiters = max_waiters
+        self.max_wait = max_wait
+
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._waiters = 0
+        self._failures = 0
+        self._cooldown = cooldown
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+        self.granted = 0
+        self.rejected = 0
+        self.rate_limited = 0
+
+    @property
+    def state(self) -> str:
+        """Trạng thái mạch: ``closed``, ``open`` hoặc ``half_open``."""
+        if self._failures < self.failure_threshold:
+            return "closed"
+        return "open" if time.monotonic() < self._open_until else "half_open"
+
+    @property
+    def waiters(self) -> int:
+        """Số yêu cầu đang chờ token."""
+        return self._waiters
+
+    def has_capacity(self) -> bool:
+        """Có thể lấy token ngay mà không làm ai phải chờ (dùng cho tác vụ nền không gấp)."""
+        if self.state != "closed" or self._waiters or self._lock.locked():
+            return False
+        self._refill(time.monotonic())
+        return self._tokens >= 1
+
+    def _refill(self, now: float) -> None:
+        """Cộng token theo thời gian đã trôi qua."""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reject(self, message: str, retry_after: float) -> RateLimitedError:
+        """Ghi nhận một lần từ chối và tạo lỗi tương ứng."""
+        self.rejected += 1
+        return RateLimitedError(message, max(retry_after, 1.0))
+
+    def _check_circuit(self) -> bool:
+        """Từ chối ngay nếu mạch đang ngắt hoặc đang có yêu cầu thử ở trạng thái half-open.
+
+        Returns:
+            True nếu yêu cầu này được chọn làm yêu cầu thử (half-open).
+        """
+        state = self.state
+        if state == "open":
+            raise self._reject(f"{self.name} đang tạm ngắt do bị giới hạn truy cập", self._open_until - time.monotonic())
+        if state == "half_open":
+            if self._trial_in_flight:
+                raise self._reject(f"{self.name} đang được thử lại", self._cooldown / 4)
+            self._trial_in_flight = True
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """Chờ tới lượt (FIFO) và lấy một token.
+
+        Raises:
+            RateLimitedError: Nếu mạch đang ngắt, hàng đợi đầy hoặc phải chờ quá ``max_wait``.
+        """
+        if self._waiters >= self.max_waiters:
+            raise self._reject(f"Có quá nhiều yêu cầu {self.name} đang chờ", self._waiters / self.rate)
+        trial = self._check_circuit()
+
+        self._waiters += 1
+        try:
+            async with self._lock:
+                # Mạch có thể đã ngắt trong lúc chờ tới lượt
+                if self.state == "open":
+                    self._check_circuit()
+                self._refill(time.monotonic())
+                if self._tokens < 1:
+                    wait = (1 - self._tokens) / self.rate
+                    if wait > self.max_wait:
+                        raise self._reject(f"{self.name} đang chậm, vui lòng thử lại sau", wait)
+                    await asyncio.sleep(wait)
+                    self._refill(time.monotonic())
+                self._tokens -= 1
+                self.granted += 1
+        except BaseException:
+            # Bị từ chối hoặc hủy khi đang chờ: trả lại lượt thử cho yêu cầu khác
+            if trial:
+                self._trial_in_flight = False
+            raise
+        finally:
+            self._waiters -= 1
+
+    def record_success(self) -> None:
+        """Yêu cầu thành công: tăng tốc độ (cộng) và đóng mạch nếu đang thử lại."""
+        if self._failures >= self.failure_threshold:
+            logger.info(f"✅ {self.name} hoạt động lại, đóng mạch")
+        self._failures = 0
+        self._cooldown = self.base_cooldown
+        self._trial_in_flight = False
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_rate_limited(self) -> None:
+        """Bị dịch vụ giới hạn: giảm tốc độ (nhân), ngắt mạch nếu bị liên tiếp nhiều lần."""
+        self.rate_limited += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        was_trial = self._trial_in_flight
+        self._trial_in_flight = False
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            if was_trial:
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+            self._open_until = time.monotonic() + self._cooldown
+            logger.warning(f"⚠️ {self.name} bị giới hạn liên tiếp, ngắt mạch {self._cooldown:.0f}s")
+
+    def record_error(self) -> None:
+        """Lỗi khác (mạng, không tìm thấy...): không đổi tốc độ, chỉ giải phóng lượt thử."""
+        self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Số liệu của bộ giới hạn."""
+        return {
+            "state": self.state,
+            "rate": round(self.rate, 3),
+            "waiters": self._waiters,
+            "granted": self.granted,
+            "rejected": self.rejected,
+            "rate_limited": self.rate_limited,
+        }
@@ -0,0 +1,172 @@
+import re
+import time
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+# Ký tự vô hình thường dùng để né bộ lọc (zero-width, soft hyphen, BOM, ...)
+ZERO_WIDTH_CHARS = (
+    "\u00ad\u034f\u061c\u115f\u1160\u17b4\u17b5\u180e"
+    "\u200b\u200c\u200d\u200e\u200f\u2060\u2061\u2062\u2063\u2064\ufeff"
+)
+
+# Các khối Unicode chứa dấu kết hợp (dấu thanh, dấu mũ tiếng Việt sau NFKD, ...)
+_COMBINING_RANGES = ((0x0300, 0x0370), (0x1AB0, 0x1B00), (0x1DC0, 0x1E00), (0x20D0, 0x2100), (0xFE20, 0xFE30))
+
+# Ký tự trông giống chữ Latin (Cyrillic, Hy Lạp, ...) -> chữ Latin tương ứng
+HOMOGLYPHS = {
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p",
+    "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ј": "j", "ѕ": "s", "ԁ": "d", "ԛ": "q",
+    "ԝ": "w", "α": "a", "β": "b", "ε": "e", "ι": "i", "κ": "k", "ν": "v", "ο": "o", "ρ": "p",
+    "τ": "t", "υ": "u", "χ": "x", "ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "ł": "l", "đ": "d",
+    "ð": "d", "ı": "i",
+}
+
+# Chữ số/ký hiệu leetspeak -> chữ cái
+LEET = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "@": "a", "$": "s", "!": "i", "|": "l"}
+
+# Ngăn cách dạng bỏ dấu và dạng giữ dấu trong văn bản quét (``scan_form``); ký tự này bị xóa khỏi
+# tin nhắn ở bước ``zero_width`` nên người dùng không gõ được và từ cấm không thể vắt qua nó
+FORM_SEPARATOR = "\x00"
+
+_ZERO_WIDTH_TABLE = str.maketrans(dict.fromkeys(ZERO_WIDTH_CHARS + FORM_SEPARATOR))
+_FOLD_TABLE = str.maketrans(
+    {
+        **{
+            chr(code): None
+            for start, stop in _COMBINING_RANGES
+            for code in range(start, stop)
+            if unicodedata.combining(chr(code))
+        },
+        **HOMOGLYPHS,
+    }
+)
+# Dạng giữ dấu: chỉ đổi ký tự giống chữ Latin; "đ" là chữ riêng của tiếng Việt nên được giữ
+_TONED_TABLE = str.maketrans({char: latin for char, latin in HOMOGLYPHS.items() if char != "đ"})
+_LEET_TABLE = str.maketrans(LEET)
+
+# Hậu tố của số thứ tự và đơn vị hay gặp ("3rd", "1st", "8h", "5p", "10k", "2tr"): cả từ được giữ nguyên
+NUMBER_SUFFIXES = ("st", "nd", "rd", "th", "h", "p", "s", "k", "m", "tr", "d", "g", "x", "km", "kg", "gb", "mb", "fps")
+
+# Một chuỗi ký tự leet được đổi khi nằm ngay trước một chữ cái, hoặc (với chữ số) ngay sau một chữ cái.
+# Nhờ vậy "sh1t", "$hit", "shi7" được đổi nhưng "2024", "3rd" hay dấu "!" cuối câu thì không.
+_LEET_PATTERN = re.compile(
+    rf"(?P<number>(?<![^\W_])\d+(?:{'|'.join(NUMBER_SUFFIXES)})(?![^\W_]))"
+    r"|[0134578@$!|]+(?=[^\W\d_])|(?<=[^\W\d_])[0134578]+"
+)
+# Ký tự đơn lẻ bị tách rời: chữ Latin không dấu, chữ giống Latin hoặc ký tự leet. Được nối khi có
+# ít nhất ba ký tự cách nhau bởi dấu phân cách không phải khoảng trắng ("s.h.i.t", "s-h-1-t") hoặc
+# ít nhất bốn ký tự chỉ cách nhau bởi khoảng trắng ("s h i t"). Bước này chạy trên văn bản NFKD,
+# trước khi bỏ dấu, nên chữ có dấu (theo sau là dấu kết hợp) không được tính: các từ một chữ tiếng
+# Việt như "ừ ở à ạ" không bị nối thành từ không ai gõ.
+_COMBINING = r"\u0300-\u036f"
+_LETTER = (
+    rf"[a-z{''.join(HOMOGLYPHS)}0134578@$|]"
+    rf"(?<![^\W_].)(?<![{_COMBINING}].)(?![^\W_]|[{_COMBINING}])"
+)
+_SPACED_LETTERS_PATTERN = re.compile(
+    rf"{_LETTER}(?:\s*[.\-_*/~+]+\s*{_LETTER}){{2,}}|{_LETTER}(?:\s+{_LETTER}){{3,}}"
+)
+_SEPARATORS_PATTERN = re.compile(r"[\s.\-_*/~+]+")
+
+STAGES = ("zero_width", "nfkd", "separators", "fold", "leet")
+
+
+def has_diacritics(word: str) -> bool:
+    """Từ có dấu tiếng Việt (dấu thanh, dấu mũ, "đ"...) hay không."""
+    return "đ" in word.lower() or any(unicodedata.combining(char) for char in unicodedata.normalize("NFKD", word))
+
+
+def _decode_leet(text: str) -> str:
+    """Đổi leetspeak trong từ, giữ nguyên số thứ tự/đơn vị."""
+    return _LEET_PATTERN.sub(lambda m: m.group() if m.group("number") else m.group().translate(_LEET_TABLE), text)
+
+
+class TextNormalizer:
+    """Chuẩn hóa tin nhắn về dạng chuẩn trước khi quét từ cấm.
+
+    Các bước (theo thứ tự):
+        1. ``zero_width``: xóa ký tự vô hình.
+        2. ``nfkd``: chuẩn hóa Unicode NFKD và chuyển chữ thường (chữ full-width, ký tự kiểu toán học, ...).
+        3. ``separators``: nối các ký tự bị tách rời ("s h i t", "s.h.1.t" -> "shit"), trừ chữ có dấu.
+        4. ``fold``: bỏ dấu tiếng Việt/dấu kết hợp và đổi ký tự giống chữ Latin.
+        5. ``leet``: đổi leetspeak trong từ ("sh1t" -> "shit"), trừ số thứ tự/đơn vị ("3rd", "8h").
+
+    Bỏ dấu làm nhiều từ tiếng Việt khác nhau trùng nhau ("lợn", "lớn", "lon" đều thành "lon"), nên
+    ngoài dạng bỏ dấu (``normalize``) còn có dạng giữ dấu (``normalize_toned``): bước ``fold`` chỉ
+    đổi ký tự giống chữ Latin rồi ghép lại dấu (NFC). Từ cấm viết có dấu được so với dạng giữ dấu,
+    từ viết không dấu (và các cách viết lách như "dit", "vcl") được so với dạng bỏ dấu
+    (``normalize_entry``); tin nhắn được quét trên cả hai dạng cùng lúc (``scan_form``).
+
+    Thời gian mỗi bước (micro giây) được cộng dồn để theo dõi chi phí.
+    """
+
+    def __init__(self) -> None:
+        """Khởi tạo bộ chuẩn hóa với bộ đếm thời gian rỗng."""
+        self.calls = 0
+        self.stage_ns: Dict[str, int] = dict.fromkeys(STAGES, 0)
+
+    def _run(
+        self, text: str, timings: Optional[Dict[str, float]], folded: bool, toned: bool
+    ) -> Tuple[str, str]:
+        """Chạy các bước chuẩn hóa, trả về (dạng bỏ dấu, dạng giữ dấu); dạng không cần trả về rỗng."""
+        clock = time.perf_counter_ns
+        t0 = clock()
+        text = text.translate(_ZERO_WIDTH_TABLE)
+        t1 = clock()
+        text = unicodedata.normalize("NFKD", text).lower()
+        t2 = clock()
+        text = _SPACED_LETTERS_PATTERN.sub(lambda m: _SEPARATORS_PATTERN.sub("", m.group()), text)
+        t3 = clock()
+        folded_text = text.translate(_FOLD_TABLE) if folded else ""
+        toned_text = unicodedata.normalize("NFC", text.translate(_TONED_TABLE)) if toned else ""
+        t4 = clock()
+        folded_text = _decode_leet(folded_text)
+        toned_text = _decode_leet(toned_text)
+        t5 = clock()
+
+        durations = (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4)
+        self.calls += 1
+        for stage, ns in zip(STAGES, durations):
+            self.stage_ns[stage] += ns
+        if timings is not None:
+            timings.update({stage: ns / 1000 for stage, ns in zip(STAGES, durations)})
+        return folded_text, toned_text
+
+    def normalize(self, text: str, timings: Optional[Dict[str, float]] = None) -> str:
+        """Chuẩn hóa văn bản về dạng bỏ dấu.
+
+        Args:
+            text: Văn bản gốc.
+            timings: Nếu truyền vào, được điền thời gian từng bước của lần gọi này (µs).
+
+        Returns:
+            Văn bản đã chuẩn hóa.
+        """
+        return self._run(text, timings, folded=True, toned=False)[0]
+
+    def normalize_toned(self, text: str) -> str:
+        """Chuẩn hóa văn bản nhưng giữ dấu tiếng Việt ("Lợn" -> "lợn", "l.ợ.n" không được nối)."""
+        return self._run(text, None, folded=False, toned=True)[1]
+
+    def normalize_entry(self, word: str) -> str:
+        """Dạng chuẩn của một từ cấm: giữ dấu nếu từ được viết có dấu, ngược lại bỏ dấu."""
+        return self.normalize_toned(word) if has_diacritics(word) else self.normalize(word)
+
+    def scan_form(self, text: str, timings: Optional[Dict[str, float]] = None) -> str:
+        """Văn bản để quét từ cấm: dạng bỏ dấu và dạng giữ dấu, ngăn cách bởi ``FORM_SEPARATOR``.
+
+        Args:
+            text: Văn bản gốc.
+            timings: Nếu truyền vào, được điền thời gian từng bước của lần gọi này (µs).
+
+        Returns:
+            ``<dạng bỏ dấu>\\x00<dạng giữ dấu>``.
+        """
+        folded_text, toned_text = self._run(text, timings, folded=True, toned=True)
+        return f"{folded_text}{FORM_SEPARATOR}{toned_text}"
+
+    def average_timings(self) -> Dict[str, float]:
+        """Thời gian trung bình mỗi bước (µs) trên mọi lần chuẩn hóa."""
+        if not self.calls:
+            return dict.fromkeys(STAGES, 0.0)
+        return {stage: ns / self.calls / 1000 for stage, ns in self.stage_ns.items()}
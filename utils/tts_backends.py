@@ -0,0 +1,261 @@
+import asyncio
+import importlib.util
+import io
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+import gtts
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Định tuyến theo ngôn ngữ, ví dụ "vi=local,en=local,*=gtts" ("*" là mặc định)
+TTS_BACKENDS = os.getenv("TTS_BACKENDS", "*=gtts")
+# Mô hình Piper theo ngôn ngữ, ví dụ "vi=models/vi_VN-vais1000-medium.onnx"; ngôn ngữ không có
+# mô hình dùng espeak-ng
+PIPER_VOICES = os.getenv("PIPER_VOICES", "")
+# Số tiến trình tổng hợp cục bộ và thời gian tối đa cho một câu (giây)
+LOCAL_TTS_WORKERS = int(os.getenv("LOCAL_TTS_WORKERS", "2"))
+LOCAL_TTS_TIMEOUT = 30.0
+ESPEAK_EXECUTABLE = shutil.which("espeak-ng") or shutil.which("espeak")
+PIPER_INSTALLED = importlib.util.find_spec("piper") is not None
+
+
+def parse_mapping(value: str) -> Dict[str, str]:
+    """Đọc cấu hình dạng ``khóa=giá trị,khóa=giá trị``."""
+    mapping = {}
+    for item in value.split(","):
+        key, sep, target = item.partition("=")
+        if sep and key.strip() and target.strip():
+            mapping[key.strip()] = target.strip()
+    return mapping
+
+
+class TTSBackend:
+    """Giao diện chung của một engine TTS: nhận văn bản, trả về âm thanh (FFmpeg đọc được)."""
+
+    # Tên dùng trong cấu hình định tuyến và số liệu
+    name = ""
+    # Phần mở rộng của âm thanh trả về
+    extension = ""
+
+    def available(self, lang: str) -> bool:
+        """Engine có dùng được cho ngôn ngữ này không."""
+        return True
+
+    async def synthesize(self, text: str, lang: str) -> bytes:
+        """Tổng hợp giọng nói.
+
+        Args:
+            text: Văn bản.
+            lang: Mã ngôn ngữ.
+
+        Returns:
+            Âm thanh đã mã hóa (MP3, WAV...).
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Giải phóng tài nguyên."""
+
+
+class GTTSBackend(TTSBackend):
+    """Google TTS qua gTTS (cần mạng); chạy trong executor để không chặn event loop."""
+
+    name = "gtts"
+    extension = "mp3"
+
+    async def synthesize(self, text: str, lang: str) -> bytes:
+        tts = gtts.gTTS(text, lang=lang, lang_check=False)
+        buffer = io.BytesIO()
+        await asyncio.get_running_loop().run_in_executor(None, tts.write_to_fp, buffer)
+        return buffer.getvalue()
+
+
+# Trạng thái riêng của mỗi tiến trình worker: đường dẫn và mô hình Piper đã nạp
+_voice_paths: Dict[str, str] = {}
+_voices: Dict[str, Any] = {}
+
+
+def _init_worker(voice_paths: Dict[str, str]) -> None:
+    """Khởi tạo worker: nạp mọi mô hình Piper một lần cho cả vòng đời tiến trình."""
+    _voice_paths.update(voice_paths)
+    for lang in voice_paths:
+        try:
+            _load_voice(lang)
+        except Exception as e:
+            logger.error(f"❌ Không thể nạp mô hình Piper cho '{lang}': {e}")
+
+
+def _load_voice(lang: str) -> Any:
+    """Mô hình Piper của ngôn ngữ (nạp ở lần đầu, dùng lại ở các lần sau)."""
+    voice = _voices.get(lang)
+    if voice is None:
+        # Phụ thuộc tùy chọn: chỉ cần khi có cấu hình PIPER_VOICES
+        from piper import PiperVoice
+
+        voice = _voices[lang] = PiperVoice.load(_voice_paths[lang])
+    return voice
+
+
+def synthesize_local(text: str, lang: str) -> bytes:
+    """Tổng hợp giọng nói bằng Piper (nếu có mô hình) hoặc espeak-ng (chạy trong worker).
+
+    Args:
+        text: Văn bản.
+        lang: Mã ngôn ngữ.
+
+    Returns:
+        Âm thanh WAV.
+    """
+    if lang in _voice_paths:
+        voice = _load_voice(lang)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            # piper-tts >= 1.3 đổi tên synthesize thành synthesize_wav
+            if hasattr(voice, "synthesize_wav"):
+                voice.synthesize_wav(text, wav)
+            else:
+                voice.synthesize(text, wav)
+        return buffer.getvalue()
+
+    if not ESPEAK_EXECUTABLE:
+        raise RuntimeError(f"Không có mô hình Piper cho '{lang}' và không tìm thấy espeak-ng")
+    # "--" để văn bản bắt đầu bằng "-" (ví dụ "-f.env", "-w/tệp") không bị hiểu là tùy chọn
+    result = subprocess.run(
+        [ESPEAK_EXECUTABLE, "-v", lang.lower(), "--stdout", "--", text],
+        capture_output=True,
+        check=True,
+        timeout=LOCAL_TTS_TIMEOUT,
+    )
+    return result.stdout
+
+
+class LocalTTSBackend(TTSBackend):
+    """Engine TTS ngoại tuyến (Piper hoặc espeak-ng) chạy trong process pool riêng.
+
+    Mô hình Piper nặng và tổng hợp tốn CPU, nên chạy trong các tiến trình worker: mỗi worker
+    nạp mô hình một lần lúc khởi động rồi dùng lại cho mọi câu, và event loop của bot không bị
+    chặn. Pool chỉ được tạo ở lần dùng đầu tiên.
+    """
+
+    name = "local"
+    extension = "wav"
+
+    def __init__(self, voices: Optional[Dict[str, str]] = None, workers: int = LOCAL_TTS_WORKERS) -> None:
+        """Khởi tạo engine.
+
+        Args:
+            voices: Mô hình Piper theo ngôn ngữ (mặc định đọc từ ``PIPER_VOICES``).
+            workers: Số tiến trình worker.
+        """
+        self.voices = parse_mapping(PIPER_VOICES) if voices is None else voices
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def available(self, lang: str) -> bool:
+        path = self.voices.get(lang)
+        if path is not None:
+            # Mô hình khai báo nhưng thiếu file hoặc thiếu piper-tts: không thử rồi lỗi ở mỗi yêu cầu
+            return PIPER_INSTALLED and os.path.isfile(path)
+        return ESPEAK_EXECUTABLE is not None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Pool hiện tại, tạo mới nếu chưa có."""
+        if self._pool is None:
+            # "spawn" tránh fork một tiến trình đang chạy nhiều luồng (discord.py, SQLite)
+            self._pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.voices,),
+            )
+        return self._pool
+
+    async def synthesize(self, text: str, lang: str) -> bytes:
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._get_pool(), synthesize_local, text, lang),
+                LOCAL_TTS_TIMEOUT,
+            )
+        except BrokenProcessPool:
+            # Worker chết (thiếu bộ nhớ, lỗi mô hình...): tạo lại pool ở lần sau
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class TTSRouter:
+    """Chọn engine TTS theo ngôn ngữ, chuyển sang gTTS nếu engine cục bộ lỗi."""
+
+    def __init__(self, routes: Optional[Dict[str, str]] = None, backends: Optional[Dict[str, TTSBackend]] = None) -> None:
+        """Khởi tạo bộ định tuyến.
+
+        Args:
+            routes: Ngôn ngữ -> tên engine, ``*`` là mặc định (mặc định đọc từ ``TTS_BACKENDS``).
+            backends: Các engine theo tên (mặc định gTTS và engine cục bộ).
+        """
+        self.routes = parse_mapping(TTS_BACKENDS) if routes is None else routes
+        self.backends = backends or {backend.name: backend for backend in (GTTSBackend(), LocalTTSBackend())}
+        self.fallback = self.backends.get(GTTSBackend.name)
+        self.requests: Dict[str, int] = {name: 0 for name in self.backends}
+        self.failures: Dict[str, int] = {name: 0 for name in self.backends}
+        for lang, name in self.routes.items():
+            if lang != "*" and self.backend_for(lang).name != name:
+                logger.warning(f"⚠️ Engine TTS '{name}' không dùng được cho '{lang}', dùng gTTS thay thế")
+
+    def backend_for(self, lang: str) -> TTSBackend:
+        """Engine dùng cho ngôn ngữ theo cấu hình (gTTS nếu engine được chọn không dùng được)."""
+        backend = self.backends.get(self.routes.get(lang, self.routes.get("*", GTTSBackend.name)))
+        if backend is None or not backend.available(lang):
+            return self.fallback
+        return backend
+
+    def cache_namespace(self, lang: str, backend: Optional[TTSBackend] = None) -> str:
+        """Phần ngôn ngữ của khóa bộ đệm: mỗi engine có giọng khác nhau nên không dùng chung mục.
+
+        Args:
+            lang: Mã ngôn ngữ.
+            backend: Engine đã tạo âm thanh (mặc định engine được định tuyến cho ngôn ngữ).
+        """
+        backend = backend or self.backend_for(lang)
+        return lang if backend is self.fallback else f"{backend.name}:{lang}"
+
+    async def synthesize(self, text: str, lang: str) -> Tuple[bytes, TTSBackend]:
+        """Tổng hợp bằng engine của ngôn ngữ; nếu engine cục bộ lỗi thì thử lại bằng gTTS.
+
+        Args:
+            text: Văn bản.
+            lang: Mã ngôn ngữ.
+
+        Returns:
+            Âm thanh đã mã hóa và engine thực sự tạo ra nó (để lưu đệm đúng chỗ khi đã chuyển sang gTTS).
+        """
+        backend = self.backend_for(lang)
+        self.requests[backend.name] += 1
+        try:
+            return await backend.synthesize(text, lang), backend
+        except Exception as e:
+            self.failures[backend.name] += 1
+            if backend is self.fallback or self.fallback is None:
+                raise
+            logger.warning(f"⚠️ Engine TTS '{backend.name}' lỗi ({e}), chuyển sang gTTS")
+            self.requests[self.fallback.name] += 1
+            return await self.fallback.synthesize(text, lang), self.fallback
+
+    def close(self) -> None:
+        """Đóng mọi engine."""
+        for backend in self.backends.values():
+            backend.close()
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import logging
+import os
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Thư mục và dung lượng tối đa của bộ đệm (có thể đổi qua .env)
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts_cache")
+TTS_CACHE_MAX_BYTES = int(float(os.getenv("TTS_CACHE_MAX_MB", "200")) * 1024 * 1024)
+# Chỉ lưu đệm câu ngắn; câu dài hiếm khi lặp lại
+TTS_CACHE_MAX_TEXT = 200
+# Tham số mã hóa Opus: 48 kHz stereo là định dạng Discord gửi đi nên phát lại không cần chuyển mã
+OPUS_BITRATE = "64k"
+FFMPEG_ENCODE_ARGS = (
+    "-hide_banner", "-loglevel", "error", "-i", "pipe:0",
+    "-c:a", "libopus", "-b:a", OPUS_BITRATE, "-ar", "48000", "-ac", "2", "-f", "ogg", "pipe:1",
+)
+
+
+def normalize_text(text: str) -> str:
+    """Chuẩn hóa văn bản để các câu chỉ khác hoa/thường hoặc khoảng trắng dùng chung một mục."""
+    return " ".join(unicodedata.normalize("NFC", text).casefold().split())
+
+
+def cache_key(text: str, lang: str) -> str:
+    """Khóa nội dung: sha256 của ngôn ngữ và văn bản đã chuẩn hóa."""
+    return hashlib.sha256(f"{lang}\n{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Bộ đệm âm thanh TTS trên đĩa, lưu sẵn dạng Ogg Opus.
+
+    Mỗi câu được lưu thành ``<sha256>.opus``. Khi trúng, file được phát bằng
+    ``FFmpegOpusAudio(codec="copy")`` nên không cần gọi Google TTS lẫn chuyển mã. Thời gian sửa
+    đổi của file được cập nhật mỗi lần trúng, và khi vượt ``max_bytes`` các file lâu không dùng
+    nhất (mtime cũ nhất) bị xóa trước.
+    """
+
+    def __init__(self, directory: str = TTS_CACHE_DIR, max_bytes: int = TTS_CACHE_MAX_BYTES) -> None:
+        """Khởi tạo bộ đệm và tính dung lượng hiện có.
+
+        Args:
+            directory: Thư mục lưu file.
+            max_bytes: Dung lượng tối đa (byte).
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(size for _, size, _ in self._scan())
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.stored = 0
+        self.evicted = 0
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """Các file trong bộ đệm: (đường dẫn, kích thước, mtime)."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".opus"):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def path(self, key: str) -> str:
+        """Đường dẫn file của một khóa."""
+        return os.path.join(self.directory, f"{key}.opus")
+
+    def cacheable(self, text: str) -> bool:
+        """Câu có đủ ngắn để lưu đệm hay không."""
+        return len(text) <= TTS_CACHE_MAX_TEXT
+
+    def get(self, text: str, lang: str) -> Optional[str]:
+        """Tìm âm thanh đã lưu của câu.
+
+        Args:
+            text: Văn bản.
+            lang: Mã ngôn ngữ.
+
+        Returns:
+            Đường dẫn file Opus nếu trúng, ngược lại None.
+        """
+        if not self.cacheable(text):
+            return None
+        path = self.path(cache_key(text, lang))
+        try:
+            # Cập nhật mtime để LRU biết file vừa được dùng
+            os.utime(path)
+            size = os.path.getsize(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bytes_saved += size
+        return path
+
+    def store_later(self, text: str, lang: str, mp3: bytes) -> None:
+        """Mã hóa và lưu câu ở nền (không làm chậm lần phát hiện tại)."""
+        if not self.cacheable(text):
+            return
+        key = cache_key(text, lang)
+        if key in self._pending:
+            return
+        task = asyncio.create_task(self.store(key, mp3))
+        self._pending[key] = task
+        task.add_done_callback(lambda _: self._pending.pop(key, None))
+
+    async def store(self, key: str, mp3: bytes) -> None:
+        """Chuyển MP3 sang Ogg Opus bằng FFmpeg rồi ghi vào bộ đệm.
+
+        Args:
+            key: Khóa nội dung.
+            mp3: Âm thanh MP3 từ gTTS.
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "ffmpeg", *FFMPEG_ENCODE_ARGS,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            opus, error = await process.communicate(mp3)
+        except OSError as e:
+            logger.error(f"❌ Không thể chạy FFmpeg để lưu đệm TTS: {e}")
+            return
+        if process.returncode != 0 or not opus:
+            logger.error(f"❌ Lỗi khi mã hóa Opus cho bộ đệm TTS: {error.decode(errors='ignore').strip()}")
+            return
+        await asyncio.to_thread(self._write, self.path(key), opus)
+
+    def _write(self, path: str, data: bytes) -> None:
+        """Ghi file (qua file tạm để không bao giờ phát file ghi dở) rồi dọn nếu vượt dung lượng."""
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(data)
+        existing = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(temp, path)
+        self.size += len(data) - existing
+        self.stored += 1
+        if self.size > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Xóa các file có mtime cũ nhất cho tới khi còn dưới 90% dung lượng tối đa."""
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        self.size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for path, size, _ in entries:
+            if self.size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.size -= size
+            self.evicted += 1
+        logger.info(f"🧹 Đã dọn bộ đệm TTS, còn {self.size / (1024 * 1024):.1f} MB")
+
+    def stats(self) -> Dict[str, Any]:
+        """Số liệu của bộ đệm."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "size": self.size,
+            "max_bytes": self.max_bytes,
+            "stored": self.stored,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import re
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Độ dài tối đa của một đoạn gửi đi tổng hợp (ký tự); đoạn dài hơn được tách tiếp ở dấu phẩy/khoảng trắng
+MAX_SEGMENT_CHARS = 200
+# Số đoạn được tổng hợp đồng thời và thời gian tối đa cho một đoạn (giây)
+SYNTH_CONCURRENCY = 3
+SYNTH_TIMEOUT = 20.0
+# Một khung PCM 20 ms (48 kHz, stereo, 16 bit) im lặng
+SILENCE_FRAME = b"\x00" * discord.opus.Encoder.FRAME_SIZE
+# Khoảng nghỉ chèn giữa hai câu (số khung 20 ms)
+SENTENCE_PAUSE_FRAMES = 8
+# Cắt khoảng lặng gTTS thêm ở đầu/cuối mỗi đoạn để các câu nối liền nhau
+TRIM_SILENCE_OPTIONS = (
+    "-vn -af silenceremove=start_periods=1:start_threshold=-50dB:"
+    "stop_periods=-1:stop_duration=0.3:stop_threshold=-50dB"
+)
+
+SENTENCE_END = re.compile(r"(?<=[.!?…。！？])\s+|\n+")
+CLAUSE_END = re.compile(r"(?<=[,;:，；])\s+")
+
+# Hàm mở nguồn PCM của một đoạn đã tổng hợp (mỗi lần gọi khởi động một tiến trình FFmpeg)
+SegmentOpener = Callable[[], discord.AudioSource]
+# Hàm tổng hợp một đoạn văn bản, trả về hàm mở nguồn PCM của đoạn đó
+SegmentSynthesizer = Callable[[str], Awaitable[Optional[SegmentOpener]]]
+# Số đoạn được mở nguồn PCM (tiến trình FFmpeg) trước đoạn đang phát
+OPEN_AHEAD = 1
+
+
+def _pack(parts: List[str], max_chars: int) -> List[str]:
+    """Gộp các phần liên tiếp thành đoạn không vượt ``max_chars`` ký tự."""
+    segments: List[str] = []
+    for part in parts:
+        if segments and len(segments[-1]) + 1 + len(part) <= max_chars:
+            segments[-1] = f"{segments[-1]} {part}"
+        else:
+            segments.append(part)
+    return segments
+
+
+def split_sentences(text: str, max_chars: int = MAX_SEGMENT_CHARS) -> List[str]:
+    """Tách văn bản thành các đoạn theo ranh giới câu.
+
+    Câu dài hơn ``max_chars`` được tách tiếp ở dấu phẩy/chấm phẩy, rồi ở khoảng trắng.
+
+    Args:
+        text: Văn bản cần đọc.
+        max_chars: Độ dài tối đa của một đoạn.
+
+    Returns:
+        Các đoạn theo thứ tự, không rỗng.
+    """
+    segments: List[str] = []
+    for sentence in SENTENCE_END.split(text):
+        sentence = " ".join(sentence.split())
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            segments.append(sentence)
+            continue
+        for clause in _pack(CLAUSE_END.split(sentence), max_chars):
+            if len(clause) <= max_chars:
+                segments.append(clause)
+            else:
+                segments.extend(_pack(clause.split(" "), max_chars))
+    return segments
+
+
+class SentenceChainSource(discord.AudioSource):
+    """Nguồn PCM phát lần lượt âm thanh của các câu như một lời nói liền mạch.
+
+    Các câu được tổng hợp đồng thời (tối đa ``concurrency`` câu một lúc) và phát đúng thứ tự
+    ngay khi câu đó sẵn sàng. Nếu câu kế tiếp chưa xong, nguồn trả về khung im lặng thay vì
+    kết thúc, nên ``VoiceClient`` tiếp tục phát mà không bị ngắt. Câu tổng hợp lỗi bị bỏ qua.
+
+    Âm thanh đã tổng hợp chỉ nằm trong bộ nhớ; nguồn PCM (một tiến trình FFmpeg) của mỗi câu chỉ
+    được mở khi việc phát tới gần câu đó (câu đang phát và ``OPEN_AHEAD`` câu kế tiếp), nên số
+    tiến trình FFmpeg không tăng theo độ dài văn bản.
+    """
+
+    def __init__(self, segments: List[str], synthesize: SegmentSynthesizer, concurrency: int = SYNTH_CONCURRENCY) -> None:
+        """Bắt đầu tổng hợp các câu (cần gọi trong event loop).
+
+        Args:
+            segments: Các đoạn văn bản theo thứ tự.
+            synthesize: Hàm tổng hợp một đoạn, trả về hàm mở nguồn PCM của đoạn đó.
+            concurrency: Số đoạn tổng hợp đồng thời.
+        """
+        self.segments = segments
+        # None: đang tổng hợp; False: lỗi hoặc đã phát xong; còn lại là hàm mở nguồn PCM của câu
+        self._openers: List[object] = [None] * len(segments)
+        # Nguồn PCM đang mở, theo vị trí câu
+        self._sources: Dict[int, discord.AudioSource] = {}
+        self._index = 0
+        self._pause = 0
+        self._closed = False
+        self._first_ready = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._synthesize = synthesize
+        self._loop = asyncio.get_running_loop()
+        self._tasks = [asyncio.create_task(self._produce(i)) for i in range(len(segments))]
+
+    async def _produce(self, index: int) -> None:
+        """Tổng hợp một đoạn và đặt hàm mở nguồn vào đúng vị trí."""
+        opener = None
+        try:
+            async with self._semaphore:
+                opener = await asyncio.wait_for(self._synthesize(self.segments[index]), SYNTH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Tổng hợp câu {index + 1}/{len(self.segments)} quá {SYNTH_TIMEOUT}s, bỏ qua")
+        except Exception as e:
+            logger.error(f"❌ Lỗi khi tổng hợp câu {index + 1}/{len(self.segments)}: {e}")
+        finally:
+            if not self._closed:
+                self._openers[index] = opener if opener is not None else False
+            if index == 0:
+                self._first_ready.set()
+
+    async def wait_first(self) -> bool:
+        """Chờ câu đầu tiên xong.
+
+        Returns:
+            True nếu câu đầu tổng hợp được (có thể bắt đầu phát ngay).
+        """
+        await self._first_ready.wait()
+        return any(opener for opener in self._openers) or not all(task.done() for task in self._tasks)
+
+    def _open(self, index: int) -> Optional[discord.AudioSource]:
+        """Nguồn PCM của câu ``index``, mở nếu câu đã tổng hợp xong mà chưa mở; None nếu chưa có."""
+        source = self._sources.get(index)
+        if source is not None or index >= len(self._openers):
+            return source
+        opener = self._openers[index]
+        if not opener:
+            return None
+        try:
+            source = self._sources[index] = opener()
+        except Exception as e:
+            logger.error(f"❌ Không thể mở âm thanh câu {index + 1}/{len(self.segments)}: {e}")
+            self._openers[index] = False
+        return source
+
+    def read(self) -> bytes:
+        """Khung PCM kế tiếp (gọi từ luồng phát của discord.py)."""
+        while self._index < len(self._openers):
+            if self._openers[self._index] is None:
+                # Câu kế tiếp chưa sẵn sàng: phát im lặng để giữ luồng phát
+                return SILENCE_FRAME
+            source = self._open(self._index)
+            if source is None:
+                self._index += 1
+                continue
+            # Mở trước vài câu kế tiếp để FFmpeg kịp khởi động trước khi tới lượt
+            for ahead in range(1, OPEN_AHEAD + 1):
+                self._open(self._index + ahead)
+            if self._pause:
+                self._pause -= 1
+                return SILENCE_FRAME
+            frame = source.read()
+            if frame:
+                return frame
+            source.cleanup()
+            del self._sources[self._index]
+            self._openers[self._index] = False
+            self._index += 1
+            self._pause = SENTENCE_PAUSE_FRAMES
+        return b""
+
+    def is_opus(self) -> bool:
+        return False
+
+    def _cancel_tasks(self) -> None:
+        """Hủy các câu đang tổng hợp (chạy trong event loop)."""
+        for task in self._tasks:
+            task.cancel()
+
+    def cleanup(self) -> None:
+        """Dừng mọi câu đang tổng hợp và dọn các tiến trình FFmpeg.
+
+        discord.py gọi hàm này từ luồng phát nên việc hủy tác vụ được chuyển về event loop.
+        """
+        self._closed = True
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._cancel_tasks)
+        self._openers = [False] * len(self._openers)
+        for index in list(self._sources):
+            self._sources.pop(index).cleanup()
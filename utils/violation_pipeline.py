@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import discord
+
+# Cấu hình logger
+logger = logging.getLogger(__name__)
+
+# Số vi phạm tối đa chờ trong hàng đợi; vượt quá thì bỏ bớt thay vì chặn gateway
+QUEUE_SIZE = 1000
+# Số tin nhắn tối đa đang chờ xóa cùng lúc
+MAX_PENDING_DELETES = 500
+# Thời gian gom tin nhắn cần xóa trong cùng một kênh (giây)
+DELETE_WINDOW = 1.0
+# Thời gian gom cảnh báo cho cùng một người dùng (giây)
+WARN_WINDOW = 2.0
+# Khoảng cách tối thiểu giữa hai cảnh báo gửi cho cùng một người dùng (giây)
+WARN_COOLDOWN = 30.0
+# Discord chỉ cho xóa tối đa 100 tin nhắn mỗi lần gọi bulk_delete
+BULK_DELETE_LIMIT = 100
+# Bulk delete từ chối cả lô nếu có tin nhắn cũ hơn 14 ngày (chừa vài phút cho độ trễ)
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+
+# (thành viên, các từ vi phạm, các lý do spam, số tin nhắn vi phạm) -> embed cảnh báo
+WarningBuilder = Callable[[discord.abc.User, List[str], List[str], int], discord.Embed]
+
+
+@dataclass
+class _PendingWarning:
+    """Cảnh báo đang được gom cho một người dùng trong một guild."""
+
+    channel: discord.abc.Messageable
+    author: discord.abc.User
+    words: Set[str] = field(default_factory=set)
+    reasons: Set[str] = field(default_factory=set)
+    count: int = 0
+
+
+class ViolationPipeline:
+    """Xử lý vi phạm (từ cấm, spam) bất đồng bộ, tách khỏi trình xử lý sự kiện gateway.
+
+    ``submit`` chỉ đưa vi phạm vào một hàng đợi có giới hạn rồi trả về ngay. Một tác vụ nền
+    lấy vi phạm ra và:
+
+    - gom tin nhắn cần xóa theo kênh trong ``delete_window`` giây rồi xóa bằng một lần
+      ``delete_messages`` (bulk delete);
+    - gom các vi phạm của cùng một người dùng thành một cảnh báo duy nhất, gửi tối đa một lần
+      mỗi ``warn_cooldown`` giây; cảnh báo trong kênh và tin nhắn riêng được gửi đồng thời.
+
+    Khi số tin nhắn chờ xóa chạm ``max_pending``, tác vụ nền dừng lấy thêm, hàng đợi đầy dần
+    và các vi phạm mới bị bỏ qua (có ghi log) thay vì làm bot tụt lại phía sau.
+    """
+
+    def __init__(
+        self,
+        build_warning: WarningBuilder,
+        queue_size: int = QUEUE_SIZE,
+        max_pending: int = MAX_PENDING_DELETES,
+        delete_window: float = DELETE_WINDOW,
+        warn_window: float = WARN_WINDOW,
+        warn_cooldown: float = WARN_COOLDOWN,
+    ) -> None:
+        """Khởi tạo pipeline.
+
+        Args:
+            build_warning: Hàm tạo embed cảnh báo.
+            queue_size: Số vi phạm tối đa chờ trong hàng đợi.
+            max_pending: Số tin nhắn tối đa đang chờ xóa.
+            delete_window: Thời gian gom tin nhắn cần xóa theo kênh (giây).
+            warn_window: Thời gian gom cảnh báo theo người dùng (giây).
+            warn_cooldown: Khoảng cách tối thiểu giữa hai cảnh báo cho một người dùng (giây).
+        """
+        self.build_warning = build_warning
+        self.delete_window = delete_window
+        self.warn_window = warn_window
+        self.warn_cooldown = warn_cooldown
+        self.queue: "asyncio.Queue[Tuple[discord.Message, List[str], List[str]]]" = asyncio.Queue(maxsize=queue_size)
+        self._slots = asyncio.Semaphore(max_pending)
+
+        # channel_id -> tin nhắn chờ xóa
+        self._deletes: Dict[int, List[discord.Message]] = {}
+        # (guild_id, user_id) -> cảnh báo đang gom
+        self._warnings: Dict[Tuple[int, int], _PendingWarning] = {}
+        # (guild_id, user_id) -> thời điểm gửi cảnh báo gần nhất
+        self._last_warned: Dict[Tuple[int, int], float] = {}
+        self._timers: Set[asyncio.TimerHandle] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._worker: Optional[asyncio.Task] = None
+
+        self.dropped = 0
+        self.deleted = 0
+        self.warnings_sent = 0
+        self.warnings_collapsed = 0
+
+    def start(self) -> None:
+        """Khởi động tác vụ nền xử lý hàng đợi."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Dừng tác vụ nền, xử lý nốt các lô xóa và cảnh báo đang chờ."""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for handle in self._timers:
+            handle.cancel()
+        self._timers.clear()
+        for channel_id in list(self._deletes):
+            self._spawn(self._flush_deletes(channel_id))
+        for key in list(self._warnings):
+            self._spawn(self._flush_warning(key))
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def submit(self, message: discord.Message, words: Iterable[str] = (), reasons: Iterable[str] = ()) -> bool:
+        """Đưa một vi phạm vào hàng đợi mà không chờ.
+
+        Args:
+            message: Tin nhắn vi phạm.
+            words: Các từ cấm tìm thấy.
+            reasons: Các lý do bị coi là spam (từ bộ phát hiện flood).
+
+        Returns:
+            False nếu hàng đợi đầy và vi phạm bị bỏ qua.
+        """
+        try:
+            self.queue.put_nowait((message, list(words), list(reasons)))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            # Chỉ ghi log thưa để chính log không trở thành nút thắt khi bị spam
+            if self.dropped % 100 == 1:
+                logger.warning(f"⚠️ Hàng đợi vi phạm đầy, đã bỏ qua {self.dropped} vi phạm")
+            return False
+        return True
+
+    async def _run(self) -> None:
+        """Lấy vi phạm khỏi hàng đợi và chia vào các lô xóa/cảnh báo."""
+        while True:
+            message, words, reasons = await self.queue.get()
+            try:
+                # Chờ khi quá nhiều tin nhắn đang chờ xóa; hàng đợi phía trước sẽ đầy và tự bỏ bớt
+                await self._slots.acquire()
+                self._queue_delete(message)
+                self._queue_warning(message, words, reasons)
+            except Exception as e:
+                logger.error(f"❌ Lỗi khi xử lý vi phạm: {e}")
+            finally:
+                self.queue.task_done()
+
+    def _spawn(self, coro) -> None:
+        """Chạy một coroutine nền và giữ tham chiếu tới khi xong."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _schedule(self, delay: float, coro_factory: Callable, *args) -> None:
+        """Hẹn chạy ``coro_factory(*args)`` sau ``delay`` giây."""
+        loop = asyncio.get_running_loop()
+        handle: Optional[asyncio.TimerHandle] = None
+
+        def fire() -> None:
+            self._timers.discard(handle)
+            self._spawn(coro_factory(*args))
+
+        handle = loop.call_later(delay, fire)
+        self._timers.add(handle)
+
+    def _queue_delete(self, message: discord.Message) -> None:
+        """Thêm tin nhắn vào lô xóa của kênh, hẹn xóa nếu đây là tin đầu tiên của lô."""
+        batch = self._deletes.setdefault(message.channel.id, [])
+        batch.append(message)
+        if len(batch) == 1:
+            self._schedule(self.delete_window, self._flush_deletes, message.channel.id)
+        elif len(batch) == BULK_DELETE_LIMIT:
+            self._spawn(self._flush_deletes(message.channel.id))
+
+    async def _flush_deletes(self, channel_id: int) -> None:
+        """Xóa toàn bộ tin nhắn đang chờ của một kênh bằng một lần bulk delete.
+
+        Tin nhắn cũ hơn 14 ngày (ví dụ tin cũ vừa bị sửa) được xóa riêng từng cái, vì Discord
+        từ chối cả lô bulk delete nếu có một tin như vậy.
+        """
+        messages = self._deletes.pop(channel_id, None)
+        if not messages:
+            return
+        channel = messages[0].channel
+        cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+        bulk = [m for m in messages if m.created_at > cutoff]
+        singles = [m for m in messages if m.created_at <= cutoff]
+        if len(bulk) == 1 or not hasattr(channel, "delete_messages"):
+            bulk, singles = [], messages
+        try:
+            for i in range(0, len(bulk), BULK_DELETE_LIMIT):
+                await channel.delete_messages(bulk[i : i + BULK_DELETE_LIMIT])
+            await asyncio.gather(*(m.delete() for m in singles))
+            self.deleted += len(messages)
+            logger.info(f"🗑 Đã xóa {len(messages)} tin nhắn vi phạm trong {channel}")
+        except discord.Forbidden:
+            logger.warning(f"⚠️ Không có quyền xóa tin nhắn trong {channel}")
+            mentions = " ".join(sorted({m.author.mention for m in messages}))
+            try:
+                await channel.send(
+                    f"{mentions}, tin nhắn của bạn chứa từ cấm nhưng bot không có quyền xóa. "
+                    "Vui lòng tự chỉnh sửa/"
+                )
+            except discord.HTTPException:
+                pass
+        except discord.NotFound:
+            # Tin nhắn đã bị xóa trước đó (bởi người dùng hoặc mod khác)
+            logger.debug(f"Tin nhắn vi phạm trong {channel} đã bị xóa trước")
+        except Exception as e:
+            logger.error(f"❌ Lỗi khi xóa tin nhắn vi phạm: {e}")
+        finally:
+            for _ in messages:
+                self._slots.release()
+
+    def _queue_warning(self, message: discord.Message, words: List[str], reasons: List[str]) -> None:
+        """Gom vi phạm vào cảnh báo của người dùng, hẹn gửi theo giới hạn tần suất."""
+        key = (message.guild.id, message.author.id)
+        pending = self._warnings.get(key)
+        if pending:
+            self.warnings_collapsed += 1
+        else:
+            pending = self._warnings[key] = _PendingWarning(message.channel, message.author)
+            cooldown_left = self._last_warned.get(key, 0.0) + self.warn_cooldown - time.monotonic()
+            self._schedule(max(self.warn_window, cooldown_left), self._flush_warning, key)
+        pending.channel = message.channel
+        pending.words.update(words)
+        pending.reasons.update(reasons)
+        pending.count += 1
+
+    async def _flush_warning(self, key: Tuple[int, int]) -> None:
+        """Gửi cảnh báo đã gom vào kênh và tin nhắn riêng cùng lúc."""
+        pending = self._warnings.pop(key, None)
+        if not pending:
+            return
+        now = time.monotonic()
+        self._last_warned[key] = now
+        # Dọn các mốc thời gian đã hết hạn để bộ nhớ không tăng mãi
+        if len(self._last_warned) > 10_000:
+            self._last_warned = {k: t for k, t in self._last_warned.items() if now - t < self.warn_cooldown}
+
+        embed = self.build_warning(pending.author, sorted(pending.words), sorted(pending.reasons), pending.count)
+        results = await asyncio.gather(
+            pending.channel.send(embed=embed),
+            pending.author.send(embed=embed),
+            return_exceptions=True,
+        )
+        self.warnings_sent += 1
+        for target, result in zip(("kênh", "tin nhắn riêng"), results):
+            if isinstance(result, discord.Forbidden):
+                logger.warning(f"⚠️ Không có quyền gửi cảnh báo qua {target} cho {pending.author}")
+            elif isinstance(result, Exception):
+                logger.error(f"❌ Lỗi khi gửi cảnh báo qua {target}: {result}")
+
+    def stats(self) -> Dict[str, int]:
+        """Số liệu hoạt động của pipeline."""
+        return {
+            "queued": self.queue.qsize(),
+            "pending_deletes": sum(len(batch) for batch in self._deletes.values()),
+            "pending_warnings": len(self._warnings),
+            "deleted": self.deleted,
+            "warnings_sent": self.warnings_sent,
+            "warnings_collapsed": self.warnings_collapsed,
+            "dropped": self.dropped,
+        }
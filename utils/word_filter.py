@@ -0,0 +1,223 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.pattern_rules import PatternRule
+from utils.text_normalizer import FORM_SEPARATOR, TextNormalizer
+from utils.word_matcher import WordMatcher
+
+
+class WordFilter:
+    """Bộ lọc từ cấm: chuẩn hóa văn bản rồi quét bằng ``WordMatcher`` một lượt.
+
+    Từ cấm được lưu trong automaton ở dạng chuẩn (``TextNormalizer.normalize_entry``): từ có dấu
+    giữ nguyên dấu để không khớp nhầm từ thường ("lồn" không khớp "lợn", "lớn", "lon"), từ không
+    dấu được bỏ dấu để khớp mọi cách viết. Nhiều từ gốc có thể cùng một dạng chuẩn ("Fuck",
+    "fuck"), nên dạng chuẩn chỉ bị xóa khi không còn từ gốc nào.
+    """
+
+    def __init__(self, words: Iterable[str] = (), normalizer: Optional[TextNormalizer] = None) -> None:
+        """Khởi tạo bộ lọc.
+
+        Args:
+            words: Danh sách từ cấm gốc.
+            normalizer: Bộ chuẩn hóa dùng chung; None để tạo mới.
+        """
+        self.normalizer = normalizer or TextNormalizer()
+        self.matcher = WordMatcher()
+        self._originals: Dict[str, Set[str]] = {}
+        self.add_many(words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._originals.get(self.normalizer.normalize_entry(word), ())
+
+    def __len__(self) -> int:
+        return sum(len(originals) for originals in self._originals.values())
+
+    @property
+    def words(self) -> List[str]:
+        """Danh sách từ cấm gốc, sắp xếp theo thứ tự chữ cái."""
+        return sorted(word for originals in self._originals.values() for word in originals)
+
+    def originals(self, canonical: str) -> Set[str]:
+        """Các từ gốc có cùng dạng chuẩn ``canonical``."""
+        return self._originals.get(canonical, set())
+
+    def add(self, word: str) -> bool:
+        """Thêm một từ cấm gốc.
+
+        Returns:
+            True nếu từ chưa có và đã được thêm.
+        """
+        canonical = self.normalizer.normalize_entry(word)
+        originals = self._originals.setdefault(canonical, set())
+        if word in originals:
+            return False
+        originals.add(word)
+        self.matcher.add(canonical)
+        return True
+
+    def add_many(self, words: Iterable[str]) -> int:
+        """Thêm nhiều từ cấm.
+
+        Returns:
+            Số từ mới được thêm.
+        """
+        return sum(1 for word in words if self.add(word))
+
+    def remove(self, word: str) -> bool:
+        """Xóa một từ cấm gốc.
+
+        Returns:
+            True nếu từ có trong bộ lọc và đã được xóa.
+        """
+        canonical = self.normalizer.normalize_entry(word)
+        originals = self._originals.get(canonical)
+        if not originals or word not in originals:
+            return False
+        originals.discard(word)
+        if not originals:
+            del self._originals[canonical]
+            self.matcher.remove(canonical)
+        return True
+
+    def remove_many(self, words: Iterable[str]) -> int:
+        """Xóa nhiều từ cấm.
+
+        Returns:
+            Số từ đã được xóa.
+        """
+        return sum(1 for word in words if self.remove(word))
+
+    def scan(self, text: str) -> List[str]:
+        """Chuẩn hóa văn bản và trả về các từ cấm (dạng gốc) xuất hiện trong đó.
+
+        Args:
+            text: Nội dung tin nhắn gốc.
+
+        Returns:
+            Danh sách từ cấm tìm thấy, theo thứ tự xuất hiện.
+        """
+        return self.scan_normalized(self.normalizer.scan_form(text))
+
+    def scan_normalized(self, canonical: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Quét văn bản đã chuẩn hóa (có thể chỉ một vùng con).
+
+        Args:
+            canonical: Văn bản đã qua ``normalizer.scan_form``.
+            start: Vị trí bắt đầu quét.
+            end: Vị trí kết thúc quét (không bao gồm).
+
+        Returns:
+            Danh sách từ cấm gốc tìm thấy.
+        """
+        return [min(self._originals[word]) for word in self.matcher.search(canonical, start, end)]
+
+
+class GuildWordFilter:
+    """Bộ lọc của một guild: danh sách chung dùng chung + phần riêng của guild.
+
+    Automaton của danh sách chung không bị sao chép; mỗi guild chỉ có một automaton nhỏ
+    cho các từ thêm riêng và một tập các từ chung bị tắt. Văn bản được chuẩn hóa một lần
+    rồi quét qua cả hai automaton.
+    """
+
+    def __init__(
+        self,
+        base: WordFilter,
+        words: Iterable[str] = (),
+        excluded: Iterable[str] = (),
+        rules: Iterable[PatternRule] = (),
+    ) -> None:
+        """Khởi tạo bộ lọc guild.
+
+        Args:
+            base: Bộ lọc danh sách chung (dùng chung giữa mọi guild).
+            words: Các từ guild thêm riêng.
+            excluded: Các từ của danh sách chung mà guild đã tắt.
+            rules: Các luật wildcard/regex của guild (được đánh giá riêng, xem ``RuleEvaluator``).
+        """
+        self.base = base
+        self.extra = WordFilter(words, normalizer=base.normalizer)
+        self.excluded: Set[str] = set(excluded)
+        self.rules: List[PatternRule] = list(rules)
+
+    @property
+    def normalizer(self) -> TextNormalizer:
+        """Bộ chuẩn hóa dùng chung với danh sách chung."""
+        return self.base.normalizer
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.extra or (word in self.base and word not in self.excluded)
+
+    def scan(self, text: str) -> List[str]:
+        """Chuẩn hóa văn bản và trả về các từ cấm hiệu lực với guild."""
+        return self.scan_normalized(self.normalizer.scan_form(text))
+
+    def scan_normalized(self, canonical: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Quét văn bản đã chuẩn hóa qua danh sách chung và danh sách riêng.
+
+        Args:
+            canonical: Văn bản đã chuẩn hóa.
+            start: Vị trí bắt đầu quét.
+            end: Vị trí kết thúc quét (không bao gồm).
+
+        Returns:
+            Danh sách từ cấm gốc tìm thấy (không trùng lặp).
+        """
+        hits = self.extra.scan_normalized(canonical, start, end)
+        for word in self.base.matcher.search(canonical, start, end):
+            originals = self.base.originals(word) - self.excluded
+            if originals:
+                hits.append(min(originals))
+        return list(dict.fromkeys(hits))
+
+    @property
+    def max_length(self) -> int:
+        """Độ dài dạng chuẩn dài nhất trong cả danh sách chung và danh sách riêng."""
+        return max(self.base.matcher.max_length, self.extra.matcher.max_length)
+
+    def scan_changed(self, previous: str, canonical: str) -> List[str]:
+        """Chỉ quét vùng văn bản bị thay đổi so với ``previous`` (dùng khi tin nhắn được sửa).
+
+        Mỗi dạng (bỏ dấu, giữ dấu) được so riêng: vùng thay đổi là phần nằm giữa tiền tố chung
+        và hậu tố chung của hai chuỗi, được nới thêm ``max_length`` ký tự mỗi bên để bắt các từ
+        cấm nằm vắt qua mép vùng.
+
+        Args:
+            previous: Văn bản đã chuẩn hóa trước khi sửa (đã được quét, không có từ cấm).
+            canonical: Văn bản đã chuẩn hóa sau khi sửa.
+
+        Returns:
+            Danh sách từ cấm gốc tìm thấy trong vùng thay đổi.
+        """
+        if previous == canonical:
+            return []
+        old_parts = previous.split(FORM_SEPARATOR)
+        new_parts = canonical.split(FORM_SEPARATOR)
+        if len(old_parts) != len(new_parts):
+            return self.scan_normalized(canonical)
+        hits: List[str] = []
+        offset = 0
+        for old, new in zip(old_parts, new_parts):
+            if old != new:
+                start, end = self._changed_region(old, new)
+                hits.extend(self.scan_normalized(canonical, offset + start, offset + end))
+            offset += len(new) + len(FORM_SEPARATOR)
+        return list(dict.fromkeys(hits))
+
+    def _changed_region(self, previous: str, text: str) -> Tuple[int, int]:
+        """Vùng (đầu, cuối) của ``text`` khác ``previous``, đã nới ``max_length`` ký tự mỗi bên."""
+        limit = min(len(previous), len(text))
+        prefix = 0
+        while prefix < limit and previous[prefix] == text[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and previous[-1 - suffix] == text[-1 - suffix]:
+            suffix += 1
+        margin = self.max_length
+        return max(0, prefix - margin), min(len(text), len(text) - suffix + margin)
+
+    @property
+    def words(self) -> List[str]:
+        """Danh sách từ cấm hiệu lực với guild, sắp xếp theo thứ tự chữ cái."""
+        base_words = [word for word in self.base.words if word not in self.excluded]
+        return sorted(set(base_words).union(self.extra.words))
@@ -0,0 +1,202 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    """Ký tự có thuộc lớp ``\\w`` của ``re`` (Unicode) hay không."""
+    return ch.isalnum() or ch == "_"
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """Vị trí ``index`` có phải ranh giới từ (tương đương ``\\b`` của ``re``) hay không."""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+class WordMatcher:
+    """Bộ so khớp nhiều từ cùng lúc dựa trên automaton Aho-Corasick.
+
+    Quét tin nhắn một lượt duy nhất bất kể danh sách có bao nhiêu từ, và chỉ nhận
+    các kết quả nằm trọn giữa hai ranh giới từ (giống ``re.search(rf"\\b{word}\\b")``).
+    Thêm/xóa từ chỉ sửa trie; liên kết thất bại được tính lại lười ở lần quét kế tiếp.
+    """
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        """Khởi tạo automaton.
+
+        Args:
+            words: Danh sách từ ban đầu (nên đã được chuẩn hóa chữ thường).
+        """
+        self._words: Set[str] = set()
+        self._reset()
+        self.add_many(words)
+
+    def _reset(self) -> None:
+        """Đưa trie về trạng thái chỉ có nút gốc."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[Optional[str]] = [None]
+        self._depth: List[int] = [0]
+        self._fail: List[int] = [0]
+        self._dict_link: List[int] = [0]
+        self._dirty = False
+        # Tổng độ dài và số từ theo độ dài, cập nhật khi thêm/xóa để không phải duyệt lại cả tập từ
+        self._total_length = 0
+        self._length_counts: Dict[int, int] = {}
+        self._max_length = 0
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    @property
+    def words(self) -> Set[str]:
+        """Tập từ hiện có trong automaton (chỉ đọc)."""
+        return set(self._words)
+
+    @property
+    def max_length(self) -> int:
+        """Độ dài từ dài nhất trong automaton."""
+        return self._max_length
+
+    def add(self, word: str) -> bool:
+        """Thêm một từ.
+
+        Returns:
+            True nếu từ chưa có và đã được thêm.
+        """
+        if not word or word in self._words:
+            return False
+        node = 0
+        for ch in word:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._output.append(None)
+                self._depth.append(self._depth[node] + 1)
+                self._fail.append(0)
+                self._dict_link.append(0)
+            node = next_node
+        self._output[node] = word
+        self._words.add(word)
+        self._total_length += len(word)
+        self._length_counts[len(word)] = self._length_counts.get(len(word), 0) + 1
+        self._max_length = max(self._max_length, len(word))
+        self._dirty = True
+        return True
+
+    def add_many(self, words: Iterable[str]) -> int:
+        """Thêm nhiều từ, chỉ tính lại liên kết một lần.
+
+        Returns:
+            Số từ mới được thêm.
+        """
+        return sum(1 for word in words if self.add(word))
+
+    def remove(self, word: str) -> bool:
+        """Xóa một từ. Nút trie được giữ lại, chỉ bỏ đánh dấu kết thúc từ.
+
+        Returns:
+            True nếu từ có trong automaton và đã được xóa.
+        """
+        if word not in self._words:
+            return False
+        node = 0
+        for ch in word:
+            node = self._goto[node][ch]
+        self._output[node] = None
+        self._words.discard(word)
+        self._total_length -= len(word)
+        self._length_counts[len(word)] -= 1
+        if not self._length_counts[len(word)]:
+            del self._length_counts[len(word)]
+            if len(word) == self._max_length:
+                self._max_length = max(self._length_counts, default=0)
+        self._dirty = True
+        # Thu gọn trie khi phần lớn nút đã không còn dùng tới
+        if len(self._goto) > 64 and len(self._goto) > 4 * self._total_length + 1:
+            self._compact()
+        return True
+
+    def remove_many(self, words: Iterable[str]) -> int:
+        """Xóa nhiều từ.
+
+        Returns:
+            Số từ đã được xóa.
+        """
+        return sum(1 for word in words if self.remove(word))
+
+    def _compact(self) -> None:
+        """Dựng lại trie từ đầu, loại bỏ các nút không còn dẫn tới từ nào."""
+        words, self._words = self._words, set()
+        self._reset()
+        self.add_many(words)
+
+    def _build_links(self) -> None:
+        """Tính liên kết thất bại và liên kết từ điển bằng BFS."""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            self._dict_link[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[child] = fail
+                self._dict_link[child] = fail if self._output[fail] else self._dict_link[fail]
+                queue.append(child)
+        self._dirty = False
+
+    def find_all(self, text: str, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int, str]]:
+        """Tìm mọi lần xuất hiện của các từ trong ``text[start:end]``.
+
+        Ranh giới từ được kiểm tra trên toàn bộ ``text``, nên có thể chỉ quét một vùng
+        con mà vẫn cho kết quả đúng ở mép vùng.
+
+        Args:
+            text: Văn bản cần quét (đã chuẩn hóa giống như các từ).
+            start: Vị trí bắt đầu quét.
+            end: Vị trí kết thúc quét (không bao gồm); None là hết chuỗi.
+
+        Returns:
+            Danh sách (vị trí đầu, vị trí cuối, từ) theo thứ tự vị trí kết thúc.
+        """
+        if self._dirty:
+            self._build_links()
+        goto, fail, output, dict_link, depth = self._goto, self._fail, self._output, self._dict_link, self._depth
+        end = len(text) if end is None else end
+        matches: List[Tuple[int, int, str]] = []
+        node = 0
+        for i in range(start, end):
+            ch = text[i]
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if output[node] else dict_link[node]
+            while hit:
+                match_start = i + 1 - depth[hit]
+                if _is_boundary(text, match_start) and _is_boundary(text, i + 1):
+                    matches.append((match_start, i + 1, output[hit]))
+                hit = dict_link[hit]
+        return matches
+
+    def search(self, text: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Trả về danh sách từ (không trùng lặp) xuất hiện trong văn bản, theo thứ tự gặp.
+
+        Args:
+            text: Văn bản cần quét.
+            start: Vị trí bắt đầu quét.
+            end: Vị trí kết thúc quét (không bao gồm).
+
+        Returns:
+            Danh sách từ tìm thấy.
+        """
+        return list(dict.fromkeys(word for _, _, word in self.find_all(text, start, end)))